@@ -2,18 +2,70 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform, ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import entity_registry as er
-from collections import deque
-from dataclasses import dataclass
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from functools import partial
+from time import perf_counter
+from typing import Any
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
 
+from .autotune import (
+    DEFAULT_TUNING_RULE,
+    TUNING_RULES,
+    RelayAutotuner,
+    async_run_autotune,
+)
 from .coordinator import PIDDataCoordinator
+from .actuator import ActuatorOutput, async_get_output_dispatcher
+from .cascade import async_link
+from .filters import FilterChain, TimeWeightedAverage
+from .gain_schedule import GainSchedule
+from .history import AggregateHistory, HistoryBuffer
+from .replay import async_replay
+from .search import (
+    EVENT_SEARCH_PROGRESS,
+    SEARCH_GRID,
+    SEARCH_LATIN_HYPERCUBE,
+    SEARCH_METHODS,
+    CandidateResult,
+    async_search_gains,
+    grid_candidates,
+    latin_hypercube_candidates,
+    rank,
+)
+from .simulation import (
+    PLANT_MODELS,
+    IntegratingPlant,
+    PlantModel,
+    SecondOrderPlant,
+    simulate,
+)
+from .publish import PublishPolicy
+from .timing import ControllerTiming
 
 from .const import (
     DOMAIN,
@@ -27,6 +79,64 @@ from .const import (
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    CONF_PID_ENGINE,
+    DEFAULT_PID_ENGINE,
+    CONF_UPDATE_MODE,
+    DEFAULT_UPDATE_MODE,
+    UPDATE_MODE_INPUT_CHANGE,
+    CONF_MIN_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    CONF_MAX_STALENESS,
+    DEFAULT_MAX_STALENESS,
+    CONF_SCHEDULING_MODE,
+    DEFAULT_SCHEDULING_MODE,
+    SCHEDULING_MODE_DEADLINE,
+    CONF_MISSED_TICK_POLICY,
+    DEFAULT_MISSED_TICK_POLICY,
+    CONF_PUBLISH_DEADBAND,
+    CONF_PUBLISH_DEADBAND_PCT,
+    CONF_PUBLISH_MIN_INTERVAL,
+    CONF_PUBLISH_HEARTBEAT,
+    DEFAULT_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_DEADBAND_PCT,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    DEFAULT_PUBLISH_HEARTBEAT,
+    CONF_OUTPUT_ENTITY_ID,
+    CONF_OUTPUT_MIN_INTERVAL,
+    CONF_OUTPUT_DEADBAND,
+    DEFAULT_OUTPUT_MIN_INTERVAL,
+    DEFAULT_OUTPUT_DEADBAND,
+    CONF_HISTORY_DEPTH,
+    DEFAULT_HISTORY_DEPTH,
+    CONF_CASCADE_SOURCE,
+    CONF_GAIN_SCHEDULE_SOURCE,
+    DEFAULT_GAIN_SCHEDULE_SOURCE,
+    GAIN_SCHEDULE_OFF,
+    CONF_GAIN_SCHEDULE_ENTITY_ID,
+    CONF_GAIN_SCHEDULE_TABLE,
+    CONF_DT_SOURCE,
+    DEFAULT_DT_SOURCE,
+    CONF_INPUT_SAMPLING,
+    DEFAULT_INPUT_SAMPLING,
+    INPUT_SAMPLING_TIME_WEIGHTED,
+    CONF_INPUT_FILTERS,
+    CONF_FILTER_EMA_ALPHA,
+    DEFAULT_FILTER_EMA_ALPHA,
+    CONF_FILTER_MEDIAN_WINDOW,
+    DEFAULT_FILTER_MEDIAN_WINDOW,
+    CONF_FILTER_KALMAN_PROCESS_NOISE,
+    DEFAULT_FILTER_KALMAN_PROCESS_NOISE,
+    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+    DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+    HISTORY_MINUTE_BUCKETS,
+    HISTORY_HOUR_BUCKETS,
+    SIGNAL_OPTIONS_UPDATED,
+    MAX_SIMULATION_STEPS,
+    MAX_REPLAY_STEPS,
+    DEFAULT_AUTOTUNE_TIMEOUT,
+    MAX_AUTOTUNE_TIMEOUT,
+    MAX_AUTOTUNE_CYCLES,
+    MAX_SEARCH_CANDIDATES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -43,6 +153,156 @@ ATTR_VALUE = "value"
 ATTR_PRESET = "preset"
 PRESET_OPTIONS = ["zero_start", "last_known_value", "startup_value"]
 
+# Parameter entities whose changes trigger an immediate PID refresh
+PARAMETER_ENTITIES: dict[str, tuple[str, ...]] = {
+    "number": (
+        "kp",
+        "ki",
+        "kd",
+        "setpoint",
+        "output_min",
+        "output_max",
+        "sample_time",
+    ),
+    "switch": ("auto_mode", "proportional_on_measurement", "windup_protection"),
+    "select": ("start_mode",),
+}
+
+SERVICE_SIMULATE = "simulate"
+ATTR_PLANT = "plant"
+ATTR_GAIN = "gain"
+ATTR_TIME_CONSTANT = "time_constant"
+ATTR_DEAD_TIME = "dead_time"
+ATTR_DAMPING = "damping"
+ATTR_DURATION = "duration"
+ATTR_INITIAL_VALUE = "initial_value"
+# Controller parameters a simulate call may override
+SIMULATE_OVERRIDES = ("kp", "ki", "kd", "setpoint", "sample_time")
+
+# Plant model and run settings shared by the simulation services
+SIMULATION_FIELDS = {
+    vol.Required(ATTR_PLANT): vol.In(list(PLANT_MODELS)),
+    vol.Required(ATTR_GAIN): vol.Coerce(float),
+    vol.Optional(ATTR_TIME_CONSTANT, default=60.0): vol.All(
+        vol.Coerce(float), vol.Range(min=0, min_included=False)
+    ),
+    vol.Optional(ATTR_DEAD_TIME, default=0.0): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+    vol.Optional(ATTR_DAMPING, default=1.0): vol.All(
+        vol.Coerce(float), vol.Range(min=0, min_included=False)
+    ),
+    vol.Optional(ATTR_DURATION, default=3600.0): vol.All(
+        vol.Coerce(float), vol.Range(min=0, min_included=False)
+    ),
+    vol.Optional(ATTR_INITIAL_VALUE): vol.Coerce(float),
+    vol.Optional("setpoint"): vol.Coerce(float),
+    vol.Optional("sample_time"): vol.All(
+        vol.Coerce(float), vol.Range(min=0, min_included=False)
+    ),
+}
+
+SIMULATE_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+        **SIMULATION_FIELDS,
+        vol.Optional("kp"): vol.Coerce(float),
+        vol.Optional("ki"): vol.Coerce(float),
+        vol.Optional("kd"): vol.Coerce(float),
+    }
+)
+
+SERVICE_SEARCH_GAINS = "search_gains"
+SERVICE_CANCEL_SEARCH = "cancel_search"
+ATTR_METHOD = "method"
+ATTR_SAMPLES = "samples"
+ATTR_SEED = "seed"
+ATTR_TOP = "top"
+ATTR_MAX_WORKERS = "max_workers"
+GAIN_RANGE_FIELDS = {
+    f"{gain}_{bound}": default
+    for gain, defaults in (("kp", (0.0, 10.0)), ("ki", (0.0, 1.0)), ("kd", (0.0, 0.0)))
+    for bound, default in zip(("min", "max"), defaults)
+}
+
+SEARCH_GAINS_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+        **SIMULATION_FIELDS,
+        **{
+            vol.Optional(key, default=default): vol.Coerce(float)
+            for key, default in GAIN_RANGE_FIELDS.items()
+        },
+        vol.Optional(ATTR_METHOD, default=SEARCH_LATIN_HYPERCUBE): vol.In(
+            SEARCH_METHODS
+        ),
+        vol.Optional(ATTR_SAMPLES, default=200): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SEARCH_CANDIDATES)
+        ),
+        vol.Optional(ATTR_SEED): vol.Coerce(int),
+        vol.Optional(ATTR_TOP, default=10): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_MAX_WORKERS): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+CANCEL_SEARCH_SCHEMA = cv.make_entity_service_schema(
+    {vol.Optional(ATTR_ENTITY_ID): cv.entity_id}
+)
+
+SERVICE_REPLAY = "replay"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_CHUNK_HOURS = "chunk_hours"
+
+REPLAY_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_CHUNK_HOURS, default=24.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=24 * 31)
+        ),
+        vol.Optional("kp"): vol.Coerce(float),
+        vol.Optional("ki"): vol.Coerce(float),
+        vol.Optional("kd"): vol.Coerce(float),
+    }
+)
+
+SERVICE_AUTOTUNE = "autotune"
+SERVICE_CANCEL_AUTOTUNE = "cancel_autotune"
+ATTR_AMPLITUDE = "amplitude"
+ATTR_BIAS = "bias"
+ATTR_HYSTERESIS = "hysteresis"
+ATTR_CYCLES = "cycles"
+ATTR_RULE = "rule"
+ATTR_TIMEOUT = "timeout"
+
+AUTOTUNE_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_AMPLITUDE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(ATTR_BIAS): vol.Coerce(float),
+        vol.Optional(ATTR_HYSTERESIS, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_AUTOTUNE_CYCLES)
+        ),
+        vol.Optional(ATTR_RULE, default=DEFAULT_TUNING_RULE): vol.In(
+            list(TUNING_RULES)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_AUTOTUNE_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_AUTOTUNE_TIMEOUT)
+        ),
+    }
+)
+
+CANCEL_AUTOTUNE_SCHEMA = cv.make_entity_service_schema(
+    {vol.Optional(ATTR_ENTITY_ID): cv.entity_id}
+)
+
 SET_OUTPUT_SCHEMA = cv.make_entity_service_schema(
     {
         vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
@@ -52,6 +312,56 @@ SET_OUTPUT_SCHEMA = cv.make_entity_service_schema(
 )
 
 
+@dataclass
+class PIDParameters:
+    """Controller parameters pushed by the number, switch and select entities."""
+
+    kp: float | None = None
+    ki: float | None = None
+    kd: float | None = None
+    setpoint: float | None = None
+    sample_time: float | None = None
+    output_min: float | None = None
+    output_max: float | None = None
+    starting_output: float | None = None
+    start_mode: str | None = None
+    auto_mode: bool = True
+    proportional_on_measurement: bool = False
+    windup_protection: bool = True
+    version: int = 0
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a parameter value and bump the version when it changed."""
+        if getattr(self, key) != value:
+            setattr(self, key, value)
+            self.version += 1
+
+    def update(self, **values: Any) -> None:
+        """Store several parameter values at once."""
+        for key, value in values.items():
+            self.set(key, value)
+
+
+@dataclass(frozen=True, slots=True)
+class PIDTelemetry:
+    """Values produced by one PID step, shared by all diagnostic sensors."""
+
+    input: float
+    setpoint: float | None
+    error: float | None
+    p: float | None
+    i: float | None
+    d: float | None
+    i_delta: float | None
+    dt: float | None
+    output: float | None
+    # Sensor value before the input filters, equal to input without filters
+    raw_input: float | None = None
+    # Range of the input since the previous step with time-weighted sampling
+    input_min: float | None = None
+    input_max: float | None = None
+
+
 @dataclass
 class MyData:
     handle: PIDDeviceHandle
@@ -65,45 +375,369 @@ class PIDDeviceHandle:
         self.hass = hass
         self.entry = entry
         self.name = entry.data.get(CONF_NAME)
-        self.input_range_min = entry.options.get(
-            CONF_INPUT_RANGE_MIN,
-            entry.data.get(CONF_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MIN),
+        self.pid_engine = self._option(CONF_PID_ENGINE, DEFAULT_PID_ENGINE)
+        self.output: ActuatorOutput | None = None
+        self._output_config: tuple[str | None, float, float] | None = None
+        self.history: HistoryBuffer | None = None
+        self.input_filter = FilterChain(())
+        # Time-weighted input since the last tick, None when sampling the latest
+        self.input_average: TimeWeightedAverage | None = None
+        self._filter_config: tuple | None = None
+        # Parsed gain schedule, None when the gains come from the number entities
+        self.gain_schedule: GainSchedule | None = None
+        self._gain_schedule_table: str | None = None
+        self.sensor_entity_id: str | None = None
+        # Input state timestamp of the last step, used with measurement time steps
+        self.last_measurement_timestamp: float | None = None
+        self._load_options()
+        self.params = PIDParameters()
+        # PID object of the configured engine, created by the sensor platform
+        self.pid: Any = None
+        # Parameter version last applied to the PID object, None forces a sync
+        self.applied_params_version: int | None = None
+        # Gains last set from the gain schedule, None after a parameter sync
+        self.scheduled_gains: tuple[float, float, float] | None = None
+        self.last_contributions = (None, None, None)  # (P, I, D)
+        self.last_known_output = None
+        # Snapshot of the latest PID step, None until the first step
+        self.telemetry: PIDTelemetry | None = None
+
+        self.aggregates = AggregateHistory(HISTORY_MINUTE_BUCKETS, HISTORY_HOUR_BUCKETS)
+        self.last_update_timestamp: float | None = None
+        self.last_measured_sample_time: float | None = None
+        # Steps skipped since no newer measurement had arrived
+        self.skipped_steps = 0
+        self.timing = ControllerTiming()
+        # Running relay autotune experiment and the outcome of the last one
+        self.autotune: RelayAutotuner | None = None
+        self.autotune_task: asyncio.Task | None = None
+        self.autotune_result: dict[str, Any] | None = None
+        # Running gain search and the ranked table of the last one
+        self.search_task: asyncio.Task | None = None
+        self.search_result: dict[str, Any] | None = None
+
+        # Resolved entity_ids keyed by (platform, key), filled lazily
+        self._entity_id_cache: dict[tuple[str, str], str] = {}
+        self.entity_id_cache_hits = 0
+        self.entity_id_cache_misses = 0
+        self._parameter_tracker_unsub: CALLBACK_TYPE | None = None
+        self._input_tracker_unsub: CALLBACK_TYPE | None = None
+        self._input_debouncer: Debouncer | None = None
+        self._staleness_unsub: CALLBACK_TYPE | None = None
+
+    def _option(self, key: str, default: Any = None) -> Any:
+        """Return an option, falling back to the entry data and ``default``."""
+        return self.entry.options.get(key, self.entry.data.get(key, default))
+
+    def _load_options(self) -> None:
+        """Read all settings that can change without reloading the entry."""
+        self.input_range_min = self._option(
+            CONF_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MIN
         )
-        self.input_range_max = entry.options.get(
-            CONF_INPUT_RANGE_MAX,
-            entry.data.get(CONF_INPUT_RANGE_MAX, DEFAULT_INPUT_RANGE_MAX),
+        self.input_range_max = self._option(
+            CONF_INPUT_RANGE_MAX, DEFAULT_INPUT_RANGE_MAX
         )
-        self.output_range_min = entry.options.get(
-            CONF_OUTPUT_RANGE_MIN,
-            entry.data.get(CONF_OUTPUT_RANGE_MIN, DEFAULT_OUTPUT_RANGE_MIN),
+        self.output_range_min = self._option(
+            CONF_OUTPUT_RANGE_MIN, DEFAULT_OUTPUT_RANGE_MIN
         )
-        self.output_range_max = entry.options.get(
-            CONF_OUTPUT_RANGE_MAX,
-            entry.data.get(CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX),
+        self.output_range_max = self._option(
+            CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX
         )
-        self.sensor_entity_id = entry.options.get(
-            CONF_SENSOR_ENTITY_ID, entry.data.get(CONF_SENSOR_ENTITY_ID)
+        sensor_entity_id = self._option(CONF_SENSOR_ENTITY_ID)
+        if sensor_entity_id != self.sensor_entity_id:
+            # Timestamps of another sensor say nothing about the new one
+            self.last_measurement_timestamp = None
+        self.sensor_entity_id = sensor_entity_id
+        self.update_mode = self._option(CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE)
+        self.input_sampling = self._option(CONF_INPUT_SAMPLING, DEFAULT_INPUT_SAMPLING)
+        self.dt_source = self._option(CONF_DT_SOURCE, DEFAULT_DT_SOURCE)
+        self.cascade_source: str | None = self._option(CONF_CASCADE_SOURCE)
+        self.gain_schedule_source = self._option(
+            CONF_GAIN_SCHEDULE_SOURCE, DEFAULT_GAIN_SCHEDULE_SOURCE
+        )
+        self.gain_schedule_entity_id: str | None = self._option(
+            CONF_GAIN_SCHEDULE_ENTITY_ID
+        )
+        # Parse the table only when its text changed
+        table = self._option(CONF_GAIN_SCHEDULE_TABLE) or ""
+        if table != self._gain_schedule_table:
+            self._gain_schedule_table = table
+            try:
+                self.gain_schedule = GainSchedule.parse(table) if table else None
+            except ValueError as err:
+                _LOGGER.error("Gain schedule of %s ignored: %s", self.name, err)
+                self.gain_schedule = None
+        self.min_interval = self._option(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        self.max_staleness = self._option(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        self.scheduling_mode = self._option(
+            CONF_SCHEDULING_MODE, DEFAULT_SCHEDULING_MODE
+        )
+        self.missed_tick_policy = self._option(
+            CONF_MISSED_TICK_POLICY, DEFAULT_MISSED_TICK_POLICY
+        )
+        self.publish_policy = PublishPolicy(
+            deadband=self._option(CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND),
+            deadband_pct=self._option(
+                CONF_PUBLISH_DEADBAND_PCT, DEFAULT_PUBLISH_DEADBAND_PCT
+            ),
+            min_interval=self._option(
+                CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL
+            ),
+            heartbeat=self._option(CONF_PUBLISH_HEARTBEAT, DEFAULT_PUBLISH_HEARTBEAT),
         )
-        self.last_contributions = (None, None, None)  # (P, I, D)
-        self.last_known_output = None
 
-        self.input_history: deque[float] = deque(maxlen=10)
-        self.output_history: deque[float] = deque(maxlen=10)
-        self.pid_parameter_history: deque[dict[str, float | None]] = deque(maxlen=10)
-        self.pid_contribution_history: deque[dict[str, float | None]] = deque(maxlen=10)
-        self.sample_time_history: deque[float | None] = deque(maxlen=10)
-        self.last_update_timestamp: float | None = None
-        self.last_measured_sample_time: float | None = None
+        # Recreate the actuator output only when its settings changed, so the
+        # rate limit of an unchanged output carries over
+        self.output_entity_id: str | None = self._option(CONF_OUTPUT_ENTITY_ID)
+        output_config = (
+            self.output_entity_id,
+            self._option(CONF_OUTPUT_MIN_INTERVAL, DEFAULT_OUTPUT_MIN_INTERVAL),
+            self._option(CONF_OUTPUT_DEADBAND, DEFAULT_OUTPUT_DEADBAND),
+        )
+        if output_config != self._output_config:
+            self._output_config = output_config
+            self.output = None
+            if self.output_entity_id:
+                self.output = ActuatorOutput(
+                    async_get_output_dispatcher(self.hass),
+                    self.output_entity_id,
+                    min_interval=output_config[1],
+                    deadband=output_config[2],
+                )
+
+        # Likewise keep the filter state unless the chain or the sensor changed
+        filter_config = (
+            self.sensor_entity_id,
+            tuple(self._option(CONF_INPUT_FILTERS, ())),
+            self._option(CONF_FILTER_EMA_ALPHA, DEFAULT_FILTER_EMA_ALPHA),
+            int(self._option(CONF_FILTER_MEDIAN_WINDOW, DEFAULT_FILTER_MEDIAN_WINDOW)),
+            self._option(
+                CONF_FILTER_KALMAN_PROCESS_NOISE, DEFAULT_FILTER_KALMAN_PROCESS_NOISE
+            ),
+            self._option(
+                CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+                DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+            ),
+        )
+        if filter_config != self._filter_config:
+            self._filter_config = filter_config
+            self.input_filter = FilterChain.from_options(*filter_config[1:])
+
+        depth = int(self._option(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH))
+        if self.history is None or self.history.depth != depth:
+            self.history = HistoryBuffer(depth)
+
+    async def async_apply_options(self) -> bool:
+        """Apply changed options to the running controller.
+
+        The PID object, its integral term and all entities are kept. Returns
+        False when the change needs a reload, which is only the case for a
+        different PID engine.
+        """
+        if self._option(CONF_PID_ENGINE, DEFAULT_PID_ENGINE) != self.pid_engine:
+            return False
+
+        self._load_options()
+        coordinator: PIDDataCoordinator = self.entry.runtime_data.coordinator
+        coordinator.set_missed_tick_policy(
+            self.missed_tick_policy
+            if self.scheduling_mode == SCHEDULING_MODE_DEADLINE
+            else None
+        )
+        # Force the next step to resync the PID object and the tick interval
+        self.applied_params_version = None
+
+        self.async_track_input_sensor()
+        self.async_update_cascade_link()
+
+        # Let the number entities adopt the new ranges
+        async_dispatcher_send(
+            self.hass, SIGNAL_OPTIONS_UPDATED.format(self.entry.entry_id)
+        )
+        await coordinator.async_request_refresh()
+        return True
 
     def _get_entity_id(self, platform: str, key: str) -> str | None:
         """Lookup the real entity_id in the registry by unique_id == '<entry_id>_<key>'."""
+        cache_key = (platform, key)
+        if (entity_id := self._entity_id_cache.get(cache_key)) is not None:
+            self.entity_id_cache_hits += 1
+            return entity_id
+
+        self.entity_id_cache_misses += 1
         registry = er.async_get(self.hass)
         unique = f"{self.entry.entry_id}_{key}"
         entity_id = registry.async_get_entity_id(platform, DOMAIN, unique)
         if not entity_id:
             _LOGGER.debug("No %s entity found for unique_id '%s'", platform, unique)
+            return None
+        self._entity_id_cache[cache_key] = entity_id
         return entity_id
 
+    def get_entity_id(self, platform: str, key: str) -> str | None:
+        """Return the entity_id of this controller's ``key`` entity, or None."""
+        return self._get_entity_id(platform, key)
+
+    @callback
+    def async_filter_entity_registry_event(
+        self, event_data: er.EventEntityRegistryUpdatedData
+    ) -> bool:
+        """Return whether a registry change touches a cached entity_id."""
+        if event_data["action"] == "create":
+            # Misses are never cached, so new entities are picked up lazily
+            return False
+        cached = self._entity_id_cache.values()
+        return (
+            event_data["entity_id"] in cached
+            or event_data.get("old_entity_id") in cached
+        )
+
+    @callback
+    def async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Drop cached entity_ids that were renamed or removed in the registry."""
+        stale = {event.data["entity_id"], event.data.get("old_entity_id")}
+        invalidated = False
+        for cache_key, entity_id in list(self._entity_id_cache.items()):
+            if entity_id in stale:
+                _LOGGER.debug("Entity %s changed in registry; cache cleared", entity_id)
+                del self._entity_id_cache[cache_key]
+                invalidated = True
+
+        if invalidated and self._parameter_tracker_unsub is not None:
+            self.async_track_parameter_entities()
+
+    @callback
+    def async_track_parameter_entities(self) -> None:
+        """Subscribe to state changes of this controller's parameter entities."""
+        self.async_untrack_parameter_entities()
+        entity_ids = [
+            entity_id
+            for platform, keys in PARAMETER_ENTITIES.items()
+            for key in keys
+            if (entity_id := self._get_entity_id(platform, key))
+        ]
+        self._parameter_tracker_unsub = async_track_state_change_event(
+            self.hass, entity_ids, self._async_parameter_changed
+        )
+
+    @callback
+    def async_untrack_parameter_entities(self) -> None:
+        """Remove the parameter entity subscription, if any."""
+        if self._parameter_tracker_unsub is not None:
+            self._parameter_tracker_unsub()
+            self._parameter_tracker_unsub = None
+
+    async def _async_parameter_changed(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Refresh the controller when one of its parameters changed."""
+        _LOGGER.debug("Update detected on %s", event.data["entity_id"])
+        await self.entry.runtime_data.coordinator.async_request_refresh()
+
+    @callback
+    def async_update_cascade_link(self) -> None:
+        """Take the setpoint from the outer controller set in the options."""
+        try:
+            async_link(self.hass, self.entry.entry_id, self.cascade_source)
+        except HomeAssistantError as err:
+            _LOGGER.error("Cascade of %s ignored: %s", self.name, err)
+            async_link(self.hass, self.entry.entry_id, None)
+
+    @property
+    def output_saturation(self) -> int:
+        """Return 1 or -1 when the last output sat at the upper or lower limit."""
+        output = self.last_known_output
+        if output is None or self.pid is None:
+            return 0
+        low, high = self.pid.output_limits
+        if high is not None and output >= high:
+            return 1
+        if low is not None and output <= low:
+            return -1
+        return 0
+
+    @property
+    def tick_interval(self) -> float | None:
+        """Interval of the periodic tick, None when input driven.
+
+        In input change mode the staleness timer replaces the periodic tick.
+        """
+        if self.update_mode == UPDATE_MODE_INPUT_CHANGE:
+            return None
+        return self.params.sample_time
+
+    @callback
+    def async_track_input_sensor(self) -> None:
+        """Follow the input sensor when the options need its state changes.
+
+        In input change mode every new value steps the controller, rate
+        limited to one step per min_interval; a step also follows once
+        max_staleness has passed without one, so the loop keeps running while
+        the sensor is silent. With time-weighted sampling every value is
+        folded into the input average.
+        """
+        self.async_untrack_input_sensor()
+        if self.update_mode == UPDATE_MODE_INPUT_CHANGE:
+            self._input_debouncer = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=self.min_interval,
+                immediate=True,
+                function=self.entry.runtime_data.coordinator.async_refresh,
+            )
+            self.async_restart_staleness_timer()
+        if self.input_sampling == INPUT_SAMPLING_TIME_WEIGHTED:
+            self.input_average = TimeWeightedAverage()
+            self.input_average.add(self.get_input_sensor_value(), perf_counter())
+        if self._input_debouncer is None and self.input_average is None:
+            return
+        self._input_tracker_unsub = async_track_state_change_event(
+            self.hass, [self.sensor_entity_id], self._async_input_changed
+        )
+
+    @callback
+    def async_restart_staleness_timer(self) -> None:
+        """Step max_staleness from now unless the input steps the controller first."""
+        if self._staleness_unsub is not None:
+            self._staleness_unsub()
+            self._staleness_unsub = None
+        if self._input_debouncer is not None:
+            self._staleness_unsub = async_call_later(
+                self.hass, self.max_staleness, self._async_staleness_expired
+            )
+
+    async def _async_staleness_expired(self, _now: Any) -> None:
+        """Step the stale controller, rate limited like input changes."""
+        self._staleness_unsub = None
+        if self._input_debouncer is not None:
+            await self._input_debouncer.async_call()
+
+    @callback
+    def async_untrack_input_sensor(self) -> None:
+        """Remove the input sensor subscription, if any."""
+        if self._input_tracker_unsub is not None:
+            self._input_tracker_unsub()
+            self._input_tracker_unsub = None
+        if self._input_debouncer is not None:
+            self._input_debouncer.async_shutdown()
+            self._input_debouncer = None
+        if self._staleness_unsub is not None:
+            self._staleness_unsub()
+            self._staleness_unsub = None
+        self.input_average = None
+
+    async def _async_input_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Fold a new input value into the average and step the controller."""
+        new_state = event.data["new_state"]
+        if self.input_average is not None:
+            self.input_average.add(self.get_input_sensor_value(), perf_counter())
+        if new_state is None or new_state.state in ("unknown", "unavailable"):
+            return
+        if self._input_debouncer is not None:
+            await self._input_debouncer.async_call()
+
     def get_number(self, key: str) -> float | None:
         """Return the current value of the number entity, or None."""
         entity_id = self._get_entity_id("number", key)
@@ -144,6 +778,29 @@ class PIDDeviceHandle:
             return state.state == "on"
         return True
 
+    def get_input_timestamp(self) -> float | None:
+        """Return when the input sensor last reported a value, as a timestamp."""
+        state = self.hass.states.get(self.sensor_entity_id)
+        return None if state is None else state.last_reported_timestamp
+
+    def get_gain_schedule_value(self) -> float | None:
+        """Return the state of the gain schedule entity as a float, or None."""
+        state = self.hass.states.get(self.gain_schedule_entity_id)
+        if state is None:
+            return None
+        try:
+            return float(state.state)
+        except ValueError:
+            return None
+
+    @property
+    def gain_schedule_active(self) -> bool:
+        """Return whether the gains come from the gain schedule."""
+        return (
+            self.gain_schedule is not None
+            and self.gain_schedule_source != GAIN_SCHEDULE_OFF
+        )
+
     def get_input_sensor_value(self) -> float | None:
         """Return the input value from configured sensor."""
         state = self.hass.states.get(self.sensor_entity_id)
@@ -157,6 +814,141 @@ class PIDDeviceHandle:
         return None
 
 
+@callback
+def _async_get_controller_entry(hass: HomeAssistant, call: ServiceCall) -> ConfigEntry:
+    """Return the loaded config entry owning the entity targeted by ``call``."""
+    entity_id: str | list[str] | None = call.data.get(ATTR_ENTITY_ID)
+    if entity_id is None:
+        raise HomeAssistantError("entity_id is required")
+    if isinstance(entity_id, list):
+        if len(entity_id) != 1:
+            raise HomeAssistantError("Exactly one entity_id is required")
+        entity_id = entity_id[0]
+
+    registry = er.async_get(hass)
+    ent = registry.async_get(entity_id)
+    if ent is None:
+        raise HomeAssistantError(f"Unknown entity {entity_id}")
+    config_entry = hass.config_entries.async_get_entry(ent.config_entry_id)
+    if config_entry is None or config_entry.runtime_data is None:
+        raise HomeAssistantError("PID controller not loaded")
+    return config_entry
+
+
+def _simulation_setup(
+    handle: PIDDeviceHandle, data: dict[str, Any]
+) -> tuple[PlantModel, PIDParameters, float]:
+    """Return the plant, parameters and initial value for a simulation call.
+
+    The controller's current parameters are used unless overridden in
+    ``data``.
+    """
+    params = replace(
+        handle.params,
+        **{key: data[key] for key in SIMULATE_OVERRIDES if key in data},
+    )
+    if params.sample_time is None or params.setpoint is None:
+        raise HomeAssistantError("PID controller has no parameters yet")
+    if data[ATTR_DURATION] / params.sample_time > MAX_SIMULATION_STEPS:
+        raise HomeAssistantError(
+            f"Simulation limited to {MAX_SIMULATION_STEPS} controller steps"
+        )
+    if (initial := data.get(ATTR_INITIAL_VALUE)) is None:
+        initial = handle.get_input_sensor_value()
+        if initial is None:
+            raise HomeAssistantError("initial_value required, input sensor has none")
+
+    plant_cls = PLANT_MODELS[data[ATTR_PLANT]]
+    plant_args = {
+        "gain": data[ATTR_GAIN],
+        "dead_time": data[ATTR_DEAD_TIME],
+    }
+    if plant_cls is not IntegratingPlant:
+        plant_args["time_constant"] = data[ATTR_TIME_CONSTANT]
+    if plant_cls is SecondOrderPlant:
+        plant_args["damping"] = data[ATTR_DAMPING]
+    return plant_cls(**plant_args), params, initial
+
+
+def _simulate_controller(
+    plant: PlantModel,
+    params: PIDParameters,
+    duration: float,
+    initial: float,
+    last_known_output: float | None,
+) -> dict:
+    """Simulate a controller as requested by a simulate service call.
+
+    Runs in the executor on values taken from the controller beforehand.
+    """
+    start = perf_counter()
+    result = simulate(
+        plant, params, duration, initial, last_known_output=last_known_output
+    )
+    return {
+        "samples": len(result.time),
+        "sample_time": params.sample_time,
+        "wall_time": perf_counter() - start,
+        **result.metrics(),
+    }
+
+
+async def _async_search_controller_gains(
+    hass: HomeAssistant, handle: PIDDeviceHandle, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Run a gain search for a search_gains service call.
+
+    Every finished batch is reported with a progress event, the ranked table
+    is returned and kept for the diagnostics.
+    """
+    plant, params, initial = _simulation_setup(handle, data)
+    bounds = []
+    for gain in ("kp", "ki", "kd"):
+        low, high = data[f"{gain}_min"], data[f"{gain}_max"]
+        if low > high:
+            raise HomeAssistantError(f"{gain}_min must not exceed {gain}_max")
+        bounds.append((low, high))
+    if data[ATTR_METHOD] == SEARCH_GRID:
+        candidates = grid_candidates(bounds, data[ATTR_SAMPLES])
+    else:
+        candidates = latin_hypercube_candidates(
+            bounds, data[ATTR_SAMPLES], data.get(ATTR_SEED)
+        )
+    top = data[ATTR_TOP]
+    best: list[CandidateResult] = []
+
+    @callback
+    def _report_batch(batch: list[CandidateResult], done: int, total: int) -> None:
+        best[:] = rank([*best, *batch])[:top]
+        hass.bus.async_fire(
+            EVENT_SEARCH_PROGRESS,
+            {
+                "entry_id": handle.entry.entry_id,
+                "done": done,
+                "total": total,
+                "best": best[0].as_dict(),
+            },
+        )
+
+    start = perf_counter()
+    ranked = await async_search_gains(
+        hass,
+        plant,
+        params,
+        candidates,
+        data[ATTR_DURATION],
+        initial,
+        max_workers=data.get(ATTR_MAX_WORKERS),
+        on_batch=_report_batch,
+    )
+    handle.search_result = {
+        "candidates": len(ranked),
+        "wall_time": perf_counter() - start,
+        "results": [result.as_dict() for result in ranked[:top]],
+    }
+    return handle.search_result
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Simple PID Controller from a config entry."""
 
@@ -174,26 +966,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not hass.services.has_service(DOMAIN, SERVICE_SET_OUTPUT):
 
         async def async_set_output(call: ServiceCall) -> None:
-            entity_id: str | list[str] | None = call.data.get(ATTR_ENTITY_ID)
-            if entity_id is None:
-                raise HomeAssistantError("entity_id is required")
-            if isinstance(entity_id, list):
-                if len(entity_id) != 1:
-                    raise HomeAssistantError("Exactly one entity_id is required")
-                entity_id = entity_id[0]
+            config_entry = _async_get_controller_entry(hass, call)
             preset: str | None = call.data.get(ATTR_PRESET)
             value: float | None = call.data.get(ATTR_VALUE)
-
-            registry = er.async_get(hass)
-            ent = registry.async_get(entity_id)
-            if ent is None:
-                raise HomeAssistantError(f"Unknown entity {entity_id}")
-            config_entry = hass.config_entries.async_get_entry(ent.config_entry_id)
-            if config_entry is None or config_entry.runtime_data is None:
-                raise HomeAssistantError("PID controller not loaded")
             dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
-            out_min = dev_handle.get_number("output_min") or 0.0
-            out_max = dev_handle.get_number("output_max") or 0.0
+            out_min = dev_handle.params.output_min or 0.0
+            out_max = dev_handle.params.output_max or 0.0
 
             if (preset is None and value is None) or (
                 preset is not None and value is not None
@@ -206,7 +984,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 elif preset == "last_known_value":
                     target = dev_handle.last_known_output or 0.0
                 elif preset == "startup_value":
-                    target = dev_handle.get_number("starting_output") or 0.0
+                    target = dev_handle.params.starting_output or 0.0
                 else:
                     raise HomeAssistantError("Invalid preset")
             else:
@@ -235,10 +1013,200 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             DOMAIN, SERVICE_SET_OUTPUT, async_set_output, schema=SET_OUTPUT_SCHEMA
         )
 
+    if not hass.services.has_service(DOMAIN, SERVICE_SIMULATE):
+
+        async def async_simulate(call: ServiceCall) -> ServiceResponse:
+            config_entry = _async_get_controller_entry(hass, call)
+            dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
+            # Snapshot the controller in the event loop, simulate in the executor
+            plant, params, initial = _simulation_setup(dev_handle, call.data)
+            return await hass.async_add_executor_job(
+                _simulate_controller,
+                plant,
+                params,
+                call.data[ATTR_DURATION],
+                initial,
+                dev_handle.last_known_output,
+            )
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SIMULATE,
+            async_simulate,
+            schema=SIMULATE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_AUTOTUNE):
+
+        async def async_autotune(call: ServiceCall) -> None:
+            config_entry = _async_get_controller_entry(hass, call)
+            dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
+            if dev_handle.autotune_task is not None:
+                raise HomeAssistantError("Autotune already running")
+            params = dev_handle.params
+            if params.setpoint is None or params.kp is None:
+                raise HomeAssistantError("PID controller has no parameters yet")
+            out_min = params.output_min or 0.0
+            out_max = params.output_max or 0.0
+            bias = call.data.get(ATTR_BIAS)
+            if bias is None:
+                bias = dev_handle.last_known_output
+            if bias is None:
+                bias = (out_min + out_max) / 2
+            amplitude = call.data.get(ATTR_AMPLITUDE, (out_max - out_min) / 4)
+            try:
+                tuner = RelayAutotuner(
+                    params.setpoint,
+                    bias,
+                    amplitude,
+                    hysteresis=call.data[ATTR_HYSTERESIS],
+                    cycles=call.data[ATTR_CYCLES],
+                    reverse=params.kp < 0,
+                    output_limits=(params.output_min, params.output_max),
+                )
+            except ValueError as err:
+                raise HomeAssistantError(str(err)) from err
+
+            dev_handle.autotune_task = config_entry.async_create_background_task(
+                hass,
+                async_run_autotune(
+                    hass,
+                    dev_handle,
+                    tuner,
+                    call.data[ATTR_RULE],
+                    call.data[ATTR_TIMEOUT],
+                ),
+                f"{DOMAIN} autotune {dev_handle.name}",
+            )
+
+        async def async_cancel_autotune(call: ServiceCall) -> None:
+            config_entry = _async_get_controller_entry(hass, call)
+            dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
+            if dev_handle.autotune_task is None:
+                raise HomeAssistantError("No autotune running")
+            dev_handle.autotune_task.cancel()
+
+        hass.services.async_register(
+            DOMAIN, SERVICE_AUTOTUNE, async_autotune, schema=AUTOTUNE_SCHEMA
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_CANCEL_AUTOTUNE,
+            async_cancel_autotune,
+            schema=CANCEL_AUTOTUNE_SCHEMA,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_SEARCH_GAINS):
+
+        async def async_search_gains_service(call: ServiceCall) -> ServiceResponse:
+            config_entry = _async_get_controller_entry(hass, call)
+            dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
+            if dev_handle.search_task is not None:
+                raise HomeAssistantError("Gain search already running")
+            task = dev_handle.search_task = config_entry.async_create_background_task(
+                hass,
+                _async_search_controller_gains(hass, dev_handle, dict(call.data)),
+                f"{DOMAIN} gain search {dev_handle.name}",
+            )
+            try:
+                return await task
+            except asyncio.CancelledError:
+                # Cancelled through cancel_search rather than the caller
+                if asyncio.current_task().cancelling():
+                    raise
+                raise HomeAssistantError("Gain search cancelled") from None
+            finally:
+                dev_handle.search_task = None
+
+        async def async_cancel_search(call: ServiceCall) -> None:
+            config_entry = _async_get_controller_entry(hass, call)
+            dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
+            if dev_handle.search_task is None:
+                raise HomeAssistantError("No gain search running")
+            dev_handle.search_task.cancel()
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SEARCH_GAINS,
+            async_search_gains_service,
+            schema=SEARCH_GAINS_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_CANCEL_SEARCH,
+            async_cancel_search,
+            schema=CANCEL_SEARCH_SCHEMA,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_REPLAY):
+
+        async def async_replay_service(call: ServiceCall) -> ServiceResponse:
+            config_entry = _async_get_controller_entry(hass, call)
+            dev_handle: PIDDeviceHandle = config_entry.runtime_data.handle
+            params = replace(
+                dev_handle.params,
+                **{
+                    key: call.data[key]
+                    for key in ("kp", "ki", "kd")
+                    if key in call.data
+                },
+            )
+            if params.sample_time is None:
+                raise HomeAssistantError("PID controller has no parameters yet")
+            start = dt_util.as_utc(call.data[ATTR_START])
+            end = dt_util.as_utc(call.data.get(ATTR_END) or dt_util.utcnow())
+            if start >= end:
+                raise HomeAssistantError("start must be before end")
+            if (end - start).total_seconds() / params.sample_time > MAX_REPLAY_STEPS:
+                raise HomeAssistantError(
+                    f"Replay limited to {MAX_REPLAY_STEPS} controller steps"
+                )
+            return await async_replay(
+                hass,
+                params,
+                dev_handle.sensor_entity_id,
+                dev_handle.get_entity_id("number", "setpoint"),
+                dev_handle.get_entity_id("sensor", "pid_output"),
+                start,
+                end,
+                timedelta(hours=call.data[ATTR_CHUNK_HOURS]),
+                dev_handle.last_known_output,
+            )
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_REPLAY,
+            async_replay_service,
+            schema=REPLAY_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+    # Keep the entity_id cache in sync with renames and removals
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            handle.async_entity_registry_updated,
+            event_filter=handle.async_filter_entity_registry_event,
+        )
+    )
+
     # register updatelistener for optionsflow
     entry.async_on_unload(entry.add_update_listener(_async_update_options_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # All parameter entities are registered now, so their real ids resolve
+    handle.async_track_parameter_entities()
+    entry.async_on_unload(handle.async_untrack_parameter_entities)
+
+    # Options can start following the input sensor later, so always clean up
+    entry.async_on_unload(handle.async_untrack_input_sensor)
+    handle.async_track_input_sensor()
+
+    entry.async_on_unload(partial(async_link, hass, entry.entry_id, None))
+    handle.async_update_cascade_link()
     return True
 
 
@@ -249,11 +1217,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.runtime_data = None
         if not hass.config_entries.async_entries(DOMAIN):
             hass.services.async_remove(DOMAIN, SERVICE_SET_OUTPUT)
+            hass.services.async_remove(DOMAIN, SERVICE_SIMULATE)
+            hass.services.async_remove(DOMAIN, SERVICE_AUTOTUNE)
+            hass.services.async_remove(DOMAIN, SERVICE_CANCEL_AUTOTUNE)
+            hass.services.async_remove(DOMAIN, SERVICE_SEARCH_GAINS)
+            hass.services.async_remove(DOMAIN, SERVICE_CANCEL_SEARCH)
+            hass.services.async_remove(DOMAIN, SERVICE_REPLAY)
     return unload_ok
 
 
 async def _async_update_options_listener(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> None:
-    """Update after options are changed in optionsflow"""
+    """Update after options are changed in optionsflow.
+
+    Options are applied in place when the entry is loaded; a reload is only
+    needed when the running controller cannot adopt them.
+    """
+    if (
+        entry.state is ConfigEntryState.LOADED
+        and await entry.runtime_data.handle.async_apply_options()
+    ):
+        _LOGGER.debug("Options of %s applied without reload", entry.title)
+        return
     await hass.config_entries.async_reload(entry.entry_id)
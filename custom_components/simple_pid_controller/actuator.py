@@ -0,0 +1,129 @@
+"""Direct actuator output for Simple PID Controller."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from time import monotonic
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .publish import PublishGate, PublishPolicy
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTPUT_DISPATCHER_KEY: HassKey[OutputDispatcher] = HassKey(f"{DOMAIN}_output")
+
+
+def _percent(value: float) -> int:
+    return int(round(min(max(value, 0.0), 100.0)))
+
+
+# Service, data attribute and value conversion used per target domain
+OUTPUT_SERVICES: dict[str, tuple[str, str, Callable[[float], Any]]] = {
+    "number": ("set_value", "value", float),
+    "input_number": ("set_value", "value", float),
+    "light": ("turn_on", "brightness_pct", _percent),
+    "fan": ("set_percentage", "percentage", _percent),
+    "cover": ("set_cover_position", "position", _percent),
+    "valve": ("set_valve_position", "position", _percent),
+    "climate": ("set_temperature", "temperature", float),
+    "water_heater": ("set_temperature", "temperature", float),
+}
+OUTPUT_DOMAINS = list(OUTPUT_SERVICES)
+
+
+class OutputDispatcher:
+    """Coalesce actuator writes into as few service calls as possible.
+
+    Writes staged in the same event loop iteration that go to the same
+    domain and service with the same data are sent as one call with all
+    their entity_ids. Calls are dispatched without waiting for them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._staged: dict[tuple[str, str, str, Any], dict[str, None]] = {}
+        self.calls = 0
+        self.writes = 0
+
+    @callback
+    def async_stage(self, entity_id: str, value: float) -> None:
+        """Queue writing ``value`` to ``entity_id``."""
+        domain = entity_id.partition(".")[0]
+        service, attr, convert = OUTPUT_SERVICES[domain]
+        if not self._staged:
+            self.hass.loop.call_soon(self._flush)
+        # dict keeps insertion order and drops duplicate entity_ids
+        self._staged.setdefault((domain, service, attr, convert(value)), {})[
+            entity_id
+        ] = None
+        self.writes += 1
+
+    @callback
+    def _flush(self) -> None:
+        staged, self._staged = self._staged, {}
+        for (domain, service, attr, value), entity_ids in staged.items():
+            self.calls += 1
+            self.hass.async_create_task(
+                self._async_call(
+                    domain,
+                    service,
+                    {attr: value, ATTR_ENTITY_ID: list(entity_ids)},
+                ),
+                eager_start=True,
+            )
+
+    async def _async_call(self, domain: str, service: str, data: dict) -> None:
+        try:
+            await self.hass.services.async_call(domain, service, data)
+        except (HomeAssistantError, vol.Invalid) as err:
+            _LOGGER.warning(
+                "Writing PID output to %s failed: %s", data[ATTR_ENTITY_ID], err
+            )
+
+    def as_dict(self) -> dict[str, int]:
+        """Return counters for diagnostics."""
+        return {"writes": self.writes, "service_calls": self.calls}
+
+
+@callback
+def async_get_output_dispatcher(hass: HomeAssistant) -> OutputDispatcher:
+    """Return the dispatcher shared by all config entries."""
+    if (dispatcher := hass.data.get(OUTPUT_DISPATCHER_KEY)) is None:
+        dispatcher = hass.data[OUTPUT_DISPATCHER_KEY] = OutputDispatcher(hass)
+    return dispatcher
+
+
+class ActuatorOutput:
+    """Write the output of one controller to its target entity."""
+
+    def __init__(
+        self,
+        dispatcher: OutputDispatcher,
+        entity_id: str,
+        min_interval: float,
+        deadband: float,
+    ) -> None:
+        """Initialize the output for ``entity_id``."""
+        self.entity_id = entity_id
+        self._dispatcher = dispatcher
+        self._gate = PublishGate(
+            PublishPolicy(deadband=deadband, min_interval=min_interval)
+        )
+
+    @callback
+    def async_write(self, value: float | None) -> bool:
+        """Write ``value`` unless it is None or held back by the rate limit."""
+        if value is None or not self._gate.should_publish(value, True, monotonic()):
+            return False
+        self._dispatcher.async_stage(self.entity_id, value)
+        return True
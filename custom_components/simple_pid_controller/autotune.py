@@ -0,0 +1,210 @@
+"""Relay feedback auto-tuning for Simple PID Controller."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+from math import pi, sqrt
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import PIDDeviceHandle
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_AUTOTUNE_FINISHED = f"{DOMAIN}_autotune_finished"
+
+AUTOTUNE_SUCCEEDED = "succeeded"
+AUTOTUNE_TIMEOUT = "timeout"
+AUTOTUNE_CANCELLED = "cancelled"
+
+# Kp as a fraction of Ku, Ti and Td as fractions of Tu
+TUNING_RULES: dict[str, tuple[float, float, float]] = {
+    "ziegler_nichols": (0.6, 0.5, 0.125),
+    "ziegler_nichols_pi": (0.45, 1 / 1.2, 0.0),
+    "tyreus_luyben": (1 / 2.2, 2.2, 1 / 6.3),
+}
+DEFAULT_TUNING_RULE = "ziegler_nichols"
+
+
+class RelayAutotuner:
+    """Relay feedback experiment measuring the ultimate gain and period.
+
+    The output switches between ``bias + amplitude`` and ``bias - amplitude``
+    whenever the process value crosses the setpoint by more than the
+    hysteresis, which makes the loop oscillate at its ultimate period. Each
+    full cycle is measured as it completes; only the last ``cycles`` are
+    kept, after one warm-up cycle is discarded.
+    """
+
+    def __init__(
+        self,
+        setpoint: float,
+        bias: float,
+        amplitude: float,
+        hysteresis: float = 0.0,
+        cycles: int = 3,
+        reverse: bool = False,
+        output_limits: tuple[float | None, float | None] = (None, None),
+    ) -> None:
+        """Initialize the experiment, ``reverse`` for controllers with Kp < 0."""
+        low, high = bias - amplitude, bias + amplitude
+        if output_limits[0] is not None:
+            low = max(low, output_limits[0])
+        if output_limits[1] is not None:
+            high = min(high, output_limits[1])
+        if high <= low:
+            raise ValueError("relay amplitude must be positive within the limits")
+        self.setpoint = setpoint
+        self.high = high
+        self.low = low
+        self.hysteresis = hysteresis
+        self.cycles = cycles
+        self.reverse = reverse
+        self.periods: deque[float] = deque(maxlen=cycles)
+        self.amplitudes: deque[float] = deque(maxlen=cycles)
+        self.cycles_done = 0
+        self._relay_high: bool | None = None
+        self._cycle_start: float | None = None
+        self._max = -float("inf")
+        self._min = float("inf")
+
+    @property
+    def finished(self) -> bool:
+        """Whether enough cycles were measured."""
+        return self.cycles_done > self.cycles
+
+    def update(self, value: float, now: float) -> float:
+        """Feed a process value measured at ``now`` and return the output."""
+        error = value - self.setpoint if self.reverse else self.setpoint - value
+        if value > self._max:
+            self._max = value
+        if value < self._min:
+            self._min = value
+
+        if self._relay_high is None:
+            self._relay_high = error > 0
+        elif self._relay_high and error < -self.hysteresis:
+            self._relay_high = False
+        elif not self._relay_high and error > self.hysteresis:
+            self._relay_high = True
+            # A full cycle runs from one switch to high to the next
+            if self._cycle_start is not None:
+                self.periods.append(now - self._cycle_start)
+                self.amplitudes.append((self._max - self._min) / 2)
+                self.cycles_done += 1
+            self._cycle_start = now
+            self._max = self._min = value
+
+        return self.high if self._relay_high else self.low
+
+    @property
+    def ultimate_period(self) -> float:
+        """Mean period of the measured cycles in seconds."""
+        return sum(self.periods) / len(self.periods)
+
+    @property
+    def ultimate_gain(self) -> float:
+        """Ultimate gain from the describing function of a relay with hysteresis."""
+        relay = (self.high - self.low) / 2
+        amplitude = sum(self.amplitudes) / len(self.amplitudes)
+        amplitude = sqrt(max(amplitude**2 - self.hysteresis**2, 0.0)) or amplitude
+        return 4 * relay / (pi * amplitude)
+
+    def tunings(self, rule: str = DEFAULT_TUNING_RULE) -> tuple[float, float, float]:
+        """Return (kp, ki, kd) suggested by ``rule``."""
+        kp_factor, ti_factor, td_factor = TUNING_RULES[rule]
+        ku, tu = self.ultimate_gain, self.ultimate_period
+        kp = kp_factor * ku
+        ki = kp / (ti_factor * tu)
+        kd = kp * td_factor * tu
+        sign = -1.0 if self.reverse else 1.0
+        return sign * kp, sign * ki, sign * kd
+
+
+async def async_run_autotune(
+    hass: HomeAssistant,
+    handle: PIDDeviceHandle,
+    tuner: RelayAutotuner,
+    rule: str,
+    timeout: float,
+) -> None:
+    """Run ``tuner`` on the controller of ``handle`` and apply the result.
+
+    The controller is switched to manual like the set_output service does and
+    the relay output is fed through the regular coordinator ticks. On success
+    the suggested gains are written to the Kp/Ki/Kd number entities. In every
+    case the controller then follows its auto mode switch again, starting
+    bumplessly from the relay bias.
+    """
+    coordinator = handle.entry.runtime_data.coordinator
+    pid = handle.pid
+    bias = (tuner.high + tuner.low) / 2
+    finished = asyncio.Event()
+
+    def _check_finished() -> None:
+        if tuner.finished:
+            finished.set()
+
+    result: dict[str, Any] = {"entry_id": handle.entry.entry_id, "rule": rule}
+    start = monotonic()
+    pid.set_auto_mode(False)
+    handle.autotune = tuner
+    remove_listener = coordinator.async_add_listener(_check_finished)
+    try:
+        async with asyncio.timeout(timeout):
+            await finished.wait()
+    except TimeoutError:
+        _LOGGER.warning(
+            "Autotune of %s timed out after %s of %s cycles",
+            handle.name,
+            tuner.cycles_done,
+            tuner.cycles + 1,
+        )
+        result["status"] = AUTOTUNE_TIMEOUT
+    except asyncio.CancelledError:
+        result["status"] = AUTOTUNE_CANCELLED
+        raise
+    else:
+        kp, ki, kd = tuner.tunings(rule)
+        result.update(
+            status=AUTOTUNE_SUCCEEDED,
+            ultimate_gain=tuner.ultimate_gain,
+            ultimate_period=tuner.ultimate_period,
+            kp=kp,
+            ki=ki,
+            kd=kd,
+        )
+    finally:
+        remove_listener()
+        handle.autotune = None
+        handle.autotune_task = None
+        if handle.params.auto_mode:
+            pid.set_auto_mode(True, bias)
+        else:
+            pid._last_output = bias
+        result["duration"] = monotonic() - start
+        handle.autotune_result = result
+        hass.bus.async_fire(EVENT_AUTOTUNE_FINISHED, result)
+
+    _LOGGER.info("Autotune of %s finished: %s", handle.name, result)
+    if result["status"] == AUTOTUNE_SUCCEEDED:
+        for key in ("kp", "ki", "kd"):
+            if not (entity_id := handle.get_entity_id("number", key)):
+                continue
+            try:
+                await hass.services.async_call(
+                    "number",
+                    "set_value",
+                    {"entity_id": entity_id, "value": round(result[key], 4)},
+                    blocking=True,
+                )
+            except HomeAssistantError as err:
+                _LOGGER.warning("Could not apply autotuned %s: %s", key, err)
@@ -0,0 +1,115 @@
+"""In-process cascade links between Simple PID controllers.
+
+The inner controller of a cascade takes the output of its outer controller
+as setpoint, read from memory instead of through a sensor state and an
+automation. Controllers sharing a tick bucket step outer loops first, so the
+inner loop uses the outer output of the same pass.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import PIDDeviceHandle
+
+_LOGGER = logging.getLogger(__name__)
+
+# Outer controller entry_id keyed by inner controller entry_id
+CASCADE_KEY: HassKey[dict[str, str]] = HassKey(f"{DOMAIN}_cascade")
+
+
+@callback
+def creates_loop(hass: HomeAssistant, inner: str, outer: str | None) -> bool:
+    """Return whether linking ``inner`` to ``outer`` would close a loop."""
+    links = hass.data.get(CASCADE_KEY, {})
+    seen = {inner}
+    while outer is not None:
+        if outer in seen:
+            return True
+        seen.add(outer)
+        outer = links.get(outer)
+    return False
+
+
+@callback
+def async_link(hass: HomeAssistant, inner: str, outer: str | None) -> None:
+    """Make ``outer`` drive the setpoint of ``inner``, None removes the link."""
+    links = hass.data.setdefault(CASCADE_KEY, {})
+    if outer is None:
+        links.pop(inner, None)
+    elif creates_loop(hass, inner, outer):
+        raise HomeAssistantError("A cascade cannot feed a controller back into itself")
+    else:
+        links[inner] = outer
+    _async_update_depths(hass)
+
+
+@callback
+def _async_update_depths(hass: HomeAssistant) -> None:
+    """Give every loaded controller its distance from the outermost loop."""
+    links = hass.data.get(CASCADE_KEY, {})
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        data = getattr(entry, "runtime_data", None)
+        if data is None or data.coordinator is None:
+            continue
+        depth = 0
+        outer = links.get(entry.entry_id)
+        while outer is not None:
+            depth += 1
+            outer = links.get(outer)
+        data.coordinator.cascade_depth = depth
+
+
+@callback
+def _loaded_handle(hass: HomeAssistant, entry_id: str) -> PIDDeviceHandle | None:
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.state is not ConfigEntryState.LOADED:
+        return None
+    return entry.runtime_data.handle
+
+
+@callback
+def cascade_setpoint(hass: HomeAssistant, handle: PIDDeviceHandle) -> float | None:
+    """Return the output of the outer controller of ``handle``, if it has one."""
+    outer_id = hass.data.get(CASCADE_KEY, {}).get(handle.entry.entry_id)
+    if outer_id is None or (outer := _loaded_handle(hass, outer_id)) is None:
+        return None
+    return outer.last_known_output
+
+
+@callback
+def inner_blocks_integral(
+    hass: HomeAssistant, handle: PIDDeviceHandle, error: float
+) -> bool:
+    """Return whether a saturated inner loop blocks the outer integral.
+
+    ``error`` is setpoint minus input of the outer controller. Its integral
+    moves the inner setpoint; while an inner loop sits at the output limit
+    in the direction that move would demand, integrating further only winds
+    up the outer loop.
+    """
+    ki = handle.pid.Ki
+    if not ki or not error:
+        return False
+    outer_id = handle.entry.entry_id
+    push = 1 if ki * error > 0 else -1
+    for inner_id, linked_outer in hass.data.get(CASCADE_KEY, {}).items():
+        if linked_outer != outer_id:
+            continue
+        if (inner := _loaded_handle(hass, inner_id)) is None or not (
+            kp := inner.pid.Kp
+        ):
+            continue
+        demand = push if kp > 0 else -push
+        if inner.output_saturation == demand:
+            return True
+    return False
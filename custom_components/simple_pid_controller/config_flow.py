@@ -29,7 +29,67 @@ from .const import (
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    CONF_PID_ENGINE,
+    PID_ENGINE_OPTIONS,
+    DEFAULT_PID_ENGINE,
+    CONF_UPDATE_MODE,
+    UPDATE_MODE_OPTIONS,
+    DEFAULT_UPDATE_MODE,
+    CONF_MIN_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    CONF_MAX_STALENESS,
+    DEFAULT_MAX_STALENESS,
+    CONF_HISTORY_DEPTH,
+    DEFAULT_HISTORY_DEPTH,
+    MAX_HISTORY_DEPTH,
+    CONF_SCHEDULING_MODE,
+    DEFAULT_SCHEDULING_MODE,
+    SCHEDULING_MODE_OPTIONS,
+    CONF_MISSED_TICK_POLICY,
+    DEFAULT_MISSED_TICK_POLICY,
+    MISSED_TICK_POLICY_OPTIONS,
+    CONF_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_DEADBAND,
+    CONF_PUBLISH_DEADBAND_PCT,
+    DEFAULT_PUBLISH_DEADBAND_PCT,
+    CONF_PUBLISH_MIN_INTERVAL,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    CONF_PUBLISH_HEARTBEAT,
+    DEFAULT_PUBLISH_HEARTBEAT,
+    CONF_OUTPUT_ENTITY_ID,
+    CONF_OUTPUT_MIN_INTERVAL,
+    DEFAULT_OUTPUT_MIN_INTERVAL,
+    CONF_OUTPUT_DEADBAND,
+    DEFAULT_OUTPUT_DEADBAND,
+    CONF_CASCADE_SOURCE,
+    CONF_GAIN_SCHEDULE_SOURCE,
+    GAIN_SCHEDULE_SOURCE_OPTIONS,
+    DEFAULT_GAIN_SCHEDULE_SOURCE,
+    GAIN_SCHEDULE_OFF,
+    GAIN_SCHEDULE_ENTITY,
+    CONF_GAIN_SCHEDULE_ENTITY_ID,
+    CONF_GAIN_SCHEDULE_TABLE,
+    CONF_DT_SOURCE,
+    DT_SOURCE_OPTIONS,
+    DEFAULT_DT_SOURCE,
+    CONF_INPUT_SAMPLING,
+    INPUT_SAMPLING_OPTIONS,
+    DEFAULT_INPUT_SAMPLING,
+    CONF_INPUT_FILTERS,
+    FILTER_OPTIONS,
+    CONF_FILTER_EMA_ALPHA,
+    DEFAULT_FILTER_EMA_ALPHA,
+    CONF_FILTER_MEDIAN_WINDOW,
+    DEFAULT_FILTER_MEDIAN_WINDOW,
+    MAX_FILTER_MEDIAN_WINDOW,
+    CONF_FILTER_KALMAN_PROCESS_NOISE,
+    DEFAULT_FILTER_KALMAN_PROCESS_NOISE,
+    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+    DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
 )
+from .actuator import OUTPUT_DOMAINS
+from .cascade import creates_loop
+from .gain_schedule import GainSchedule
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,6 +118,9 @@ class PIDControllerFlowHandler(ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_SENSOR_ENTITY_ID): selector(
                     {"entity": {"domain": "sensor"}}
                 ),
+                vol.Optional(CONF_OUTPUT_ENTITY_ID): selector(
+                    {"entity": {"domain": OUTPUT_DOMAINS}}
+                ),
                 vol.Optional(
                     CONF_INPUT_RANGE_MIN, default=DEFAULT_INPUT_RANGE_MIN
                 ): vol.Coerce(float),
@@ -102,17 +165,18 @@ class PIDControllerFlowHandler(ConfigFlow, domain=DOMAIN):
                     errors={"base": "output_range_min_max"},
                 )
 
-            return self.async_create_entry(
-                title=user_input[CONF_NAME],
-                data={
-                    CONF_NAME: user_input[CONF_NAME],
-                    CONF_SENSOR_ENTITY_ID: user_input[CONF_SENSOR_ENTITY_ID],
-                    CONF_INPUT_RANGE_MIN: user_input[CONF_INPUT_RANGE_MIN],
-                    CONF_INPUT_RANGE_MAX: user_input[CONF_INPUT_RANGE_MAX],
-                    CONF_OUTPUT_RANGE_MIN: user_input[CONF_OUTPUT_RANGE_MIN],
-                    CONF_OUTPUT_RANGE_MAX: user_input[CONF_OUTPUT_RANGE_MAX],
-                },
-            )
+            data = {
+                CONF_NAME: user_input[CONF_NAME],
+                CONF_SENSOR_ENTITY_ID: user_input[CONF_SENSOR_ENTITY_ID],
+                CONF_INPUT_RANGE_MIN: user_input[CONF_INPUT_RANGE_MIN],
+                CONF_INPUT_RANGE_MAX: user_input[CONF_INPUT_RANGE_MAX],
+                CONF_OUTPUT_RANGE_MIN: user_input[CONF_OUTPUT_RANGE_MIN],
+                CONF_OUTPUT_RANGE_MAX: user_input[CONF_OUTPUT_RANGE_MAX],
+            }
+            if user_input.get(CONF_OUTPUT_ENTITY_ID):
+                data[CONF_OUTPUT_ENTITY_ID] = user_input[CONF_OUTPUT_ENTITY_ID]
+
+            return self.async_create_entry(title=user_input[CONF_NAME], data=data)
 
         return self.async_show_form(step_id="user", data_schema=schema)
 
@@ -145,7 +209,79 @@ class PIDControllerOptionsFlowHandler(OptionsFlow):
         current_output_max = self.config_entry.options.get(
             CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX
         )
+        current_pid_engine = self.config_entry.options.get(
+            CONF_PID_ENGINE, DEFAULT_PID_ENGINE
+        )
+        current_update_mode = self.config_entry.options.get(
+            CONF_UPDATE_MODE, DEFAULT_UPDATE_MODE
+        )
+        current_min_interval = self.config_entry.options.get(
+            CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL
+        )
+        current_max_staleness = self.config_entry.options.get(
+            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+        )
 
+        current_history_depth = self.config_entry.options.get(
+            CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH
+        )
+        current_scheduling_mode = self.config_entry.options.get(
+            CONF_SCHEDULING_MODE, DEFAULT_SCHEDULING_MODE
+        )
+        current_missed_tick_policy = self.config_entry.options.get(
+            CONF_MISSED_TICK_POLICY, DEFAULT_MISSED_TICK_POLICY
+        )
+        current_publish_deadband = self.config_entry.options.get(
+            CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND
+        )
+        current_publish_deadband_pct = self.config_entry.options.get(
+            CONF_PUBLISH_DEADBAND_PCT, DEFAULT_PUBLISH_DEADBAND_PCT
+        )
+        current_publish_min_interval = self.config_entry.options.get(
+            CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL
+        )
+        current_publish_heartbeat = self.config_entry.options.get(
+            CONF_PUBLISH_HEARTBEAT, DEFAULT_PUBLISH_HEARTBEAT
+        )
+        current_output_entity_id = self.config_entry.options.get(
+            CONF_OUTPUT_ENTITY_ID, self.config_entry.data.get(CONF_OUTPUT_ENTITY_ID)
+        )
+        current_output_min_interval = self.config_entry.options.get(
+            CONF_OUTPUT_MIN_INTERVAL, DEFAULT_OUTPUT_MIN_INTERVAL
+        )
+        current_output_deadband = self.config_entry.options.get(
+            CONF_OUTPUT_DEADBAND, DEFAULT_OUTPUT_DEADBAND
+        )
+        current_cascade_source = self.config_entry.options.get(CONF_CASCADE_SOURCE)
+        current_gain_schedule_source = self.config_entry.options.get(
+            CONF_GAIN_SCHEDULE_SOURCE, DEFAULT_GAIN_SCHEDULE_SOURCE
+        )
+        current_gain_schedule_entity_id = self.config_entry.options.get(
+            CONF_GAIN_SCHEDULE_ENTITY_ID
+        )
+        current_gain_schedule_table = self.config_entry.options.get(
+            CONF_GAIN_SCHEDULE_TABLE
+        )
+        current_dt_source = self.config_entry.options.get(
+            CONF_DT_SOURCE, DEFAULT_DT_SOURCE
+        )
+        current_input_sampling = self.config_entry.options.get(
+            CONF_INPUT_SAMPLING, DEFAULT_INPUT_SAMPLING
+        )
+        current_input_filters = self.config_entry.options.get(CONF_INPUT_FILTERS, [])
+        current_filter_ema_alpha = self.config_entry.options.get(
+            CONF_FILTER_EMA_ALPHA, DEFAULT_FILTER_EMA_ALPHA
+        )
+        current_filter_median_window = self.config_entry.options.get(
+            CONF_FILTER_MEDIAN_WINDOW, DEFAULT_FILTER_MEDIAN_WINDOW
+        )
+        current_filter_kalman_process_noise = self.config_entry.options.get(
+            CONF_FILTER_KALMAN_PROCESS_NOISE, DEFAULT_FILTER_KALMAN_PROCESS_NOISE
+        )
+        current_filter_kalman_measurement_noise = self.config_entry.options.get(
+            CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+            DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+        )
         options_schema = vol.Schema(
             {
                 vol.Required(
@@ -168,6 +304,118 @@ class PIDControllerOptionsFlowHandler(OptionsFlow):
                     CONF_OUTPUT_RANGE_MAX,
                     default=current_output_max,
                 ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_CASCADE_SOURCE,
+                    description={"suggested_value": current_cascade_source},
+                ): selector({"config_entry": {"integration": DOMAIN}}),
+                vol.Optional(
+                    CONF_GAIN_SCHEDULE_SOURCE,
+                    default=current_gain_schedule_source,
+                ): vol.In(GAIN_SCHEDULE_SOURCE_OPTIONS),
+                vol.Optional(
+                    CONF_GAIN_SCHEDULE_ENTITY_ID,
+                    description={"suggested_value": current_gain_schedule_entity_id},
+                ): selector({"entity": {}}),
+                vol.Optional(
+                    CONF_GAIN_SCHEDULE_TABLE,
+                    description={"suggested_value": current_gain_schedule_table},
+                ): selector({"text": {"multiline": True}}),
+                vol.Optional(
+                    CONF_DT_SOURCE,
+                    default=current_dt_source,
+                ): vol.In(DT_SOURCE_OPTIONS),
+                vol.Optional(
+                    CONF_INPUT_SAMPLING,
+                    default=current_input_sampling,
+                ): vol.In(INPUT_SAMPLING_OPTIONS),
+                vol.Optional(
+                    CONF_INPUT_FILTERS,
+                    default=current_input_filters,
+                ): selector(
+                    {
+                        "select": {
+                            "options": FILTER_OPTIONS,
+                            "multiple": True,
+                            "translation_key": CONF_INPUT_FILTERS,
+                        }
+                    }
+                ),
+                vol.Optional(
+                    CONF_FILTER_EMA_ALPHA,
+                    default=current_filter_ema_alpha,
+                ): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=1, min_included=False)
+                ),
+                vol.Optional(
+                    CONF_FILTER_MEDIAN_WINDOW,
+                    default=current_filter_median_window,
+                ): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_FILTER_MEDIAN_WINDOW)
+                ),
+                vol.Optional(
+                    CONF_FILTER_KALMAN_PROCESS_NOISE,
+                    default=current_filter_kalman_process_noise,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+                vol.Optional(
+                    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+                    default=current_filter_kalman_measurement_noise,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+                vol.Optional(
+                    CONF_PID_ENGINE,
+                    default=current_pid_engine,
+                ): vol.In(PID_ENGINE_OPTIONS),
+                vol.Optional(
+                    CONF_UPDATE_MODE,
+                    default=current_update_mode,
+                ): vol.In(UPDATE_MODE_OPTIONS),
+                vol.Optional(
+                    CONF_MIN_INTERVAL,
+                    default=current_min_interval,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_MAX_STALENESS,
+                    default=current_max_staleness,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01)),
+                vol.Optional(
+                    CONF_HISTORY_DEPTH,
+                    default=current_history_depth,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_HISTORY_DEPTH)),
+                vol.Optional(
+                    CONF_SCHEDULING_MODE,
+                    default=current_scheduling_mode,
+                ): vol.In(SCHEDULING_MODE_OPTIONS),
+                vol.Optional(
+                    CONF_MISSED_TICK_POLICY,
+                    default=current_missed_tick_policy,
+                ): vol.In(MISSED_TICK_POLICY_OPTIONS),
+                vol.Optional(
+                    CONF_PUBLISH_DEADBAND,
+                    default=current_publish_deadband,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_PUBLISH_DEADBAND_PCT,
+                    default=current_publish_deadband_pct,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_PUBLISH_MIN_INTERVAL,
+                    default=current_publish_min_interval,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_PUBLISH_HEARTBEAT,
+                    default=current_publish_heartbeat,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_OUTPUT_ENTITY_ID,
+                    description={"suggested_value": current_output_entity_id},
+                ): selector({"entity": {"domain": OUTPUT_DOMAINS}}),
+                vol.Optional(
+                    CONF_OUTPUT_MIN_INTERVAL,
+                    default=current_output_min_interval,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_OUTPUT_DEADBAND,
+                    default=current_output_deadband,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
             }
         )
 
@@ -199,6 +447,47 @@ class PIDControllerOptionsFlowHandler(OptionsFlow):
                     errors={"base": "output_range_min_max"},
                 )
 
+            if creates_loop(
+                self.hass,
+                self.config_entry.entry_id,
+                user_input.get(CONF_CASCADE_SOURCE),
+            ):
+                return self.async_show_form(
+                    step_id="init",
+                    data_schema=options_schema,
+                    errors={"base": "cascade_loop"},
+                )
+
+            schedule_source = user_input.get(
+                CONF_GAIN_SCHEDULE_SOURCE, DEFAULT_GAIN_SCHEDULE_SOURCE
+            )
+            table = user_input.get(CONF_GAIN_SCHEDULE_TABLE)
+            gain_schedule_error = None
+            if table:
+                try:
+                    GainSchedule.parse(table)
+                except ValueError:
+                    gain_schedule_error = "gain_schedule_invalid"
+            elif schedule_source != GAIN_SCHEDULE_OFF:
+                gain_schedule_error = "gain_schedule_invalid"
+            if (
+                gain_schedule_error is None
+                and schedule_source == GAIN_SCHEDULE_ENTITY
+                and not user_input.get(CONF_GAIN_SCHEDULE_ENTITY_ID)
+            ):
+                gain_schedule_error = "gain_schedule_entity_missing"
+            if gain_schedule_error is not None:
+                return self.async_show_form(
+                    step_id="init",
+                    data_schema=options_schema,
+                    errors={"base": gain_schedule_error},
+                )
+
+            # Store a cleared output entity explicitly so it overrides entry data
+            user_input.setdefault(CONF_OUTPUT_ENTITY_ID, None)
+            user_input.setdefault(CONF_CASCADE_SOURCE, None)
+            user_input.setdefault(CONF_GAIN_SCHEDULE_ENTITY_ID, None)
+            user_input.setdefault(CONF_GAIN_SCHEDULE_TABLE, None)
             return self.async_create_entry(
                 title=self.config_entry.title,
                 data=user_input,
@@ -16,3 +16,129 @@ DEFAULT_INPUT_RANGE_MIN = 0.0
 DEFAULT_INPUT_RANGE_MAX = 100.0
 DEFAULT_OUTPUT_RANGE_MIN = 0.0
 DEFAULT_OUTPUT_RANGE_MAX = 100.0
+
+CONF_PID_ENGINE = "pid_engine"
+PID_ENGINE_SIMPLE_PID = "simple_pid"
+PID_ENGINE_VECTORIZED = "vectorized"
+PID_ENGINE_KERNEL = "kernel"
+PID_ENGINE_OPTIONS = [PID_ENGINE_SIMPLE_PID, PID_ENGINE_VECTORIZED, PID_ENGINE_KERNEL]
+DEFAULT_PID_ENGINE = PID_ENGINE_SIMPLE_PID
+
+CONF_UPDATE_MODE = "update_mode"
+UPDATE_MODE_INTERVAL = "interval"
+UPDATE_MODE_INPUT_CHANGE = "input_change"
+UPDATE_MODE_OPTIONS = [UPDATE_MODE_INTERVAL, UPDATE_MODE_INPUT_CHANGE]
+DEFAULT_UPDATE_MODE = UPDATE_MODE_INTERVAL
+
+# Input change mode: rate limit and staleness backstop in seconds
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_STALENESS = "max_staleness"
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_STALENESS = 60.0
+
+CONF_SCHEDULING_MODE = "scheduling_mode"
+SCHEDULING_MODE_TIMER = "timer"
+SCHEDULING_MODE_DEADLINE = "deadline"
+SCHEDULING_MODE_OPTIONS = [SCHEDULING_MODE_TIMER, SCHEDULING_MODE_DEADLINE]
+DEFAULT_SCHEDULING_MODE = SCHEDULING_MODE_TIMER
+
+CONF_MISSED_TICK_POLICY = "missed_tick_policy"
+MISSED_TICK_SKIP = "skip"
+MISSED_TICK_CATCH_UP = "catch_up"
+MISSED_TICK_POLICY_OPTIONS = [MISSED_TICK_SKIP, MISSED_TICK_CATCH_UP]
+DEFAULT_MISSED_TICK_POLICY = MISSED_TICK_SKIP
+# Catch-up runs at most this many overdue ticks back to back, older ones are skipped
+MAX_CATCH_UP_TICKS = 10
+
+# Sensor publish policy, thresholds in sensor units or percent, times in seconds
+CONF_PUBLISH_DEADBAND = "publish_deadband"
+CONF_PUBLISH_DEADBAND_PCT = "publish_deadband_pct"
+CONF_PUBLISH_MIN_INTERVAL = "publish_min_interval"
+CONF_PUBLISH_HEARTBEAT = "publish_heartbeat"
+DEFAULT_PUBLISH_DEADBAND = 0.0
+DEFAULT_PUBLISH_DEADBAND_PCT = 0.0
+DEFAULT_PUBLISH_MIN_INTERVAL = 0.0
+DEFAULT_PUBLISH_HEARTBEAT = 0.0
+
+# Optional actuator written with the controller output
+CONF_OUTPUT_ENTITY_ID = "output_entity_id"
+CONF_OUTPUT_MIN_INTERVAL = "output_min_interval"
+CONF_OUTPUT_DEADBAND = "output_deadband"
+DEFAULT_OUTPUT_MIN_INTERVAL = 0.0
+DEFAULT_OUTPUT_DEADBAND = 0.0
+
+# Input sampling: the value current at tick time, or its time-weighted
+# average since the previous tick
+CONF_INPUT_SAMPLING = "input_sampling"
+INPUT_SAMPLING_LATEST = "latest"
+INPUT_SAMPLING_TIME_WEIGHTED = "time_weighted"
+INPUT_SAMPLING_OPTIONS = [INPUT_SAMPLING_LATEST, INPUT_SAMPLING_TIME_WEIGHTED]
+DEFAULT_INPUT_SAMPLING = INPUT_SAMPLING_LATEST
+
+# Time step source: the tick clock, or the timestamps of the input measurements
+CONF_DT_SOURCE = "dt_source"
+DT_SOURCE_TICK = "tick"
+DT_SOURCE_MEASUREMENT = "measurement"
+DT_SOURCE_OPTIONS = [DT_SOURCE_TICK, DT_SOURCE_MEASUREMENT]
+DEFAULT_DT_SOURCE = DT_SOURCE_TICK
+
+# Input filter chain, applied in the listed order before the PID step
+CONF_INPUT_FILTERS = "input_filters"
+FILTER_EMA = "ema"
+FILTER_MEDIAN = "median"
+FILTER_KALMAN = "kalman"
+FILTER_OPTIONS = [FILTER_MEDIAN, FILTER_EMA, FILTER_KALMAN]
+CONF_FILTER_EMA_ALPHA = "filter_ema_alpha"
+CONF_FILTER_MEDIAN_WINDOW = "filter_median_window"
+CONF_FILTER_KALMAN_PROCESS_NOISE = "filter_kalman_process_noise"
+CONF_FILTER_KALMAN_MEASUREMENT_NOISE = "filter_kalman_measurement_noise"
+DEFAULT_FILTER_EMA_ALPHA = 0.3
+DEFAULT_FILTER_MEDIAN_WINDOW = 5
+MAX_FILTER_MEDIAN_WINDOW = 101
+DEFAULT_FILTER_KALMAN_PROCESS_NOISE = 0.01
+DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE = 1.0
+
+# Entry id of the outer controller whose output is this controller's setpoint
+CONF_CASCADE_SOURCE = "cascade_source"
+
+# Gain scheduling: kp/ki/kd interpolated from a table of "x, kp, ki, kd" lines,
+# with x the setpoint, the input or the state of another entity
+CONF_GAIN_SCHEDULE_SOURCE = "gain_schedule_source"
+GAIN_SCHEDULE_OFF = "off"
+GAIN_SCHEDULE_SETPOINT = "setpoint"
+GAIN_SCHEDULE_INPUT = "input"
+GAIN_SCHEDULE_ENTITY = "entity"
+GAIN_SCHEDULE_SOURCE_OPTIONS = [
+    GAIN_SCHEDULE_OFF,
+    GAIN_SCHEDULE_SETPOINT,
+    GAIN_SCHEDULE_INPUT,
+    GAIN_SCHEDULE_ENTITY,
+]
+DEFAULT_GAIN_SCHEDULE_SOURCE = GAIN_SCHEDULE_OFF
+CONF_GAIN_SCHEDULE_ENTITY_ID = "gain_schedule_entity_id"
+CONF_GAIN_SCHEDULE_TABLE = "gain_schedule_table"
+
+CONF_HISTORY_DEPTH = "history_depth"
+DEFAULT_HISTORY_DEPTH = 100
+MAX_HISTORY_DEPTH = 10000
+
+# Aggregate history tiers: 4 hours of minutes and 7 days of hours
+HISTORY_MINUTE_BUCKETS = 240
+HISTORY_HOUR_BUCKETS = 168
+
+# Most controller steps a simulate service call may run
+MAX_SIMULATION_STEPS = 1_000_000
+
+# Most controller steps a replay service call may run
+MAX_REPLAY_STEPS = 10_000_000
+
+# Relay autotune limits, times in seconds
+DEFAULT_AUTOTUNE_TIMEOUT = 3600.0
+MAX_AUTOTUNE_TIMEOUT = 86400.0
+MAX_AUTOTUNE_CYCLES = 20
+
+# Most candidates a search_gains service call may evaluate
+MAX_SEARCH_CANDIDATES = 10000
+
+# Dispatcher signal sent after options were applied in place, format with entry_id
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated_{{}}"
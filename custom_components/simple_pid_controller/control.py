@@ -0,0 +1,39 @@
+"""Controller logic shared by the live loop and the simulator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import PIDParameters
+
+
+def apply_parameters(pid: Any, params: PIDParameters) -> None:
+    """Configure ``pid`` with the tunings, setpoint and limits in ``params``."""
+    pid.tunings = (params.kp, params.ki, params.kd)
+    pid.setpoint = params.setpoint
+
+    if params.windup_protection:
+        pid.output_limits = (params.output_min, params.output_max)
+    else:
+        pid.output_limits = (None, None)
+
+    pid.proportional_on_measurement = params.proportional_on_measurement
+
+
+def apply_auto_mode(
+    pid: Any, params: PIDParameters, last_known_output: float | None
+) -> None:
+    """Follow the auto mode switch, starting up according to the start mode."""
+    if not pid.auto_mode and params.auto_mode:
+        start_mode = params.start_mode
+        if start_mode == "Zero start":
+            pid.set_auto_mode(True, 0)
+        elif start_mode == "Last known value":
+            pid.set_auto_mode(True, last_known_output)
+        elif start_mode == "Startup value":
+            pid.set_auto_mode(True, params.starting_output)
+        else:
+            pid.set_auto_mode(True)
+    else:
+        pid.auto_mode = params.auto_mode
@@ -1,23 +1,47 @@
 """Coordinator for Simple PID Controller."""
 
+from __future__ import annotations
+
 from datetime import timedelta
 import logging
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import DOMAIN
+from .scheduler import PIDTickScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class PIDDataCoordinator(DataUpdateCoordinator[float]):
-    """Coordinator responsible for scheduling PID controller updates."""
+    """Coordinator responsible for scheduling PID controller updates.
+
+    With a scheduler the coordinator has no timer of its own; it is ticked by
+    the shared bucket matching its update_interval instead. A missed tick
+    policy selects a bucket running on absolute deadlines.
+    """
 
     def __init__(
-        self, hass: HomeAssistant, name: str, update_method, interval: float = 10
+        self,
+        hass: HomeAssistant,
+        name: str,
+        update_method,
+        interval: float = 10,
+        scheduler: PIDTickScheduler | None = None,
+        missed_tick_policy: str | None = None,
     ):
         """Initialize the coordinator."""
+        self._scheduler = scheduler
+        self._missed_tick_policy = missed_tick_policy
+        self._scheduled = False
+        # True while a timer-driven (not requested) refresh is running
+        self.scheduled_refresh = False
+        # Intended perf_counter time of the running tick on deadline buckets
+        self.tick_deadline: float | None = None
+        # Number of outer controllers above this one in a cascade
+        self.cascade_depth = 0
         super().__init__(
             hass,
             _LOGGER,
@@ -26,6 +50,71 @@ class PIDDataCoordinator(DataUpdateCoordinator[float]):
         )
         self.update_method = update_method
 
+    @property
+    def update_interval(self) -> timedelta | None:
+        """Interval between updates."""
+        return self._update_interval
+
+    @update_interval.setter
+    def update_interval(self, value: timedelta | None) -> None:
+        """Set interval between updates, moving to another bucket if scheduled."""
+        DataUpdateCoordinator.update_interval.fset(self, value)
+        if self._scheduled:
+            self._schedule_refresh()
+
+    @callback
+    def set_missed_tick_policy(self, policy: str | None) -> None:
+        """Change the missed tick policy, moving to another bucket if scheduled."""
+        if policy == self._missed_tick_policy:
+            return
+        self._missed_tick_policy = policy
+        if self._scheduled:
+            self._schedule_refresh()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh, in a shared bucket when a scheduler is used."""
+        if self._scheduler is None:
+            super()._schedule_refresh()
+            return
+        if self._update_interval_seconds is None:
+            self._unschedule_from_scheduler()
+            return
+        self._scheduler.async_add(
+            self, self._update_interval_seconds, self._missed_tick_policy
+        )
+        self._scheduled = True
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Unschedule refreshes since there are no longer any listeners."""
+        super()._unschedule_refresh()
+        self._unschedule_from_scheduler()
+
+    @callback
+    def _unschedule_from_scheduler(self) -> None:
+        if self._scheduler is not None and self._scheduled:
+            self._scheduler.async_remove(self)
+            self._scheduled = False
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and ignore new runs."""
+        await super().async_shutdown()
+        self._unschedule_from_scheduler()
+
+    async def async_scheduled_refresh(self) -> None:
+        """Refresh on a tick of the shared scheduler."""
+        await self._async_refresh(log_failures=True, scheduled=True)
+
+    async def _async_refresh(self, *args: Any, scheduled: bool = False, **kwargs: Any):
+        """Refresh data, remembering whether the refresh was timer driven."""
+        self.scheduled_refresh = scheduled
+        try:
+            await super()._async_refresh(*args, scheduled=scheduled, **kwargs)
+        finally:
+            self.scheduled_refresh = False
+            self.tick_deadline = None
+
     async def _async_update_data(self) -> float:
         """Perform the PID calculation and return the new output value."""
         try:
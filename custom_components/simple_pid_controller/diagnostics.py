@@ -6,12 +6,18 @@ from typing import Any
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
+from .actuator import OUTPUT_DISPATCHER_KEY
+from .scheduler import SCHEDULER_KEY
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     handle = entry.runtime_data.handle
+    coordinator = entry.runtime_data.coordinator
+    scheduler = hass.data.get(SCHEDULER_KEY)
+    dispatcher = hass.data.get(OUTPUT_DISPATCHER_KEY)
 
     sensor_state = hass.states.get(handle.sensor_entity_id)
     input_sensor_info: dict[str, Any] | None = None
@@ -34,11 +40,54 @@ async def async_get_config_entry_diagnostics(
             "output_range_min": handle.output_range_min,
             "output_range_max": handle.output_range_max,
             "input_sensor": input_sensor_info,
-            "history": {
-                "input": list(handle.input_history),
-                "output": list(handle.output_history),
-                "pid_contributions": list(handle.pid_contribution_history),
-                "sample_time": list(handle.sample_time_history),
+            "entity_id_cache": {
+                "size": len(handle._entity_id_cache),
+                "hits": handle.entity_id_cache_hits,
+                "misses": handle.entity_id_cache_misses,
+            },
+            "scheduler": {
+                "bucket": (
+                    scheduler.interval_of(coordinator)
+                    if scheduler is not None
+                    else None
+                ),
+                "buckets": scheduler.as_dict() if scheduler is not None else [],
+            },
+            "history": handle.history.as_dict(),
+            "history_aggregates": handle.aggregates.as_dict(),
+            "timing": handle.timing.as_dict(),
+            "dt_source": handle.dt_source,
+            "cascade": {
+                "source": handle.cascade_source,
+                "depth": coordinator.cascade_depth,
+            },
+            "gain_schedule": {
+                "source": handle.gain_schedule_source,
+                "entity_id": handle.gain_schedule_entity_id,
+                "breakpoints": (
+                    list(handle.gain_schedule.breakpoints)
+                    if handle.gain_schedule is not None
+                    else []
+                ),
+                "gains": handle.scheduled_gains,
+            },
+            "skipped_steps": handle.skipped_steps,
+            "output": {
+                "entity_id": handle.output_entity_id,
+                "dispatcher": (
+                    dispatcher.as_dict() if dispatcher is not None else None
+                ),
+            },
+            "autotune": {
+                "running": handle.autotune is not None,
+                "cycles_done": (
+                    handle.autotune.cycles_done if handle.autotune else None
+                ),
+                "last_result": handle.autotune_result,
+            },
+            "search": {
+                "running": handle.search_task is not None,
+                "last_result": handle.search_result,
             },
         },
     }
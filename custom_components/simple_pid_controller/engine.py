@@ -0,0 +1,406 @@
+"""Vectorized PID engine for Simple PID Controller.
+
+All controllers that use the vectorized engine share one struct-of-arrays
+state. Controllers that tick in the same event loop iteration (such as all
+controllers with the same sample time) are stepped together in one NumPy pass.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import partial
+from time import monotonic
+
+import numpy as np
+
+# Smallest time step used when two updates share the same timestamp,
+# identical to simple_pid.PID
+MIN_DT = 1e-16
+
+_FLOAT_COLUMNS = (
+    "kp",
+    "ki",
+    "kd",
+    "setpoint",
+    "out_min",
+    "out_max",
+    "proportional",
+    "integral",
+    "derivative",
+    "last_input",
+    "last_output",
+    "last_time",
+)
+_BOOL_COLUMNS = ("p_on_m", "auto_mode")
+
+
+class VectorPIDEngine:
+    """Struct-of-arrays PID state for many controllers.
+
+    The math follows simple_pid.PID 2.0.1 with derivative on measurement, no
+    error map and no sample time gating, which is how this integration
+    configures its controllers. Missing output limits are stored as -inf/+inf
+    and a missing last input or output as NaN.
+    """
+
+    def __init__(
+        self, capacity: int = 16, time_fn: Callable[[], float] = monotonic
+    ) -> None:
+        """Initialize an empty engine."""
+        self.time_fn = time_fn
+        self.capacity = 0
+        self._free: list[int] = []
+        self._used = 0
+        self._staged: dict[
+            int, tuple[float, float | None, asyncio.Future[float | None]]
+        ] = {}
+        for name in _FLOAT_COLUMNS:
+            setattr(self, name, np.empty(0, dtype=np.float64))
+        for name in _BOOL_COLUMNS:
+            setattr(self, name, np.empty(0, dtype=np.bool_))
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        """Return the number of allocated controller slots."""
+        return self._used - len(self._free)
+
+    def _grow(self, capacity: int) -> None:
+        """Resize all columns to hold at least ``capacity`` slots."""
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name in _FLOAT_COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros(extra)]))
+        for name in _BOOL_COLUMNS:
+            column = getattr(self, name)
+            setattr(
+                self, name, np.concatenate([column, np.zeros(extra, dtype=np.bool_)])
+            )
+        self.capacity = capacity
+
+    def allocate(
+        self,
+        kp: float = 1.0,
+        ki: float = 0.0,
+        kd: float = 0.0,
+        setpoint: float = 0.0,
+        output_limits: tuple[float | None, float | None] = (None, None),
+        auto_mode: bool = True,
+        proportional_on_measurement: bool = False,
+        starting_output: float = 0.0,
+    ) -> int:
+        """Reserve a slot for a new controller and return its index."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._used == self.capacity:
+                self._grow(max(2 * self.capacity, 1))
+            slot = self._used
+            self._used += 1
+
+        self.kp[slot], self.ki[slot], self.kd[slot] = kp, ki, kd
+        self.setpoint[slot] = setpoint
+        self.p_on_m[slot] = proportional_on_measurement
+        self.auto_mode[slot] = auto_mode
+        self.out_min[slot], self.out_max[slot] = -np.inf, np.inf
+        self.set_output_limits(slot, output_limits)
+        self.reset(slot)
+        self.integral[slot] = self._clamp(slot, starting_output)
+        return slot
+
+    def release(self, slot: int) -> None:
+        """Return a slot to the free list."""
+        staged = self._staged.pop(slot, None)
+        if staged is not None and not staged[2].done():
+            staged[2].cancel()
+        self._free.append(slot)
+
+    def _clamp(self, slot: int, value: float) -> float:
+        """Clamp a scalar to the output limits of a slot."""
+        return float(min(max(value, self.out_min[slot]), self.out_max[slot]))
+
+    def reset(self, slot: int) -> None:
+        """Reset the internals of a slot like simple_pid.PID.reset."""
+        self.proportional[slot] = 0.0
+        self.integral[slot] = self._clamp(slot, 0.0)
+        self.derivative[slot] = 0.0
+        self.last_time[slot] = self.time_fn()
+        self.last_output[slot] = np.nan
+        self.last_input[slot] = np.nan
+
+    def set_output_limits(
+        self, slot: int, limits: tuple[float | None, float | None] | None
+    ) -> None:
+        """Set output limits of a slot, clamping integral and last output."""
+        if limits is None:
+            self.out_min[slot], self.out_max[slot] = -np.inf, np.inf
+            return
+        lower, upper = limits
+        if lower is not None and upper is not None and upper < lower:
+            raise ValueError("lower limit must be less than upper limit")
+        self.out_min[slot] = -np.inf if lower is None else lower
+        self.out_max[slot] = np.inf if upper is None else upper
+        self.integral[slot] = self._clamp(slot, self.integral[slot])
+        if not np.isnan(self.last_output[slot]):
+            self.last_output[slot] = self._clamp(slot, self.last_output[slot])
+
+    def set_auto_mode(
+        self, slot: int, enabled: bool, last_output: float | None = None
+    ) -> None:
+        """Enable or disable a slot, starting bumplessly from ``last_output``."""
+        if enabled and not self.auto_mode[slot]:
+            self.reset(slot)
+            self.integral[slot] = self._clamp(
+                slot, last_output if last_output is not None else 0.0
+            )
+        self.auto_mode[slot] = enabled
+
+    def step(
+        self,
+        slots: np.ndarray,
+        inputs: np.ndarray,
+        dt: np.ndarray | float | None = None,
+    ) -> np.ndarray:
+        """Step the given slots with new inputs and return their outputs.
+
+        When ``dt`` is None the time step of each slot is measured with
+        ``time_fn`` since its previous update, as it is for NaN entries of a
+        ``dt`` array. Slots in manual mode return their last output (NaN if
+        there is none) and keep their state.
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        inputs = np.asarray(inputs, dtype=np.float64)
+        now = self.time_fn()
+        if dt is None:
+            dt = now - self.last_time[slots]
+            dt[dt == 0] = MIN_DT
+        else:
+            dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), slots.shape)
+            if (missing := np.isnan(dt)).any():
+                measured = now - self.last_time[slots]
+                measured[measured == 0] = MIN_DT
+                dt = np.where(missing, measured, dt)
+            if np.any(dt <= 0):
+                raise ValueError("dt must be positive")
+
+        auto = self.auto_mode[slots]
+        if not auto.all():
+            outputs = self.last_output[slots].copy()
+            slots, inputs, dt = slots[auto], inputs[auto], dt[auto]
+        else:
+            outputs = None
+
+        kp = self.kp[slots]
+        out_min = self.out_min[slots]
+        out_max = self.out_max[slots]
+
+        error = self.setpoint[slots] - inputs
+        last_input = self.last_input[slots]
+        d_input = np.where(np.isnan(last_input), 0.0, inputs - last_input)
+
+        proportional = np.where(
+            self.p_on_m[slots], self.proportional[slots] - kp * d_input, kp * error
+        )
+        integral = np.clip(
+            self.integral[slots] + self.ki[slots] * error * dt, out_min, out_max
+        )
+        derivative = -self.kd[slots] * d_input / dt
+        output = np.clip(proportional + integral + derivative, out_min, out_max)
+
+        self.proportional[slots] = proportional
+        self.integral[slots] = integral
+        self.derivative[slots] = derivative
+        self.last_output[slots] = output
+        self.last_input[slots] = inputs
+        self.last_time[slots] = now
+
+        if outputs is None:
+            return output
+        outputs[auto] = output
+        return outputs
+
+    def async_stage(
+        self, slot: int, input_: float, dt: float | None = None
+    ) -> asyncio.Future[float | None]:
+        """Queue an input for the batched step of this loop iteration.
+
+        All slots staged before the event loop gets back to the scheduled
+        flush are stepped together. The returned future resolves to the
+        output of the slot. Without ``dt`` the time step is measured.
+        Staging a slot again before the flush replaces its input, and the
+        earlier future resolves to the output of that single step.
+        """
+        loop = asyncio.get_running_loop()
+        if not self._staged:
+            loop.call_soon(self._flush)
+        future: asyncio.Future[float | None] = loop.create_future()
+        if (previous := self._staged.get(slot)) is not None:
+            future.add_done_callback(partial(_chain_future, previous[2]))
+        self._staged[slot] = (input_, dt, future)
+        return future
+
+    def _flush(self) -> None:
+        """Step all staged slots in one pass and resolve their futures."""
+        staged, self._staged = self._staged, {}
+        if not staged:
+            return
+        slots = np.fromiter(staged, dtype=np.intp, count=len(staged))
+        inputs = np.fromiter(
+            (input_ for input_, _, _ in staged.values()),
+            dtype=np.float64,
+            count=len(staged),
+        )
+        dts = np.fromiter(
+            (np.nan if dt is None else dt for _, dt, _ in staged.values()),
+            dtype=np.float64,
+            count=len(staged),
+        )
+        try:
+            outputs = self.step(slots, inputs, None if np.isnan(dts).all() else dts)
+        except Exception as err:  # noqa: BLE001
+            for _, _, future in staged.values():
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for (_, _, future), output in zip(staged.values(), outputs.tolist()):
+            if not future.done():
+                future.set_result(None if output != output else output)
+
+
+def _chain_future(
+    target: asyncio.Future[float | None], source: asyncio.Future[float | None]
+) -> None:
+    """Resolve ``target`` like ``source`` unless it is already done."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif (err := source.exception()) is not None:
+        target.set_exception(err)
+    else:
+        target.set_result(source.result())
+
+
+class EnginePID:
+    """simple_pid.PID compatible view on one slot of a VectorPIDEngine."""
+
+    def __init__(
+        self,
+        engine: VectorPIDEngine,
+        Kp: float = 1.0,
+        Ki: float = 0.0,
+        Kd: float = 0.0,
+        setpoint: float = 0,
+        sample_time: float | None = None,
+        output_limits: tuple[float | None, float | None] = (None, None),
+        auto_mode: bool = True,
+        proportional_on_measurement: bool = False,
+        starting_output: float = 0.0,
+    ) -> None:
+        """Allocate a slot in ``engine`` for this controller."""
+        if sample_time is not None:
+            raise ValueError("EnginePID does not support sample_time gating")
+        self._engine = engine
+        self._slot = engine.allocate(
+            Kp,
+            Ki,
+            Kd,
+            setpoint,
+            output_limits,
+            auto_mode,
+            proportional_on_measurement,
+            starting_output,
+        )
+        self.sample_time = None
+
+    def release(self) -> None:
+        """Free the engine slot of this controller."""
+        self._engine.release(self._slot)
+
+    def __call__(self, input_: float, dt: float | None = None) -> float | None:
+        """Step this controller on its own and return the output."""
+        output = float(
+            self._engine.step(
+                np.array([self._slot]), np.array([input_]), None if dt is None else dt
+            )[0]
+        )
+        return None if output != output else output
+
+    def async_call(
+        self, input_: float, dt: float | None = None
+    ) -> asyncio.Future[float | None]:
+        """Step this controller together with all others staged this iteration."""
+        return self._engine.async_stage(self._slot, input_, dt)
+
+    def _get(self, column: str) -> float:
+        return float(getattr(self._engine, column)[self._slot])
+
+    def _set(self, column: str, value: float) -> None:
+        getattr(self._engine, column)[self._slot] = value
+
+    Kp = property(lambda self: self._get("kp"), lambda self, v: self._set("kp", v))
+    Ki = property(lambda self: self._get("ki"), lambda self, v: self._set("ki", v))
+    Kd = property(lambda self: self._get("kd"), lambda self, v: self._set("kd", v))
+    setpoint = property(
+        lambda self: self._get("setpoint"), lambda self, v: self._set("setpoint", v)
+    )
+
+    @property
+    def tunings(self) -> tuple[float, float, float]:
+        """The tunings used by the controller as a tuple: (Kp, Ki, Kd)."""
+        return self.Kp, self.Ki, self.Kd
+
+    @tunings.setter
+    def tunings(self, tunings: tuple[float, float, float]) -> None:
+        self.Kp, self.Ki, self.Kd = tunings
+
+    @property
+    def components(self) -> tuple[float, float, float]:
+        """The P, I and D terms from the last computation."""
+        return self._get("proportional"), self._get("integral"), self._get("derivative")
+
+    @property
+    def output_limits(self) -> tuple[float | None, float | None]:
+        """The current output limits as a 2-tuple: (lower, upper)."""
+        lower, upper = self._get("out_min"), self._get("out_max")
+        return (
+            None if lower == -np.inf else lower,
+            None if upper == np.inf else upper,
+        )
+
+    @output_limits.setter
+    def output_limits(self, limits: tuple[float | None, float | None] | None) -> None:
+        self._engine.set_output_limits(self._slot, limits)
+
+    @property
+    def proportional_on_measurement(self) -> bool:
+        """Whether the proportional term is calculated on the input."""
+        return bool(self._engine.p_on_m[self._slot])
+
+    @proportional_on_measurement.setter
+    def proportional_on_measurement(self, enabled: bool) -> None:
+        self._engine.p_on_m[self._slot] = enabled
+
+    @property
+    def auto_mode(self) -> bool:
+        """Whether the controller is in auto mode."""
+        return bool(self._engine.auto_mode[self._slot])
+
+    @auto_mode.setter
+    def auto_mode(self, enabled: bool) -> None:
+        self.set_auto_mode(enabled)
+
+    def set_auto_mode(self, enabled: bool, last_output: float | None = None) -> None:
+        """Enable or disable the controller, optionally setting the last output."""
+        self._engine.set_auto_mode(self._slot, enabled, last_output)
+
+    @property
+    def _last_output(self) -> float | None:
+        output = self._get("last_output")
+        return None if output != output else output
+
+    @_last_output.setter
+    def _last_output(self, value: float | None) -> None:
+        self._set("last_output", np.nan if value is None else value)
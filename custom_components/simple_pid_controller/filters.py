@@ -0,0 +1,217 @@
+"""Incremental input filters applied before the PID step."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Sequence
+
+from .const import FILTER_EMA, FILTER_KALMAN, FILTER_MEDIAN
+
+
+class EMAFilter:
+    """Exponential moving average, ``alpha`` is the weight of a new sample."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha: float) -> None:
+        """Initialize the filter, 0 < alpha <= 1."""
+        if not 0 < alpha <= 1:
+            raise ValueError("EMA alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.value: float | None = None
+
+    def update(self, value: float) -> float:
+        """Fold in one sample and return the average."""
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self.value = None
+
+
+class MedianFilter:
+    """Median of the last ``window`` samples.
+
+    The window is kept both in arrival order and sorted. A sample replaces
+    the oldest one with two bisections, but deleting from and inserting into
+    the sorted list shifts up to ``window`` items, so an update is O(window).
+    For the allowed windows (at most MAX_FILTER_MEDIAN_WINDOW) that shift is
+    a short memory move, cheaper than the bookkeeping of a heap-based
+    O(log window) median.
+    """
+
+    __slots__ = ("window", "_samples", "_sorted")
+
+    def __init__(self, window: int) -> None:
+        """Initialize the filter with a window of at least one sample."""
+        if window < 1:
+            raise ValueError("Median window must be at least 1")
+        self.window = window
+        self._samples: deque[float] = deque()
+        self._sorted: list[float] = []
+
+    def update(self, value: float) -> float:
+        """Add one sample and return the median of the window."""
+        if len(self._samples) == self.window:
+            oldest = self._samples.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._samples.append(value)
+        insort(self._sorted, value)
+
+        ordered = self._sorted
+        mid = len(ordered) // 2
+        if len(ordered) % 2:
+            return ordered[mid]
+        return (ordered[mid - 1] + ordered[mid]) / 2
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._samples.clear()
+        self._sorted.clear()
+
+
+class KalmanFilter:
+    """Scalar Kalman filter for a slowly drifting value.
+
+    The value is modelled as a random walk with variance ``process_noise``
+    per sample, measured with variance ``measurement_noise``. A larger ratio
+    of process to measurement noise follows changes faster.
+    """
+
+    __slots__ = ("process_noise", "measurement_noise", "value", "variance")
+
+    def __init__(self, process_noise: float, measurement_noise: float) -> None:
+        """Initialize the filter with positive noise variances."""
+        if process_noise <= 0 or measurement_noise <= 0:
+            raise ValueError("Kalman noise variances must be positive")
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.value: float | None = None
+        self.variance = 0.0
+
+    def update(self, value: float) -> float:
+        """Correct the estimate with one measurement and return it."""
+        if self.value is None:
+            self.value = value
+            self.variance = self.measurement_noise
+            return value
+        predicted = self.variance + self.process_noise
+        gain = predicted / (predicted + self.measurement_noise)
+        self.value += gain * (value - self.value)
+        self.variance = (1 - gain) * predicted
+        return self.value
+
+    def reset(self) -> None:
+        """Forget the estimate."""
+        self.value = None
+        self.variance = 0.0
+
+
+InputFilter = EMAFilter | MedianFilter | KalmanFilter
+
+
+class FilterChain:
+    """Filters applied one after the other to every input sample."""
+
+    __slots__ = ("filters",)
+
+    def __init__(self, filters: Sequence[InputFilter]) -> None:
+        """Initialize the chain, the first filter sees the raw value."""
+        self.filters = tuple(filters)
+
+    @classmethod
+    def from_options(
+        cls,
+        names: Sequence[str],
+        ema_alpha: float,
+        median_window: int,
+        kalman_process_noise: float,
+        kalman_measurement_noise: float,
+    ) -> FilterChain:
+        """Build the chain for the filter ``names`` in their listed order."""
+        filters: list[InputFilter] = []
+        for name in names:
+            if name == FILTER_EMA:
+                filters.append(EMAFilter(ema_alpha))
+            elif name == FILTER_MEDIAN:
+                filters.append(MedianFilter(median_window))
+            elif name == FILTER_KALMAN:
+                filters.append(
+                    KalmanFilter(kalman_process_noise, kalman_measurement_noise)
+                )
+            else:
+                raise ValueError(f"Unknown input filter {name}")
+        return cls(filters)
+
+    def __bool__(self) -> bool:
+        """Return whether the chain changes the input at all."""
+        return bool(self.filters)
+
+    def update(self, value: float) -> float:
+        """Pass one raw sample through every filter."""
+        for input_filter in self.filters:
+            value = input_filter.update(value)
+        return value
+
+    def reset(self) -> None:
+        """Reset every filter."""
+        for input_filter in self.filters:
+            input_filter.reset()
+
+
+class TimeWeightedAverage:
+    """Time-weighted average, min and max of a value between two ticks.
+
+    Every value is weighted by how long it was current. Adding a value and
+    taking the result are O(1); the accumulator restarts from the current
+    value after each take.
+    """
+
+    __slots__ = ("value", "_since", "_area", "_duration", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize an empty accumulator."""
+        self.value: float | None = None
+        self._since = 0.0
+        self._area = 0.0
+        self._duration = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+
+    def _integrate(self, now: float) -> None:
+        if self.value is not None and now > self._since:
+            self._area += self.value * (now - self._since)
+            self._duration += now - self._since
+        self._since = now
+
+    def add(self, value: float | None, now: float) -> None:
+        """Make ``value`` current from ``now`` on, None while unavailable."""
+        self._integrate(now)
+        self.value = value
+        if value is None:
+            return
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def take(self, now: float) -> tuple[float, float, float] | None:
+        """Return (average, min, max) up to ``now`` and start a new period.
+
+        Returns None when no value was seen since the last take.
+        """
+        self._integrate(now)
+        if self._duration > 0:
+            result = (self._area / self._duration, self.minimum, self.maximum)
+        elif self.value is not None:
+            result = (self.value, self.minimum, self.maximum)
+        else:
+            result = None
+        self._area = self._duration = 0.0
+        self.minimum = self.maximum = self.value
+        return result
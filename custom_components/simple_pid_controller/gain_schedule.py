@@ -0,0 +1,78 @@
+"""Gain scheduling through an interpolated breakpoint table."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+
+Gains = tuple[float, float, float]
+
+
+class GainSchedule:
+    """Kp, Ki and Kd interpolated linearly between sorted breakpoints.
+
+    Breakpoints and the slope of every segment are computed once, so a
+    lookup is one bisection plus three multiply-adds. Outside the table the
+    gains of the nearest breakpoint are used.
+    """
+
+    __slots__ = ("breakpoints", "_gains", "_slopes")
+
+    def __init__(self, rows: Iterable[tuple[float, float, float, float]]) -> None:
+        """Initialize the table from (x, kp, ki, kd) rows in any order."""
+        ordered = sorted((float(x), (kp, ki, kd)) for x, kp, ki, kd in rows)
+        if not ordered:
+            raise ValueError("A gain schedule needs at least one breakpoint")
+        self.breakpoints = tuple(x for x, _ in ordered)
+        if len(set(self.breakpoints)) != len(self.breakpoints):
+            raise ValueError("Gain schedule breakpoints must be unique")
+        self._gains: tuple[Gains, ...] = tuple(
+            (float(kp), float(ki), float(kd)) for _, (kp, ki, kd) in ordered
+        )
+        self._slopes: tuple[Gains, ...] = tuple(
+            tuple(
+                (high - low) / (x_high - x_low)
+                for low, high in zip(gains_low, gains_high)
+            )
+            for x_low, x_high, gains_low, gains_high in zip(
+                self.breakpoints,
+                self.breakpoints[1:],
+                self._gains,
+                self._gains[1:],
+            )
+        )
+
+    @classmethod
+    def parse(cls, text: str) -> GainSchedule:
+        """Build the table from lines of ``x, kp, ki, kd``.
+
+        Blank lines and text after ``#`` are ignored.
+        """
+        rows = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            fields = [field.strip() for field in line.split(",")]
+            if len(fields) != 4:
+                raise ValueError(f"Line {number} does not read 'x, kp, ki, kd'")
+            try:
+                rows.append(tuple(float(field) for field in fields))
+            except ValueError as err:
+                raise ValueError(f"Line {number} is not numeric") from err
+        return cls(rows)
+
+    def __len__(self) -> int:
+        """Return the number of breakpoints."""
+        return len(self.breakpoints)
+
+    def lookup(self, x: float) -> Gains:
+        """Return the (kp, ki, kd) scheduled for ``x``."""
+        idx = bisect_right(self.breakpoints, x)
+        if idx == 0:
+            return self._gains[0]
+        if idx == len(self.breakpoints):
+            return self._gains[-1]
+        dx = x - self.breakpoints[idx - 1]
+        (kp, ki, kd), (dkp, dki, dkd) = self._gains[idx - 1], self._slopes[idx - 1]
+        return kp + dkp * dx, ki + dki * dx, kd + dkd * dx
@@ -0,0 +1,259 @@
+"""Fixed-size controller history for Simple PID Controller."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import UTC, datetime
+from math import inf, isnan, nan
+from typing import Any
+
+HISTORY_COLUMNS = (
+    "input",
+    "output",
+    "p",
+    "i",
+    "d",
+    "i_delta",
+    "kp",
+    "ki",
+    "kd",
+    "setpoint",
+    "dt",
+    "raw_input",
+)
+
+
+class HistoryBuffer:
+    """Struct-of-arrays ring buffer with one float column per quantity.
+
+    All storage is allocated up front, so appending a sample only overwrites
+    slots in the preallocated arrays. Missing values are stored as NaN and
+    returned as None.
+    """
+
+    __slots__ = (
+        "depth",
+        "_count",
+        "_index",
+        "_input",
+        "_output",
+        "_p",
+        "_i",
+        "_d",
+        "_i_delta",
+        "_kp",
+        "_ki",
+        "_kd",
+        "_setpoint",
+        "_dt",
+        "_raw_input",
+    )
+
+    def __init__(self, depth: int) -> None:
+        """Allocate ``depth`` samples for every column."""
+        if depth < 1:
+            raise ValueError("History depth must be at least 1")
+        self.depth = depth
+        self._count = 0
+        self._index = 0
+        for name in HISTORY_COLUMNS:
+            setattr(self, f"_{name}", array("d", [nan]) * depth)
+
+    def __len__(self) -> int:
+        """Return the number of stored samples."""
+        return self._count
+
+    def append(
+        self,
+        input_: float,
+        output: float | None,
+        p: float | None,
+        i: float | None,
+        d: float | None,
+        i_delta: float | None,
+        kp: float | None,
+        ki: float | None,
+        kd: float | None,
+        setpoint: float | None,
+        dt: float | None,
+        raw_input: float | None = None,
+    ) -> None:
+        """Store one sample, overwriting the oldest when full.
+
+        ``raw_input`` is the sensor value before the input filters and
+        defaults to ``input_``.
+        """
+        idx = self._index
+        self._input[idx] = input_
+        self._output[idx] = nan if output is None else output
+        self._p[idx] = nan if p is None else p
+        self._i[idx] = nan if i is None else i
+        self._d[idx] = nan if d is None else d
+        self._i_delta[idx] = nan if i_delta is None else i_delta
+        self._kp[idx] = nan if kp is None else kp
+        self._ki[idx] = nan if ki is None else ki
+        self._kd[idx] = nan if kd is None else kd
+        self._setpoint[idx] = nan if setpoint is None else setpoint
+        self._dt[idx] = nan if dt is None else dt
+        self._raw_input[idx] = input_ if raw_input is None else raw_input
+
+        idx += 1
+        self._index = 0 if idx == self.depth else idx
+        if self._count < self.depth:
+            self._count += 1
+
+    def column(self, name: str) -> list[float | None]:
+        """Return one column ordered from oldest to newest sample."""
+        data: array = getattr(self, f"_{name}")
+        if self._count < self.depth:
+            values = data[: self._count]
+        else:
+            values = data[self._index :] + data[: self._index]
+        return [None if isnan(value) else value for value in values]
+
+    def latest(self, name: str) -> float | None:
+        """Return the newest value of a column, or None when empty."""
+        if not self._count:
+            return None
+        value = getattr(self, f"_{name}")[self._index - 1]
+        return None if isnan(value) else value
+
+    def as_dict(self) -> dict[str, list[float | None]]:
+        """Return all columns ordered from oldest to newest sample."""
+        return {name: self.column(name) for name in HISTORY_COLUMNS}
+
+
+AGGREGATE_COLUMNS = ("input", "output", "error", "p", "i", "d")
+AGGREGATE_STATS = ("min", "max", "sum", "n", "last")
+_STAT_COUNT = len(AGGREGATE_STATS)
+
+
+class AggregateTier:
+    """Ring buffer of fixed-length time buckets with min/max/mean/last per column.
+
+    Samples are folded into the current bucket, so adding one is O(1). When a
+    sample falls into a later bucket the next slot is reused; gaps without
+    samples do not occupy slots. Memory is fixed at ``size`` buckets.
+    """
+
+    __slots__ = ("period", "size", "_count", "_index", "_current", "_start", "_stats")
+
+    def __init__(self, period: float, size: int) -> None:
+        """Allocate ``size`` buckets of ``period`` seconds."""
+        if period <= 0 or size < 1:
+            raise ValueError("Aggregate tier needs a positive period and size")
+        self.period = period
+        self.size = size
+        self._count = 0
+        self._index = -1
+        self._current: float | None = None
+        self._start = array("d", [nan]) * size
+        # One array per (column, statistic), indexed column-major
+        self._stats = tuple(
+            array("d", [nan]) * size
+            for _ in range(len(AGGREGATE_COLUMNS) * _STAT_COUNT)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of buckets holding samples."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the bucket storage."""
+        return self._start.itemsize * self.size * (1 + len(self._stats))
+
+    def add(self, timestamp: float, values: tuple[float | None, ...]) -> None:
+        """Fold one sample, ordered as AGGREGATE_COLUMNS, into its bucket."""
+        start = timestamp - timestamp % self.period
+        idx = self._index
+        if self._current is None or start > self._current:
+            idx = self._index = (idx + 1) % self.size
+            if self._count < self.size:
+                self._count += 1
+            self._current = start
+            self._start[idx] = start
+            stats = self._stats
+            for col in range(len(AGGREGATE_COLUMNS)):
+                base = col * _STAT_COUNT
+                stats[base][idx] = inf
+                stats[base + 1][idx] = -inf
+                stats[base + 2][idx] = 0.0
+                stats[base + 3][idx] = 0.0
+                stats[base + 4][idx] = nan
+
+        stats = self._stats
+        for col, value in enumerate(values):
+            if value is None:
+                continue
+            base = col * _STAT_COUNT
+            if value < stats[base][idx]:
+                stats[base][idx] = value
+            if value > stats[base + 1][idx]:
+                stats[base + 1][idx] = value
+            stats[base + 2][idx] += value
+            stats[base + 3][idx] += 1.0
+            stats[base + 4][idx] = value
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return all buckets ordered from oldest to newest."""
+        buckets = []
+        for offset in range(self._count - 1, -1, -1):
+            idx = (self._index - offset) % self.size
+            bucket: dict[str, Any] = {
+                "start": datetime.fromtimestamp(self._start[idx], UTC).isoformat()
+            }
+            for col, name in enumerate(AGGREGATE_COLUMNS):
+                base = col * _STAT_COUNT
+                n = self._stats[base + 3][idx]
+                if not n:
+                    bucket[name] = None
+                    continue
+                bucket[name] = {
+                    "min": self._stats[base][idx],
+                    "max": self._stats[base + 1][idx],
+                    "mean": self._stats[base + 2][idx] / n,
+                    "last": self._stats[base + 4][idx],
+                    "samples": int(n),
+                }
+            buckets.append(bucket)
+        return buckets
+
+
+class AggregateHistory:
+    """Per-minute and per-hour aggregates of the controller loop."""
+
+    __slots__ = ("minute", "hour")
+
+    def __init__(self, minute_buckets: int, hour_buckets: int) -> None:
+        """Allocate both tiers."""
+        self.minute = AggregateTier(60, minute_buckets)
+        self.hour = AggregateTier(3600, hour_buckets)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by both tiers."""
+        return self.minute.nbytes + self.hour.nbytes
+
+    def add(
+        self,
+        timestamp: float,
+        input_: float,
+        output: float | None,
+        error: float | None,
+        p: float | None,
+        i: float | None,
+        d: float | None,
+    ) -> None:
+        """Fold one sample into every tier."""
+        values = (input_, output, error, p, i, d)
+        self.minute.add(timestamp, values)
+        self.hour.add(timestamp, values)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return both tiers for diagnostics."""
+        return {
+            "bytes": self.nbytes,
+            "minute": self.minute.as_list(),
+            "hour": self.hour.as_list(),
+        }
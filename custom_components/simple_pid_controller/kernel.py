@@ -0,0 +1,198 @@
+"""Slotted PID kernel for Simple PID Controller."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from time import monotonic
+
+from .engine import MIN_DT
+
+_INF = float("inf")
+
+
+class PIDKernel:
+    """Drop-in replacement for simple_pid.PID with plain attributes.
+
+    The math follows simple_pid.PID 2.0.1 with derivative on measurement, no
+    error map and no sample time gating, which is how this integration
+    configures its controllers. Output limits are kept as -inf/+inf floats so
+    clamping needs no None checks, and ``step`` returns the output together
+    with the P, I and D terms.
+    """
+
+    __slots__ = (
+        "Kp",
+        "Ki",
+        "Kd",
+        "setpoint",
+        "sample_time",
+        "proportional_on_measurement",
+        "time_fn",
+        "_auto_mode",
+        "_min",
+        "_max",
+        "_proportional",
+        "_integral",
+        "_derivative",
+        "_last_time",
+        "_last_output",
+        "_last_input",
+    )
+
+    def __init__(
+        self,
+        Kp: float = 1.0,
+        Ki: float = 0.0,
+        Kd: float = 0.0,
+        setpoint: float = 0,
+        sample_time: float | None = None,
+        output_limits: tuple[float | None, float | None] = (None, None),
+        auto_mode: bool = True,
+        proportional_on_measurement: bool = False,
+        starting_output: float = 0.0,
+        time_fn: Callable[[], float] = monotonic,
+    ) -> None:
+        """Initialize the kernel like simple_pid.PID."""
+        if sample_time is not None:
+            raise ValueError("PIDKernel does not support sample_time gating")
+        self.Kp, self.Ki, self.Kd = Kp, Ki, Kd
+        self.setpoint = setpoint
+        self.sample_time = None
+        self.proportional_on_measurement = proportional_on_measurement
+        self.time_fn = time_fn
+        self._auto_mode = auto_mode
+        self._min, self._max = -_INF, _INF
+        self._integral = 0.0
+        self._last_output: float | None = None
+        self.output_limits = output_limits
+        self.reset()
+        self._integral = self._clamp(starting_output)
+
+    def _clamp(self, value: float) -> float:
+        if value < self._min:
+            return self._min
+        if value > self._max:
+            return self._max
+        return value
+
+    def step(
+        self, input_: float, dt: float | None = None
+    ) -> tuple[float | None, float, float, float]:
+        """Update the controller and return (output, P, I, D).
+
+        In manual mode the last output is returned and the terms are left
+        untouched. Each call builds the returned tuple and its floats; the
+        controller state itself is updated in place.
+        """
+        if not self._auto_mode:
+            return (
+                self._last_output,
+                self._proportional,
+                self._integral,
+                self._derivative,
+            )
+
+        now = self.time_fn()
+        if dt is None:
+            dt = now - self._last_time or MIN_DT
+        elif dt <= 0:
+            raise ValueError(f"dt has negative value {dt}, must be positive")
+
+        error = self.setpoint - input_
+        last_input = self._last_input
+        d_input = 0.0 if last_input is None else input_ - last_input
+
+        if self.proportional_on_measurement:
+            proportional = self._proportional - self.Kp * d_input
+        else:
+            proportional = self.Kp * error
+
+        integral = self._integral + self.Ki * error * dt
+        low, high = self._min, self._max
+        if integral < low:
+            integral = low
+        elif integral > high:
+            integral = high
+
+        derivative = -self.Kd * d_input / dt
+
+        output = proportional + integral + derivative
+        if output < low:
+            output = low
+        elif output > high:
+            output = high
+
+        self._proportional = proportional
+        self._integral = integral
+        self._derivative = derivative
+        self._last_output = output
+        self._last_input = input_
+        self._last_time = now
+        return output, proportional, integral, derivative
+
+    def __call__(self, input_: float, dt: float | None = None) -> float | None:
+        """Update the controller and return the output."""
+        return self.step(input_, dt)[0]
+
+    @property
+    def components(self) -> tuple[float, float, float]:
+        """The P, I and D terms from the last computation."""
+        return self._proportional, self._integral, self._derivative
+
+    @property
+    def tunings(self) -> tuple[float, float, float]:
+        """The tunings used by the controller as a tuple: (Kp, Ki, Kd)."""
+        return self.Kp, self.Ki, self.Kd
+
+    @tunings.setter
+    def tunings(self, tunings: tuple[float, float, float]) -> None:
+        self.Kp, self.Ki, self.Kd = tunings
+
+    @property
+    def output_limits(self) -> tuple[float | None, float | None]:
+        """The current output limits as a 2-tuple: (lower, upper)."""
+        return (
+            None if self._min == -_INF else self._min,
+            None if self._max == _INF else self._max,
+        )
+
+    @output_limits.setter
+    def output_limits(self, limits: tuple[float | None, float | None] | None) -> None:
+        if limits is None:
+            self._min, self._max = -_INF, _INF
+            return
+        lower, upper = limits
+        if lower is not None and upper is not None and upper < lower:
+            raise ValueError("lower limit must be less than upper limit")
+        self._min = -_INF if lower is None else lower
+        self._max = _INF if upper is None else upper
+        self._integral = self._clamp(self._integral)
+        if self._last_output is not None:
+            self._last_output = self._clamp(self._last_output)
+
+    @property
+    def auto_mode(self) -> bool:
+        """Whether the controller is in auto mode."""
+        return self._auto_mode
+
+    @auto_mode.setter
+    def auto_mode(self, enabled: bool) -> None:
+        self.set_auto_mode(enabled)
+
+    def set_auto_mode(self, enabled: bool, last_output: float | None = None) -> None:
+        """Enable or disable the controller, starting bumplessly from ``last_output``."""
+        if enabled and not self._auto_mode:
+            self.reset()
+            self._integral = self._clamp(
+                last_output if last_output is not None else 0.0
+            )
+        self._auto_mode = enabled
+
+    def reset(self) -> None:
+        """Reset the controller internals like simple_pid.PID.reset."""
+        self._proportional = 0.0
+        self._integral = self._clamp(0.0)
+        self._derivative = 0.0
+        self._last_time = self.time_fn()
+        self._last_output = None
+        self._last_input = None
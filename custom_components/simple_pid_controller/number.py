@@ -6,20 +6,18 @@ import logging
 
 from homeassistant.components.number import RestoreNumber
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
 
 from .entity import BasePIDEntity
 from .const import (
-    CONF_INPUT_RANGE_MIN,
-    CONF_INPUT_RANGE_MAX,
-    CONF_OUTPUT_RANGE_MIN,
-    CONF_OUTPUT_RANGE_MAX,
     DEFAULT_INPUT_RANGE_MIN,
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    SIGNAL_OPTIONS_UPDATED,
 )
 
 # Coordinator is used to centralize the data updates
@@ -142,6 +140,7 @@ class PIDParameterNumber(RestoreNumber):
                 self._attr_native_value = self._attr_native_max_value
             else:
                 self._attr_native_value = last.native_value
+        self._handle.params.set(self._key, self._attr_native_value)
 
     @property
     def native_value(self) -> float:
@@ -149,6 +148,7 @@ class PIDParameterNumber(RestoreNumber):
 
     async def async_set_native_value(self, value: float) -> None:
         self._attr_native_value = value
+        self._handle.params.set(self._key, value)
         self.async_write_ha_state()
 
 
@@ -168,44 +168,11 @@ class ControlParameterNumber(RestoreNumber):
         self._key = desc["key"]
 
         # Compute range limits based on key
-        opts = entry.options or {}
-        data = entry.data or {}
-        input_range_min = opts.get(
-            CONF_INPUT_RANGE_MIN,
-            data.get(CONF_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MIN),
-        )
-        input_range_max = opts.get(
-            CONF_INPUT_RANGE_MAX,
-            data.get(CONF_INPUT_RANGE_MAX, DEFAULT_INPUT_RANGE_MAX),
-        )
-        output_range_min = opts.get(
-            CONF_OUTPUT_RANGE_MIN,
-            data.get(CONF_OUTPUT_RANGE_MIN, DEFAULT_OUTPUT_RANGE_MIN),
-        )
-        output_range_max = opts.get(
-            CONF_OUTPUT_RANGE_MAX,
-            data.get(CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX),
-        )
-
-        if self._key == "setpoint":
-            min_val, max_val = input_range_min, input_range_max
-        elif self._key == "starting_output":
-            min_val, max_val = output_range_min, output_range_max
-        elif self._key == "output_min":
-            min_val, max_val = output_range_min, output_range_max
-        elif self._key == "output_max":
-            min_val, max_val = output_range_min, output_range_max
-        else:
-            _LOGGER.error(
-                "Unknown PID key '%s'. Using default values: input_min=%s, input_max=%s, output_min=%s, output_max=%s",
-                self._key,
-                DEFAULT_INPUT_RANGE_MIN,
-                DEFAULT_INPUT_RANGE_MAX,
-                DEFAULT_OUTPUT_RANGE_MIN,
-                DEFAULT_OUTPUT_RANGE_MAX,
-            )
-            min_val, max_val = DEFAULT_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MAX
-
+        input_range_min = self._handle.input_range_min
+        input_range_max = self._handle.input_range_max
+        output_range_min = self._handle.output_range_min
+        output_range_max = self._handle.output_range_max
+        min_val, max_val = self._range()
         self._attr_native_min_value = min_val
         self._attr_native_max_value = max_val
         self._attr_native_step = desc.get("step", 1.0)
@@ -226,15 +193,57 @@ class ControlParameterNumber(RestoreNumber):
         else:
             _LOGGER.error("Unexpected error, unknown state in number.py")
 
+    def _range(self) -> tuple[float, float]:
+        """Return the (min, max) allowed for this parameter."""
+        handle = self._handle
+        if self._key == "setpoint":
+            return handle.input_range_min, handle.input_range_max
+        if self._key in ("starting_output", "output_min", "output_max"):
+            return handle.output_range_min, handle.output_range_max
+        _LOGGER.error(
+            "Unknown PID key '%s'. Using default values: input_min=%s, input_max=%s, output_min=%s, output_max=%s",
+            self._key,
+            DEFAULT_INPUT_RANGE_MIN,
+            DEFAULT_INPUT_RANGE_MAX,
+            DEFAULT_OUTPUT_RANGE_MIN,
+            DEFAULT_OUTPUT_RANGE_MAX,
+        )
+        return DEFAULT_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MAX
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
         if (last := await self.async_get_last_number_data()) is not None:
-            if last.native_value < self._attr_native_min_value:
-                self._attr_native_value = self._attr_native_min_value
-            elif last.native_value > self._attr_native_max_value:
-                self._attr_native_value = self._attr_native_max_value
-            else:
-                self._attr_native_value = last.native_value
+            self._attr_native_value = last.native_value
+        self._clamp_native_value()
+        self._handle.params.set(self._key, self._attr_native_value)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self._entry.entry_id),
+                self._async_options_updated,
+            )
+        )
+
+    def _clamp_native_value(self) -> None:
+        self._attr_native_value = min(
+            max(self._attr_native_value, self._attr_native_min_value),
+            self._attr_native_max_value,
+        )
+
+    @callback
+    def _async_options_updated(self) -> None:
+        """Adopt new input/output ranges, clamping the current value into them."""
+        min_val, max_val = self._range()
+        if (min_val, max_val) == (
+            self._attr_native_min_value,
+            self._attr_native_max_value,
+        ):
+            return
+        self._attr_native_min_value = min_val
+        self._attr_native_max_value = max_val
+        self._clamp_native_value()
+        self._handle.params.set(self._key, self._attr_native_value)
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> float:
@@ -242,4 +251,5 @@ class ControlParameterNumber(RestoreNumber):
 
     async def async_set_native_value(self, value: float) -> None:
         self._attr_native_value = value
+        self._handle.params.set(self._key, value)
         self.async_write_ha_state()
@@ -0,0 +1,87 @@
+"""State publish policies for Simple PID Controller sensors."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import callback
+
+_UNSET = object()
+
+
+@dataclass(frozen=True, slots=True)
+class PublishPolicy:
+    """When a sensor writes its state, all times in seconds.
+
+    A new value is published when it moved by more than the deadband, which
+    is the larger of ``deadband`` and ``deadband_pct`` percent of the last
+    published value. ``min_interval`` limits how often a sensor publishes
+    and ``heartbeat`` forces a write after that long without one. Zero
+    disables the respective rule.
+    """
+
+    deadband: float = 0.0
+    deadband_pct: float = 0.0
+    min_interval: float = 0.0
+    heartbeat: float = 0.0
+
+
+class PublishGate:
+    """Per-sensor state of a PublishPolicy."""
+
+    __slots__ = ("policy", "_value", "_available", "_time")
+
+    def __init__(self, policy: PublishPolicy) -> None:
+        """Initialize a gate that publishes the first value."""
+        self.policy = policy
+        self._value: Any = _UNSET
+        self._available: bool | None = None
+        self._time = 0.0
+
+    def should_publish(self, value: float | None, available: bool, now: float) -> bool:
+        """Return whether to write ``value`` and remember it if so."""
+        policy = self.policy
+        last = self._value
+        if last is _UNSET or available != self._available:
+            publish = True
+        elif now - self._time < policy.min_interval:
+            publish = False
+        elif policy.heartbeat and now - self._time >= policy.heartbeat:
+            publish = True
+        elif value is None or last is None:
+            publish = value is not last
+        else:
+            deadband = max(policy.deadband, abs(last) * policy.deadband_pct / 100)
+            publish = abs(value - last) > deadband
+
+        if publish:
+            self._value = value
+            self._available = available
+            self._time = now
+        return publish
+
+
+class PublishPolicyMixin:
+    """Skip coordinator driven state writes not allowed by the publish policy.
+
+    Must be combined with CoordinatorEntity and BasePIDEntity. The value is
+    still computed on every update; only the state write is suppressed.
+    """
+
+    _publish_gate: PublishGate | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the publish policy allows it."""
+        policy = self._handle.publish_policy
+        if self._publish_gate is None:
+            self._publish_gate = PublishGate(policy)
+        elif self._publish_gate.policy is not policy:
+            # Options changed in place, keep the last published value
+            self._publish_gate.policy = policy
+        if self._publish_gate.should_publish(
+            self.native_value, self.available, monotonic()
+        ):
+            super()._handle_coordinator_update()
@@ -0,0 +1,246 @@
+"""Replay recorded history through a shadow copy of a controller."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .control import apply_auto_mode, apply_parameters
+from .kernel import PIDKernel
+
+if TYPE_CHECKING:
+    from . import PIDParameters
+
+DEFAULT_REPLAY_CHUNK = timedelta(hours=24)
+
+Samples = tuple[list[float], list[float]]
+
+
+class ReplayStats:
+    """Running error and output statistics, constant in size."""
+
+    __slots__ = (
+        "ticks",
+        "iae",
+        "ise",
+        "max_abs_error",
+        "output_sum",
+        "output_min",
+        "output_max",
+        "output_travel",
+        "output_diff_sum",
+        "output_diff_count",
+        "_last_output",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.ticks = 0
+        self.iae = self.ise = self.max_abs_error = 0.0
+        self.output_sum = self.output_travel = 0.0
+        self.output_min = float("inf")
+        self.output_max = -float("inf")
+        self.output_diff_sum = 0.0
+        self.output_diff_count = 0
+        self._last_output: float | None = None
+
+    def add(self, error: float, output: float, dt: float, actual: float | None) -> None:
+        """Record one tick, ``actual`` is the recorded live output if known."""
+        self.ticks += 1
+        abs_error = abs(error)
+        self.iae += abs_error * dt
+        self.ise += error * error * dt
+        if abs_error > self.max_abs_error:
+            self.max_abs_error = abs_error
+        self.output_sum += output
+        if output < self.output_min:
+            self.output_min = output
+        if output > self.output_max:
+            self.output_max = output
+        if self._last_output is not None:
+            self.output_travel += abs(output - self._last_output)
+        self._last_output = output
+        if actual is not None:
+            self.output_diff_sum += abs(output - actual)
+            self.output_diff_count += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics, None where no tick was recorded."""
+        ticks = self.ticks
+        return {
+            "ticks": ticks,
+            "iae": self.iae,
+            "ise": self.ise,
+            "max_abs_error": self.max_abs_error if ticks else None,
+            "output_mean": self.output_sum / ticks if ticks else None,
+            "output_min": self.output_min if ticks else None,
+            "output_max": self.output_max if ticks else None,
+            "output_travel": self.output_travel,
+            "mean_abs_output_difference": (
+                self.output_diff_sum / self.output_diff_count
+                if self.output_diff_count
+                else None
+            ),
+        }
+
+
+class ShadowController:
+    """Controller stepped on recorded inputs instead of live ones.
+
+    Uses the same parameter and start mode handling as the live loop. The
+    latest input, setpoint and live output seen are carried over between
+    chunks.
+    """
+
+    def __init__(
+        self, params: PIDParameters, last_known_output: float | None = None
+    ) -> None:
+        """Initialize the shadow controller with ``params``."""
+        self.sample_time: float = params.sample_time
+        self._clock = 0.0
+        self.pid = PIDKernel(auto_mode=False, time_fn=lambda: self._clock)
+        apply_parameters(self.pid, params)
+        apply_auto_mode(self.pid, params, last_known_output)
+        self.next_tick: float | None = None
+        self.input: float | None = None
+        self.setpoint: float | None = params.setpoint
+        self.actual: float | None = None
+
+    def replay(
+        self,
+        start: float,
+        end: float,
+        inputs: Samples,
+        setpoints: Samples,
+        actuals: Samples,
+        stats: ReplayStats,
+    ) -> None:
+        """Step on every sample time tick between the start and end timestamps.
+
+        Each tick uses the latest input, setpoint and live output recorded at
+        or before it. Runs in the executor.
+        """
+        dt = self.sample_time
+        tick = self.next_tick
+        if tick is None:
+            if not inputs[0]:
+                return
+            tick = max(inputs[0][0], start)
+        while tick < end:
+            self.input = _latest(inputs, tick, self.input)
+            self.setpoint = _latest(setpoints, tick, self.setpoint)
+            self.actual = _latest(actuals, tick, self.actual)
+            if self.input is not None and self.setpoint is not None:
+                self._clock = tick
+                self.pid.setpoint = self.setpoint
+                output = self.pid.step(self.input, dt)[0]
+                if output is not None:
+                    stats.add(self.input - self.setpoint, output, dt, self.actual)
+            tick += dt
+        self.next_tick = tick
+
+
+def _latest(samples: Samples, at: float, default: float | None) -> float | None:
+    times, values = samples
+    idx = bisect_right(times, at)
+    return values[idx - 1] if idx else default
+
+
+def _numeric_samples(states: list) -> Samples:
+    times: list[float] = []
+    values: list[float] = []
+    for state in states:
+        try:
+            value = float(state.state)
+        except ValueError:
+            continue
+        times.append(state.last_updated.timestamp())
+        values.append(value)
+    return times, values
+
+
+def _fetch_chunk(
+    hass: HomeAssistant, start: datetime, end: datetime, entity_ids: list[str]
+) -> list[Samples]:
+    """Return numeric samples per entity between start and end.
+
+    Runs in the recorder executor; the state at ``start`` is included.
+    """
+    from homeassistant.components.recorder import history
+
+    states = history.get_significant_states(
+        hass,
+        start,
+        end,
+        entity_ids,
+        significant_changes_only=False,
+        no_attributes=True,
+    )
+    return [_numeric_samples(states.get(entity_id, [])) for entity_id in entity_ids]
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    params: PIDParameters,
+    input_entity_id: str,
+    setpoint_entity_id: str | None,
+    output_entity_id: str | None,
+    start: datetime,
+    end: datetime,
+    chunk: timedelta = DEFAULT_REPLAY_CHUNK,
+    last_known_output: float | None = None,
+) -> dict[str, Any]:
+    """Replay recorded history between start and end through a shadow controller.
+
+    History is fetched ``chunk`` at a time and only the running totals are
+    kept, so memory and the response do not grow with the replayed period.
+    The recorded output of the live controller, when given, is compared with
+    the shadow output.
+    """
+    if "recorder" not in hass.config.components:
+        raise HomeAssistantError("Replay needs the recorder integration")
+    from homeassistant.components.recorder import get_instance
+
+    recorder = get_instance(hass)
+    entity_ids = [input_entity_id, setpoint_entity_id, output_entity_id]
+    queried = [entity_id for entity_id in entity_ids if entity_id]
+    shadow = ShadowController(params, last_known_output)
+    total = ReplayStats()
+    chunks = 0
+    empty: Samples = ([], [])
+
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + chunk, end)
+        fetched = dict(
+            zip(
+                queried,
+                await recorder.async_add_executor_job(
+                    _fetch_chunk, hass, chunk_start, chunk_end, queried
+                ),
+            )
+        )
+        samples = [fetched.get(entity_id, empty) for entity_id in entity_ids]
+        await hass.async_add_executor_job(
+            shadow.replay,
+            chunk_start.timestamp(),
+            chunk_end.timestamp(),
+            *samples,
+            total,
+        )
+        chunks += 1
+        chunk_start = chunk_end
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "kp": params.kp,
+        "ki": params.ki,
+        "kd": params.kd,
+        **total.as_dict(),
+        "chunks": chunks,
+    }
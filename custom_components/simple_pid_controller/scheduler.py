@@ -0,0 +1,224 @@
+"""Shared tick scheduler for Simple PID Controller."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, MAX_CATCH_UP_TICKS, MISSED_TICK_CATCH_UP
+
+if TYPE_CHECKING:
+    from .coordinator import PIDDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEDULER_KEY: HassKey[PIDTickScheduler] = HassKey(f"{DOMAIN}_scheduler")
+
+
+@dataclass
+class TickBucket:
+    """Controllers sharing one sample time, one policy and one timer.
+
+    ``policy`` is None for buckets driven by a Home Assistant interval timer,
+    which re-arms relative to when it fired; a tick that fires while the
+    previous one is still running is skipped. Otherwise the bucket runs on
+    absolute loop deadlines and ``policy`` decides what happens to ticks
+    missed while the loop was busy.
+    """
+
+    interval: float
+    policy: str | None = None
+    members: set[PIDDataCoordinator] = field(default_factory=set)
+    unsub: CALLBACK_TYPE | None = None
+    ticks: int = 0
+    last_wall_time: float | None = None
+    max_wall_time: float = 0.0
+    deadline: float | None = None
+    skipped: int = 0
+    timer: asyncio.TimerHandle | None = None
+    task: asyncio.Task[None] | None = None
+    active: bool = True
+
+
+class PIDTickScheduler:
+    """Fire all controllers with the same sample time from a single timer."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._buckets: dict[tuple[float, str | None], TickBucket] = {}
+        self._bucket_of: dict[PIDDataCoordinator, TickBucket] = {}
+
+    @callback
+    def async_add(
+        self,
+        coordinator: PIDDataCoordinator,
+        interval: float,
+        policy: str | None = None,
+    ) -> None:
+        """Schedule a coordinator in the bucket for ``interval`` seconds.
+
+        With a missed tick ``policy`` the bucket runs on absolute deadlines.
+        """
+        current = self._bucket_of.get(coordinator)
+        if current is not None:
+            if current.interval == interval and current.policy == policy:
+                return
+            self.async_remove(coordinator)
+
+        key = (interval, policy)
+        if (bucket := self._buckets.get(key)) is None:
+            bucket = self._buckets[key] = TickBucket(interval, policy)
+            if policy is None:
+                bucket.unsub = async_track_time_interval(
+                    self.hass,
+                    partial(self._fire_interval, bucket),
+                    timedelta(seconds=interval),
+                    name=f"{DOMAIN} tick {interval}s",
+                )
+            else:
+                bucket.deadline = self.hass.loop.time() + interval
+                bucket.unsub = partial(self._cancel_deadline, bucket)
+                self._arm_deadline(bucket)
+            _LOGGER.debug("Created tick bucket for %.2f seconds", interval)
+        bucket.members.add(coordinator)
+        self._bucket_of[coordinator] = bucket
+
+    @callback
+    def async_remove(self, coordinator: PIDDataCoordinator) -> None:
+        """Remove a coordinator, dropping its bucket when it becomes empty."""
+        if (bucket := self._bucket_of.pop(coordinator, None)) is None:
+            return
+        bucket.members.discard(coordinator)
+        if not bucket.members:
+            if bucket.unsub is not None:
+                bucket.unsub()
+            del self._buckets[(bucket.interval, bucket.policy)]
+            _LOGGER.debug("Removed tick bucket for %.2f seconds", bucket.interval)
+
+    @callback
+    def _fire_interval(self, bucket: TickBucket, _now: datetime) -> None:
+        """Start a tick unless the previous one of the bucket is still running.
+
+        Overlapping ticks would step the same controllers twice with the
+        wrong dt, so the late tick is dropped and counted as skipped.
+        """
+        if bucket.task is not None and not bucket.task.done():
+            bucket.skipped += 1
+            _LOGGER.debug(
+                "Skipping %.2f second tick, previous tick still running",
+                bucket.interval,
+            )
+            return
+        bucket.task = self.hass.async_create_task(
+            self._async_tick(bucket, None),
+            name=f"{DOMAIN} tick {bucket.interval}s",
+        )
+
+    @callback
+    def _arm_deadline(self, bucket: TickBucket) -> None:
+        bucket.timer = self.hass.loop.call_at(
+            bucket.deadline, self._fire_deadline, bucket
+        )
+
+    @callback
+    def _cancel_deadline(self, bucket: TickBucket) -> None:
+        bucket.active = False
+        if bucket.timer is not None:
+            bucket.timer.cancel()
+            bucket.timer = None
+
+    @callback
+    def _fire_deadline(self, bucket: TickBucket) -> None:
+        bucket.timer = None
+        self.hass.async_create_background_task(
+            self._async_deadline_tick(bucket),
+            name=f"{DOMAIN} tick {bucket.interval}s",
+        )
+
+    async def _async_deadline_tick(self, bucket: TickBucket) -> None:
+        """Run one tick and arm the next deadline on the fixed grid.
+
+        Ticks of a bucket never overlap. If the tick ran past later deadlines,
+        ``skip`` resumes at the next deadline in the future while ``catch_up``
+        runs the overdue ticks back to back, up to MAX_CATCH_UP_TICKS.
+        """
+        # Hand the deadline to the controllers in perf_counter time
+        deadline = perf_counter() - (self.hass.loop.time() - bucket.deadline)
+        for member in bucket.members:
+            member.tick_deadline = deadline
+        await self._async_tick(bucket, None)
+        if not bucket.active:
+            return
+
+        interval = bucket.interval
+        bucket.deadline += interval
+        overdue = self.hass.loop.time() - bucket.deadline
+        if overdue > 0:
+            missed = int(overdue // interval) + 1
+            if bucket.policy == MISSED_TICK_CATCH_UP:
+                missed = max(0, missed - MAX_CATCH_UP_TICKS)
+            bucket.skipped += missed
+            bucket.deadline += missed * interval
+        self._arm_deadline(bucket)
+
+    def interval_of(self, coordinator: PIDDataCoordinator) -> float | None:
+        """Return the bucket interval a coordinator is scheduled in."""
+        bucket = self._bucket_of.get(coordinator)
+        return bucket.interval if bucket is not None else None
+
+    async def _async_tick(self, bucket: TickBucket, _now: datetime | None) -> None:
+        """Refresh all controllers of a bucket together.
+
+        Cascaded controllers refresh level by level, outer loops first, so
+        inner loops read the outer output of this tick.
+        """
+        start = perf_counter()
+        members = tuple(bucket.members)
+        depths = sorted({member.cascade_depth for member in members})
+        for depth in depths:
+            await asyncio.gather(
+                *(
+                    member.async_scheduled_refresh()
+                    for member in members
+                    if member.cascade_depth == depth
+                )
+            )
+        wall_time = perf_counter() - start
+        bucket.ticks += 1
+        bucket.last_wall_time = wall_time
+        bucket.max_wall_time = max(bucket.max_wall_time, wall_time)
+
+    def as_dict(self) -> list[dict[str, Any]]:
+        """Return bucket occupancy and timing for diagnostics."""
+        return [
+            {
+                "interval": bucket.interval,
+                "policy": bucket.policy,
+                "controllers": len(bucket.members),
+                "ticks": bucket.ticks,
+                "last_wall_time": bucket.last_wall_time,
+                "max_wall_time": bucket.max_wall_time,
+                "skipped": bucket.skipped,
+            }
+            for bucket in sorted(
+                self._buckets.values(), key=lambda b: (b.interval, b.policy or "")
+            )
+        ]
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PIDTickScheduler:
+    """Return the scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(SCHEDULER_KEY)) is None:
+        scheduler = hass.data[SCHEDULER_KEY] = PIDTickScheduler(hass)
+    return scheduler
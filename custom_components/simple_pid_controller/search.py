@@ -0,0 +1,208 @@
+"""Parallel search for PID gains on a simulated plant."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from math import inf
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .simulation import PlantModel, simulate
+
+if TYPE_CHECKING:
+    from . import PIDParameters
+
+EVENT_SEARCH_PROGRESS = f"{DOMAIN}_search_progress"
+
+SEARCH_GRID = "grid"
+SEARCH_LATIN_HYPERCUBE = "latin_hypercube"
+SEARCH_METHODS = [SEARCH_GRID, SEARCH_LATIN_HYPERCUBE]
+
+# Batches per worker, more batches stream results more often
+BATCHES_PER_WORKER = 4
+
+# Most worker processes used by default, one CPU is left to Home Assistant
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class CandidateResult:
+    """Simulated performance of one (kp, ki, kd) candidate."""
+
+    kp: float
+    ki: float
+    kd: float
+    iae: float
+    overshoot_pct: float | None
+    settling_time: float | None
+    final_error: float
+
+    @property
+    def rank_key(self) -> tuple[float, float, float]:
+        """Sort key: IAE, then overshoot, then settling time, lower is better."""
+        return (
+            self.iae,
+            self.overshoot_pct or 0.0,
+            inf if self.settling_time is None else self.settling_time,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result as a table row."""
+        return {
+            "kp": self.kp,
+            "ki": self.ki,
+            "kd": self.kd,
+            "iae": self.iae,
+            "overshoot_pct": self.overshoot_pct,
+            "settling_time": self.settling_time,
+            "final_error": self.final_error,
+        }
+
+
+def grid_candidates(bounds: Sequence[tuple[float, float]], samples: int) -> np.ndarray:
+    """Return an even grid of at most ``samples`` (kp, ki, kd) rows.
+
+    Axes whose bounds are equal are fixed; the others get the same number of
+    points each.
+    """
+    varying = sum(low != high for low, high in bounds)
+    points = max(1, int(samples ** (1 / varying) + 1e-9)) if varying else 1
+    axes = [
+        np.linspace(low, high, points) if low != high else np.array([low])
+        for low, high in bounds
+    ]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+def latin_hypercube_candidates(
+    bounds: Sequence[tuple[float, float]], samples: int, seed: int | None = None
+) -> np.ndarray:
+    """Return ``samples`` (kp, ki, kd) rows from a Latin hypercube.
+
+    Each axis is split into ``samples`` equal strata and every stratum is
+    sampled exactly once, so few samples still cover each gain's range.
+    """
+    rng = np.random.default_rng(seed)
+    columns = []
+    for low, high in bounds:
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns.append(low + strata * (high - low))
+    return np.column_stack(columns)
+
+
+def evaluate_candidates(
+    plant: PlantModel,
+    params: PIDParameters,
+    candidates: Sequence[Sequence[float]],
+    duration: float,
+    initial_value: float,
+) -> list[CandidateResult]:
+    """Simulate every candidate, runs in a worker process."""
+    results = []
+    for kp, ki, kd in candidates:
+        metrics = simulate(
+            plant,
+            replace(params, kp=float(kp), ki=float(ki), kd=float(kd)),
+            duration,
+            initial_value,
+        ).metrics()
+        results.append(
+            CandidateResult(
+                float(kp),
+                float(ki),
+                float(kd),
+                metrics["iae"],
+                metrics["overshoot_pct"],
+                metrics["settling_time"],
+                metrics["final_error"],
+            )
+        )
+    return results
+
+
+def rank(results: Sequence[CandidateResult]) -> list[CandidateResult]:
+    """Return ``results`` best first."""
+    return sorted(results, key=lambda result: result.rank_key)
+
+
+def default_workers() -> int:
+    """Return the default number of worker processes."""
+    return max(1, min(DEFAULT_MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def _start_pool(
+    workers: int, jobs: list[Callable[[], list[CandidateResult]]]
+) -> tuple[ProcessPoolExecutor, list[Future[list[CandidateResult]]]]:
+    """Create the worker pool and submit ``jobs``, runs in the executor."""
+    # Home Assistant runs threads, so the workers must not be forked
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    return pool, [pool.submit(job) for job in jobs]
+
+
+async def async_search_gains(
+    hass: HomeAssistant,
+    plant: PlantModel,
+    params: PIDParameters,
+    candidates: np.ndarray,
+    duration: float,
+    initial_value: float,
+    max_workers: int | None = None,
+    on_batch: Callable[[list[CandidateResult], int, int], None] | None = None,
+) -> list[CandidateResult]:
+    """Evaluate ``candidates`` across a process pool and return them ranked.
+
+    ``on_batch`` is called in the event loop with each finished batch and the
+    number of candidates done and in total. Cancelling the search drops the
+    batches that have not started; running batches finish in the background
+    before the workers exit.
+    """
+    workers = max_workers or default_workers()
+    batches = np.array_split(
+        candidates, min(len(candidates), workers * BATCHES_PER_WORKER)
+    )
+    # Starting spawned workers imports Home Assistant in each of them, so the
+    # pool is created and fed in the executor instead of the event loop
+    start = hass.async_add_executor_job(
+        _start_pool,
+        workers,
+        [
+            partial(evaluate_candidates, plant, params, batch, duration, initial_value)
+            for batch in batches
+        ],
+    )
+    try:
+        pool, pool_futures = await asyncio.shield(start)
+    except asyncio.CancelledError:
+        # Shut the pool down once it exists
+        start.add_done_callback(
+            lambda started: hass.async_add_executor_job(
+                partial(started.result()[0].shutdown, cancel_futures=True)
+            )
+        )
+        raise
+    futures = [asyncio.wrap_future(future) for future in pool_futures]
+    results: list[CandidateResult] = []
+    try:
+        for future in asyncio.as_completed(futures):
+            batch_results = await future
+            results.extend(batch_results)
+            if on_batch is not None:
+                on_batch(batch_results, len(results), len(candidates))
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        # Let running batches finish and the workers exit off the event loop
+        hass.async_add_executor_job(partial(pool.shutdown, cancel_futures=True))
+        raise
+    await hass.async_add_executor_job(pool.shutdown)
+    return rank(results)
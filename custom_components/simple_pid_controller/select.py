@@ -33,6 +33,7 @@ class PIDStartModeSelect(BasePIDEntity, SelectEntity, RestoreEntity):
         """Change the selected option."""
         if option in self._attr_options:
             self._attr_current_option = option
+            self._handle.params.set(self._key, option)
             self.async_write_ha_state()
 
     async def async_added_to_hass(self):
@@ -42,3 +43,4 @@ class PIDStartModeSelect(BasePIDEntity, SelectEntity, RestoreEntity):
             last_state := await self.async_get_last_state()
         ) and last_state.state in self._attr_options:
             self._attr_current_option = last_state.state
+        self._handle.params.set(self._key, self._attr_current_option)
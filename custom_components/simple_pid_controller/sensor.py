@@ -6,26 +6,57 @@ import logging
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 
 from datetime import timedelta
 from time import perf_counter
 from simple_pid import PID
 from typing import Any
 
-from . import PIDDeviceHandle
+from . import PIDDeviceHandle, PIDTelemetry
+from .const import (
+    DOMAIN,
+    PID_ENGINE_KERNEL,
+    PID_ENGINE_VECTORIZED,
+    SCHEDULING_MODE_DEADLINE,
+    UPDATE_MODE_INPUT_CHANGE,
+    DT_SOURCE_MEASUREMENT,
+    GAIN_SCHEDULE_INPUT,
+    GAIN_SCHEDULE_SETPOINT,
+)
 from .entity import BasePIDEntity
+from .cascade import cascade_setpoint, inner_blocks_integral
+from .control import apply_auto_mode, apply_parameters
 from .coordinator import PIDDataCoordinator
+from .engine import EnginePID, VectorPIDEngine
+from .kernel import PIDKernel
+from .publish import PublishPolicyMixin
+from .scheduler import async_get_scheduler
 
 # Coordinator is used to centralize the data updates
 PARALLEL_UPDATES = 0
 
 _LOGGER = logging.getLogger(__name__)
 
+# Vectorized engine shared by all controllers of this integration
+ENGINE_KEY: HassKey[VectorPIDEngine] = HassKey(f"{DOMAIN}_engine")
+
+# PIDTelemetry field read by each diagnostic sensor
+TELEMETRY_FIELDS = {
+    "pid_p_contrib": "p",
+    "pid_i_contrib": "i",
+    "pid_d_contrib": "d",
+    "error": "error",
+    "pid_i_delta": "i_delta",
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,100 +67,176 @@ async def async_setup_entry(
     handle: PIDDeviceHandle = entry.runtime_data.handle
 
     # Init PID with default values
-    handle.pid = PID(1.0, 0.1, 0.05, setpoint=50, sample_time=None, auto_mode=False)
+    if handle.pid_engine == PID_ENGINE_VECTORIZED:
+        if (engine := hass.data.get(ENGINE_KEY)) is None:
+            engine = hass.data[ENGINE_KEY] = VectorPIDEngine()
+        handle.pid = EnginePID(engine, 1.0, 0.1, 0.05, setpoint=50, auto_mode=False)
+        entry.async_on_unload(handle.pid.release)
+    elif handle.pid_engine == PID_ENGINE_KERNEL:
+        handle.pid = PIDKernel(1.0, 0.1, 0.05, setpoint=50, auto_mode=False)
+    else:
+        handle.pid = PID(1.0, 0.1, 0.05, setpoint=50, sample_time=None, auto_mode=False)
 
     handle.pid.output_limits = (-10.0, 10.0)
+    handle.applied_params_version = None
     handle.last_contributions = (0, 0, 0, 0)
     handle.last_known_output = None
 
     async def update_pid():
         """Update the PID output using current sensor and parameter values."""
-        input_value = handle.get_input_sensor_value()
-        if input_value is None:
+        start = perf_counter()
+        if coordinator.scheduled_refresh:
+            handle.timing.record_tick(
+                start,
+                coordinator.update_interval.total_seconds(),
+                coordinator.tick_deadline,
+            )
+        # Every step, input driven or not, postpones the staleness step
+        handle.async_restart_staleness_timer()
+
+        raw_input = handle.get_input_sensor_value()
+        if raw_input is None:
             raise ValueError("Input sensor not available")
-
-        handle.input_history.append(input_value)
-
-        # Read parameters from UI
-        kp = handle.get_number("kp")
-        ki = handle.get_number("ki")
-        kd = handle.get_number("kd")
-        setpoint = handle.get_number("setpoint")
-        starting_output = handle.get_number("starting_output")
-        start_mode = handle.get_select("start_mode")
-        sample_time = handle.get_number("sample_time")
-        out_min = handle.get_number("output_min")
-        out_max = handle.get_number("output_max")
-        auto_mode = handle.get_switch("auto_mode")
-        p_on_m = handle.get_switch("proportional_on_measurement")
-        windup_protection = handle.get_switch("windup_protection")
-
-        # adapt PID settings
-        handle.pid.tunings = (kp, ki, kd)
-        handle.pid.setpoint = setpoint
-
-        handle.pid_parameter_history.append(
-            {
-                "kp": kp,
-                "ki": ki,
-                "kd": kd,
-                "setpoint": setpoint,
-            }
-        )
-
-        if windup_protection:
-            handle.pid.output_limits = (out_min, out_max)
-        else:
-            handle.pid.output_limits = (None, None)
-
-        _LOGGER.debug("Start mode = %s (type: %s)", start_mode, type(start_mode))
-        if not handle.pid.auto_mode and auto_mode:
-            if start_mode == "Zero start":
-                handle.pid.set_auto_mode(True, 0)
-            elif start_mode == "Last known value":
-                handle.pid.set_auto_mode(True, handle.last_known_output)
-            elif start_mode == "Startup value":
-                handle.pid.set_auto_mode(True, starting_output)
+        measurement_dt = None
+        if handle.dt_source == DT_SOURCE_MEASUREMENT:
+            measured_at = handle.get_input_timestamp()
+            last_measured_at = handle.last_measurement_timestamp
+            if last_measured_at is not None and measured_at <= last_measured_at:
+                # Nothing new to compute on, keep the previous output and leave
+                # the input average and filters untouched
+                handle.skipped_steps += 1
+                return handle.last_known_output
+            if last_measured_at is not None:
+                measurement_dt = measured_at - last_measured_at
+            handle.last_measurement_timestamp = measured_at
+
+        input_min = input_max = None
+        if handle.input_average is not None and (
+            average := handle.input_average.take(start)
+        ):
+            raw_input, input_min, input_max = average
+        input_value = handle.input_filter.update(raw_input)
+
+        # Parameters are pushed into the handle by the number/switch/select entities
+        params = handle.params
+
+        # Only reconfigure the PID object when a parameter actually changed
+        if params.version != handle.applied_params_version:
+            apply_parameters(handle.pid, params)
+
+            interval = handle.tick_interval
+            update_interval = None if interval is None else timedelta(seconds=interval)
+            if coordinator.update_interval != update_interval:
+                _LOGGER.debug("Updating coordinator interval to %s", update_interval)
+                coordinator.update_interval = update_interval
+
+            handle.applied_params_version = params.version
+            handle.scheduled_gains = None
+
+        setpoint = params.setpoint
+        if handle.cascade_source is not None:
+            # Cascaded: the outer controller's output, read from memory
+            if (outer_output := cascade_setpoint(hass, handle)) is not None:
+                setpoint = outer_output
+            handle.pid.setpoint = setpoint
+
+        if handle.gain_schedule_active:
+            # Gains from the schedule instead of the kp/ki/kd number entities
+            if handle.gain_schedule_source == GAIN_SCHEDULE_SETPOINT:
+                schedule_value = setpoint
+            elif handle.gain_schedule_source == GAIN_SCHEDULE_INPUT:
+                schedule_value = input_value
             else:
-                handle.pid.set_auto_mode(True)
-        else:
-            handle.pid.auto_mode = auto_mode
-
-        handle.pid.proportional_on_measurement = p_on_m
+                schedule_value = handle.get_gain_schedule_value()
+            if schedule_value is not None:
+                gains = handle.gain_schedule.lookup(schedule_value)
+                if gains != handle.scheduled_gains:
+                    handle.pid.tunings = gains
+                    handle.scheduled_gains = gains
 
         now = perf_counter()
-        if handle.last_update_timestamp is None:
+        if (tuner := handle.autotune) is not None:
+            # Relay experiment running, the PID stays in manual mode
+            handle.pid._last_output = tuner.update(input_value, now)
+        else:
+            _LOGGER.debug("Start mode = %s", params.start_mode)
+            apply_auto_mode(handle.pid, params, handle.last_known_output)
+
+        if measurement_dt is not None:
+            handle.last_measured_sample_time = measurement_dt
+        elif handle.last_update_timestamp is None:
             handle.last_measured_sample_time = None
         else:
             handle.last_measured_sample_time = now - handle.last_update_timestamp
         handle.last_update_timestamp = now
 
-        handle.sample_time_history.append(handle.last_measured_sample_time)
-
-        output = handle.pid(input_value)
+        # Hold the I term while a saturated inner loop cannot follow
+        held_ki = None
+        if setpoint is not None and inner_blocks_integral(
+            hass, handle, setpoint - input_value
+        ):
+            held_ki, handle.pid.Ki = handle.pid.Ki, 0.0
+        try:
+            if isinstance(handle.pid, PIDKernel):
+                output, p, i, d = handle.pid.step(input_value, measurement_dt)
+            else:
+                if isinstance(handle.pid, EnginePID):
+                    output = await handle.pid.async_call(input_value, measurement_dt)
+                else:
+                    output = handle.pid(input_value, measurement_dt)
+                p, i, d = handle.pid.components
+        finally:
+            if held_ki is not None:
+                handle.pid.Ki = held_ki
 
         # save last know output
         handle.last_known_output = output
-        handle.output_history.append(output)
-
-        # save last I contribution
-        last_i = handle.last_contributions[1]
 
-        # save all latest contributions
-        handle.last_contributions = (
-            handle.pid.components[0],
-            handle.pid.components[1],
-            handle.pid.components[2],
-            handle.pid.components[1] - last_i,
+        # save all latest contributions, including the change of the I term
+        handle.last_contributions = (p, i, d, i - handle.last_contributions[1])
+
+        telemetry = handle.telemetry = PIDTelemetry(
+            input=input_value,
+            setpoint=setpoint,
+            error=None if setpoint is None else input_value - setpoint,
+            p=handle.last_contributions[0],
+            i=handle.last_contributions[1],
+            d=handle.last_contributions[2],
+            i_delta=handle.last_contributions[3],
+            dt=handle.last_measured_sample_time,
+            output=output,
+            raw_input=raw_input,
+            input_min=input_min,
+            input_max=input_max,
         )
 
-        handle.pid_contribution_history.append(
-            {
-                "p": handle.last_contributions[0],
-                "i": handle.last_contributions[1],
-                "d": handle.last_contributions[2],
-                "i_delta": handle.last_contributions[3],
-            }
+        if handle.output is not None:
+            handle.output.async_write(output)
+
+        # Record the gains the step used, scheduled ones included
+        kp, ki, kd = handle.scheduled_gains or (params.kp, params.ki, params.kd)
+        handle.history.append(
+            telemetry.input,
+            telemetry.output,
+            telemetry.p,
+            telemetry.i,
+            telemetry.d,
+            telemetry.i_delta,
+            kp,
+            ki,
+            kd,
+            telemetry.setpoint,
+            telemetry.dt,
+            raw_input,
+        )
+        handle.aggregates.add(
+            dt_util.utcnow().timestamp(),
+            telemetry.input,
+            telemetry.output,
+            telemetry.error,
+            telemetry.p,
+            telemetry.i,
+            telemetry.d,
         )
 
         _LOGGER.debug(
@@ -146,17 +253,26 @@ async def async_setup_entry(
             handle.last_contributions[3],
         )
 
-        if coordinator.update_interval.total_seconds() != sample_time:
-            _LOGGER.debug("Updating coordinator interval to %.2f seconds", sample_time)
-            coordinator.update_interval = timedelta(seconds=sample_time)
-
+        handle.timing.compute.add(perf_counter() - start)
         return output
 
     # Setup Coordinator
     if entry.runtime_data.coordinator is None:
         entry.runtime_data.coordinator = PIDDataCoordinator(
-            hass, handle.name, update_pid, interval=10
+            hass,
+            handle.name,
+            update_pid,
+            interval=10,
+            scheduler=async_get_scheduler(hass),
+            missed_tick_policy=(
+                handle.missed_tick_policy
+                if handle.scheduling_mode == SCHEDULING_MODE_DEADLINE
+                else None
+            ),
         )
+        if handle.update_mode == UPDATE_MODE_INPUT_CHANGE:
+            # Stepped by input changes and the staleness timer, no periodic tick
+            entry.runtime_data.coordinator.update_interval = None
     coordinator = entry.runtime_data.coordinator
 
     # Wait for HA to finish starting
@@ -185,47 +301,29 @@ async def async_setup_entry(
             PIDSampleTimeSensor(
                 hass, entry, "actual_sample_time", "Actual Sample Time", coordinator
             ),
+            PIDTimingSensor(
+                hass, entry, "compute_time", "Compute Time", coordinator, "compute"
+            ),
+            PIDTimingSensor(
+                hass,
+                entry,
+                "schedule_lateness",
+                "Schedule Lateness",
+                coordinator,
+                "lateness",
+            ),
+            PIDTimingSensor(
+                hass, entry, "tick_jitter", "Tick Jitter", coordinator, "jitter"
+            ),
         ]
     )
 
-    # Put listeners on inputs
-    def make_listener(entity_id: str):
-        def _listener(event):
-            if event.data.get("entity_id") == entity_id:
-                _LOGGER.debug("Update detected on %s", entity_id)
-                coordinator.async_request_refresh()
-
-        return _listener
-
-    for key in [
-        "kp",
-        "ki",
-        "kd",
-        "setpoint",
-        "output_min",
-        "output_max",
-        "sample_time",
-    ]:
-        unsub = hass.bus.async_listen(
-            "state_changed", make_listener(f"number.{entry.entry_id}_{key}")
-        )
-        entry.async_on_unload(unsub)
-
-    for key in ["auto_mode", "proportional_on_measurement", "windup_protection"]:
-        unsub = hass.bus.async_listen(
-            "state_changed", make_listener(f"switch.{entry.entry_id}_{key}")
-        )
-        entry.async_on_unload(unsub)
-
-    for key in ["start_mode"]:
-        unsub = hass.bus.async_listen(
-            "state_changed", make_listener(f"select.{entry.entry_id}_{key}")
-        )
-        entry.async_on_unload(unsub)
-
 
 class PIDOutputSensor(
-    CoordinatorEntity[PIDDataCoordinator], RestoreEntity, SensorEntity
+    PublishPolicyMixin,
+    CoordinatorEntity[PIDDataCoordinator],
+    RestoreEntity,
+    SensorEntity,
 ):
     """Sensor representing the PID output."""
 
@@ -258,7 +356,9 @@ class PIDOutputSensor(
         return round(self.coordinator.data, 2)
 
 
-class PIDContributionSensor(CoordinatorEntity[PIDDataCoordinator], SensorEntity):
+class PIDContributionSensor(
+    PublishPolicyMixin, CoordinatorEntity[PIDDataCoordinator], SensorEntity
+):
     """Sensor representing P, I or D contribution."""
 
     def __init__(
@@ -280,22 +380,11 @@ class PIDContributionSensor(CoordinatorEntity[PIDDataCoordinator], SensorEntity)
 
     @property
     def native_value(self):
-        contributions = self._handle.last_contributions
-        input_value = self._handle.get_input_sensor_value()
-        setpoint = self._handle.get_number("setpoint")
-
-        if input_value is None or setpoint is None:
-            error = 0
-        else:
-            error = input_value - setpoint
-
-        value = {
-            "pid_p_contrib": contributions[0],
-            "pid_i_contrib": contributions[1],
-            "pid_d_contrib": contributions[2],
-            "error": error,
-            "pid_i_delta": contributions[3],
-        }.get(self._key)
+        telemetry = self._handle.telemetry
+        field = TELEMETRY_FIELDS.get(self._key)
+        if telemetry is None or field is None:
+            return None
+        value = getattr(telemetry, field)
         return round(value, 3) if value is not None else None
 
 
@@ -321,7 +410,47 @@ class PIDSampleTimeSensor(CoordinatorEntity[PIDDataCoordinator], SensorEntity):
 
     @property
     def native_value(self) -> float | None:
-        sample_time = self._handle.last_measured_sample_time
-        if sample_time is None:
+        telemetry = self._handle.telemetry
+        if telemetry is None or telemetry.dt is None:
+            return None
+        return round(telemetry.dt, 3)
+
+
+class PIDTimingSensor(CoordinatorEntity[PIDDataCoordinator], SensorEntity):
+    """Sensor exposing the p95 of one timing histogram in milliseconds."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        key: str,
+        name: str,
+        coordinator: PIDDataCoordinator,
+        histogram: str,
+    ) -> None:
+        super().__init__(coordinator)
+
+        BasePIDEntity.__init__(self, hass, entry, key, name)
+
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._histogram = histogram
+
+    @property
+    def native_value(self) -> float | None:
+        p95 = getattr(self._handle.timing, self._histogram).percentile(95)
+        if p95 is None:
             return None
-        return round(sample_time, 3)
+        return round(p95 * 1000, 3)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        histogram = getattr(self._handle.timing, self._histogram)
+        p50 = histogram.percentile(50)
+        return {
+            "p50": None if p50 is None else round(p50 * 1000, 3),
+            "max": round(histogram.max * 1000, 3) if histogram.count else None,
+            "samples": histogram.count,
+        }
@@ -0,0 +1,245 @@
+"""Closed-loop simulation of a controller against a plant model.
+
+The controller runs the same logic as the live loop (parameters, start
+modes, windup switch, proportional on measurement and output limits) on a
+PIDKernel driven by a virtual clock, so hours of process time simulate in
+milliseconds.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from math import exp
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .control import apply_auto_mode, apply_parameters
+from .kernel import PIDKernel
+
+if TYPE_CHECKING:
+    from . import PIDParameters
+
+# Band around the final setpoint, as a fraction of the step, for settling time
+SETTLING_BAND = 0.02
+
+
+class PlantModel(ABC):
+    """Process driven by the controller output.
+
+    The plant starts at rest at ``initial``, which is also the value it
+    returns to without output. ``dead_time`` delays the output before it
+    reaches the process.
+    """
+
+    def __init__(self, gain: float, dead_time: float = 0.0) -> None:
+        """Initialize the plant."""
+        self.gain = gain
+        self.dead_time = dead_time
+        self.value = 0.0
+        self._ambient = 0.0
+        self._delay: deque[float] | None = None
+
+    def reset(self, initial: float, dt: float) -> None:
+        """Bring the plant to rest at ``initial`` for steps of ``dt`` seconds."""
+        self.value = self._ambient = initial
+        samples = round(self.dead_time / dt)
+        self._delay = deque([0.0] * samples, samples) if samples else None
+
+    def step(self, output: float, dt: float) -> float:
+        """Apply ``output`` for ``dt`` seconds and return the new process value."""
+        if (delay := self._delay) is not None:
+            delayed = delay[0]
+            delay.append(output)
+            output = delayed
+        self.value = self._advance(output, dt)
+        return self.value
+
+    @abstractmethod
+    def _advance(self, output: float, dt: float) -> float:
+        """Return the process value after applying ``output`` for ``dt`` seconds."""
+
+
+class FirstOrderPlant(PlantModel):
+    """First order plus dead time: ``tau * dy/dt = gain * u - (y - initial)``."""
+
+    def __init__(
+        self, gain: float, time_constant: float, dead_time: float = 0.0
+    ) -> None:
+        """Initialize the plant."""
+        super().__init__(gain, dead_time)
+        self.time_constant = time_constant
+
+    def _advance(self, output: float, dt: float) -> float:
+        # Exact for a constant output over the step
+        decay = exp(-dt / self.time_constant)
+        target = self._ambient + self.gain * output
+        return target + (self.value - target) * decay
+
+
+class IntegratingPlant(PlantModel):
+    """Integrating process with dead time: ``dy/dt = gain * u``."""
+
+    def _advance(self, output: float, dt: float) -> float:
+        return self.value + self.gain * output * dt
+
+
+class SecondOrderPlant(PlantModel):
+    """Second order plus dead time.
+
+    ``tau² * y'' + 2 * damping * tau * y' + (y - initial) = gain * u``
+    """
+
+    def __init__(
+        self,
+        gain: float,
+        time_constant: float,
+        damping: float = 1.0,
+        dead_time: float = 0.0,
+    ) -> None:
+        """Initialize the plant."""
+        super().__init__(gain, dead_time)
+        self.time_constant = time_constant
+        self.damping = damping
+        self._rate = 0.0
+
+    def reset(self, initial: float, dt: float) -> None:
+        """Bring the plant to rest at ``initial`` for steps of ``dt`` seconds."""
+        super().reset(initial, dt)
+        self._rate = 0.0
+
+    def _advance(self, output: float, dt: float) -> float:
+        # Semi-implicit Euler with sub-steps well below the time constant
+        tau = self.time_constant
+        substeps = max(1, int(dt * 20 / tau) + 1)
+        h = dt / substeps
+        value, rate = self.value, self._rate
+        force = self._ambient + self.gain * output
+        for _ in range(substeps):
+            rate += h * (force - value - 2 * self.damping * tau * rate) / (tau * tau)
+            value += h * rate
+        self._rate = rate
+        return value
+
+
+PLANT_FIRST_ORDER = "first_order"
+PLANT_INTEGRATING = "integrating"
+PLANT_SECOND_ORDER = "second_order"
+PLANT_MODELS: dict[str, type[PlantModel]] = {
+    PLANT_FIRST_ORDER: FirstOrderPlant,
+    PLANT_INTEGRATING: IntegratingPlant,
+    PLANT_SECOND_ORDER: SecondOrderPlant,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationResult:
+    """Trajectories of a simulation, one entry per controller step."""
+
+    time: np.ndarray
+    setpoint: np.ndarray
+    input: np.ndarray
+    output: np.ndarray
+    p: np.ndarray
+    i: np.ndarray
+    d: np.ndarray
+
+    def metrics(self) -> dict[str, Any]:
+        """Return performance metrics for the response to the final setpoint.
+
+        Overshoot, rise time (10 % to 90 %) and settling time are relative to
+        the step from the initial process value to the final setpoint and are
+        None when there is no step or the response never gets there.
+        """
+        time = self.time
+        error = self.setpoint - self.input
+        dt = float(time[1] - time[0]) if len(time) > 1 else 0.0
+        start = float(self.input[0])
+        target = float(self.setpoint[-1])
+        step = target - start
+
+        overshoot = rise_time = settling_time = None
+        if step:
+            # Progress towards the target, 1.0 means on setpoint
+            progress = (self.input - start) / step
+            overshoot = max(0.0, float(progress.max()) - 1.0) * 100
+            low = np.flatnonzero(progress >= 0.1)
+            high = np.flatnonzero(progress >= 0.9)
+            if len(low) and len(high):
+                rise_time = float(time[high[0]] - time[low[0]])
+            outside = np.flatnonzero(np.abs(1.0 - progress) > SETTLING_BAND)
+            if not len(outside):
+                settling_time = 0.0
+            elif outside[-1] + 1 < len(time):
+                settling_time = float(time[outside[-1] + 1] - time[0])
+
+        return {
+            "iae": float(np.abs(error).sum() * dt),
+            "ise": float(np.square(error).sum() * dt),
+            "overshoot_pct": overshoot,
+            "rise_time": rise_time,
+            "settling_time": settling_time,
+            "final_error": float(error[-1]),
+            "output_min": float(np.nanmin(self.output)),
+            "output_max": float(np.nanmax(self.output)),
+        }
+
+
+def simulate(
+    plant: PlantModel,
+    params: PIDParameters,
+    duration: float,
+    initial_value: float,
+    sample_time: float | None = None,
+    setpoint_changes: Sequence[tuple[float, float]] = (),
+    last_known_output: float | None = None,
+) -> SimulationResult:
+    """Run the controller against ``plant`` for ``duration`` seconds.
+
+    The controller steps every ``sample_time`` seconds, defaulting to the
+    sample time in ``params``. ``setpoint_changes`` holds (time, setpoint)
+    pairs applied during the run. ``last_known_output`` is used by the
+    "Last known value" start mode.
+    """
+    dt = sample_time if sample_time is not None else params.sample_time
+    if not dt or dt <= 0:
+        raise ValueError("sample_time must be positive")
+    steps = int(round(duration / dt))
+    if steps < 1:
+        raise ValueError("duration must cover at least one sample")
+
+    clock = 0.0
+    pid = PIDKernel(auto_mode=False, time_fn=lambda: clock)
+    apply_parameters(pid, params)
+    apply_auto_mode(pid, params, last_known_output)
+    plant.reset(initial_value, dt)
+
+    changes = sorted(setpoint_changes)
+    change_idx = 0
+    time = np.arange(steps) * dt
+    setpoint = np.empty(steps)
+    process = np.empty(steps)
+    output = np.empty(steps)
+    p = np.empty(steps)
+    i = np.empty(steps)
+    d = np.empty(steps)
+
+    value = initial_value
+    for k in range(steps):
+        clock = k * dt
+        while change_idx < len(changes) and changes[change_idx][0] <= clock:
+            pid.setpoint = changes[change_idx][1]
+            change_idx += 1
+        out, p[k], i[k], d[k] = pid.step(value, dt)
+        if out is None:
+            # Manual mode without a previous output
+            out = 0.0 if last_known_output is None else last_known_output
+        setpoint[k] = pid.setpoint
+        process[k] = value
+        output[k] = out
+        value = plant.step(out, dt)
+
+    return SimulationResult(time, setpoint, process, output, p, i, d)
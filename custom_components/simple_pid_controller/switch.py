@@ -45,6 +45,7 @@ class PIDOptionSwitch(SwitchEntity, RestoreEntity):
         await super().async_added_to_hass()
         if (last_state := await self.async_get_last_state()) is not None:
             self._state = last_state.state == "on"
+        self._handle.params.set(self._key, self._state)
 
     @property
     def is_on(self) -> bool:
@@ -52,8 +53,10 @@ class PIDOptionSwitch(SwitchEntity, RestoreEntity):
 
     async def async_turn_on(self, **kwargs) -> None:
         self._state = True
+        self._handle.params.set(self._key, True)
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs) -> None:
         self._state = False
+        self._handle.params.set(self._key, False)
         self.async_write_ha_state()
@@ -0,0 +1,136 @@
+"""Timing histograms for Simple PID Controller."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Any
+
+# Upper bucket edges in seconds, the last bucket catches everything above
+TIMING_BUCKETS = (
+    1e-5,
+    2e-5,
+    5e-5,
+    1e-4,
+    2e-4,
+    5e-4,
+    1e-3,
+    2e-3,
+    5e-3,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class TimingHistogram:
+    """Fixed-bucket histogram of durations in seconds.
+
+    Recording a value increments one counter, so memory does not grow with
+    the number of samples. Percentiles are reported as the upper edge of the
+    bucket holding them, capped at the exact maximum.
+    """
+
+    __slots__ = ("counts", "count", "max", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = array("Q", [0]) * (len(TIMING_BUCKETS) + 1)
+        self.count = 0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        """Record one duration."""
+        self.counts[bisect_left(TIMING_BUCKETS, value)] += 1
+        self.count += 1
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> float | None:
+        """Return an upper bound of the ``pct`` percentile, None when empty."""
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                if idx == len(TIMING_BUCKETS):
+                    return self.max
+                return min(TIMING_BUCKETS[idx], self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return summary statistics and the bucket counts."""
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max if self.count else None,
+            "last": self.last,
+            "buckets": {
+                **{
+                    f"le_{edge:g}": self.counts[idx]
+                    for idx, edge in enumerate(TIMING_BUCKETS)
+                },
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class ControllerTiming:
+    """Compute time, schedule lateness and jitter of one controller.
+
+    ``compute`` covers every PID step. ``lateness`` and ``jitter`` only cover
+    scheduled ticks: lateness is the delay past the intended deadline and
+    jitter the change of the measured interval between consecutive ticks.
+    """
+
+    __slots__ = ("compute", "lateness", "jitter", "_last_tick", "_last_period")
+
+    def __init__(self) -> None:
+        """Initialize empty histograms."""
+        self.compute = TimingHistogram()
+        self.lateness = TimingHistogram()
+        self.jitter = TimingHistogram()
+        self._last_tick: float | None = None
+        self._last_period: float | None = None
+
+    def record_tick(
+        self, now: float, interval: float, deadline: float | None = None
+    ) -> None:
+        """Record a scheduled tick starting at ``now`` (perf_counter seconds).
+
+        Without an explicit ``deadline`` the intended deadline is the previous
+        scheduled tick plus ``interval``, which is how interval timers are
+        armed.
+        """
+        if deadline is not None:
+            self.lateness.add(max(0.0, now - deadline))
+        if self._last_tick is not None:
+            period = now - self._last_tick
+            if deadline is None:
+                self.lateness.add(max(0.0, period - interval))
+            if self._last_period is not None:
+                self.jitter.add(abs(period - self._last_period))
+            self._last_period = period
+        self._last_tick = now
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all histograms for diagnostics."""
+        return {
+            "compute": self.compute.as_dict(),
+            "lateness": self.lateness.as_dict(),
+            "jitter": self.jitter.as_dict(),
+        }
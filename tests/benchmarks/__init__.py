@@ -0,0 +1 @@
+"""Benchmarks for the Simple PID Controller hot path."""
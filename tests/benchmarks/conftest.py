@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.simple_pid_controller.const import (
+    CONF_SENSOR_ENTITY_ID,
+    DOMAIN,
+)
+from homeassistant.const import CONF_NAME
+
+# Fleet sizes of the benchmark. Sizes above LARGE_FLEET are skipped unless
+# PID_BENCHMARK_LARGE=1 is set, since setting up 1,000 controllers takes several
+# minutes. PID_BENCHMARK_SIZES=1,10,100 overrides the list; listed sizes run.
+DEFAULT_SIZES = "1,10,100,1000"
+LARGE_FLEET = 10
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize benchmarks over the configured fleet sizes."""
+    if "fleet_size" in metafunc.fixturenames:
+        explicit = "PID_BENCHMARK_SIZES" in os.environ
+        run_large = explicit or os.environ.get("PID_BENCHMARK_LARGE") == "1"
+        sizes = os.environ.get("PID_BENCHMARK_SIZES", DEFAULT_SIZES)
+        metafunc.parametrize(
+            "fleet_size",
+            [
+                pytest.param(
+                    int(size),
+                    marks=pytest.mark.skipif(
+                        int(size) > LARGE_FLEET and not run_large,
+                        reason="large fleet, set PID_BENCHMARK_LARGE=1 to run",
+                    ),
+                )
+                for size in sizes.split(",")
+                if size.strip()
+            ],
+        )
+
+
+@pytest.fixture
+async def fleet(hass, fleet_size):
+    """Set up ``fleet_size`` controllers, each with its own synthetic input sensor."""
+    entries = []
+    for n in range(fleet_size):
+        input_sensor = f"sensor.bench_input_{n}"
+        hass.states.async_set(input_sensor, "25.0")
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            entry_id=f"bench_{n}",
+            title=f"Bench PID {n}",
+            data={CONF_SENSOR_ENTITY_ID: input_sensor, CONF_NAME: f"bench_{n}"},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await hass.async_block_till_done()
+
+    yield entries
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
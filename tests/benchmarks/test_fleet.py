@@ -0,0 +1,130 @@
+"""Tick latency, allocations and lookups of update_pid across fleet sizes.
+
+Run with ``pytest tests/benchmarks -s`` to see the report, and set
+``PID_BENCHMARK_LARGE=1`` to include the 100 and 1,000 controller fleets.
+
+Event loop time is the time spent running loop callbacks during the ticks.
+Allocations come from tracemalloc: the bytes newly allocated and still held
+after TICKS ticks, from snapshot diffs, and the peak of each tick above the
+memory held before it.
+"""
+
+import asyncio
+from asyncio.events import Handle
+from statistics import mean, quantiles
+from time import perf_counter
+import tracemalloc
+
+from homeassistant.core import StateMachine
+from homeassistant.helpers import entity_registry as er
+
+TICKS = 50
+
+
+def counting(func, calls, name):
+    """Wrap ``func`` as a plain function counting calls in ``calls[name]``."""
+
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def timing_handles(busy):
+    """Return a Handle._run that adds the time of every callback to ``busy[0]``."""
+    run = Handle._run
+
+    def timed_run(self):
+        start = perf_counter()
+        try:
+            run(self)
+        finally:
+            busy[0] += perf_counter() - start
+
+    return timed_run
+
+
+def percentile(values, pct):
+    if len(values) == 1:
+        return values[0]
+    return quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+async def run_tick(hass, coordinators, tick):
+    """Change every input and refresh all controllers like one scheduler tick."""
+    value = str(20.0 + tick % 10)
+    for n in range(len(coordinators)):
+        hass.states.async_set(f"sensor.bench_input_{n}", value)
+    start = perf_counter()
+    await asyncio.gather(*(c.async_scheduled_refresh() for c in coordinators))
+    return perf_counter() - start
+
+
+async def test_update_pid_fleet(hass, fleet, fleet_size, monkeypatch):
+    """Report latency, loop load, allocations and lookups per tick."""
+    coordinators = [entry.runtime_data.coordinator for entry in fleet]
+    interval = coordinators[0].update_interval.total_seconds()
+
+    # Warm up caches (entity_id lookups, PID configuration)
+    for tick in range(3):
+        await run_tick(hass, coordinators, tick)
+
+    latencies = [await run_tick(hass, coordinators, tick) for tick in range(TICKS)]
+
+    busy = [0.0]
+    monkeypatch.setattr(Handle, "_run", timing_handles(busy))
+    for tick in range(TICKS):
+        await run_tick(hass, coordinators, tick)
+    monkeypatch.undo()
+
+    tracemalloc.start()
+    peaks = []
+    before = tracemalloc.take_snapshot()
+    for tick in range(TICKS):
+        tracemalloc.reset_peak()
+        held = tracemalloc.get_traced_memory()[0]
+        await run_tick(hass, coordinators, tick)
+        peaks.append(tracemalloc.get_traced_memory()[1] - held)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(
+        max(stat.size_diff, 0) for stat in after.compare_to(before, "lineno")
+    )
+
+    calls = {"states": 0, "registry": 0}
+    monkeypatch.setattr(
+        StateMachine, "get", counting(StateMachine.get, calls, "states")
+    )
+    monkeypatch.setattr(er, "async_get", counting(er.async_get, calls, "registry"))
+    monkeypatch.setattr(
+        er.EntityRegistry,
+        "async_get_entity_id",
+        counting(er.EntityRegistry.async_get_entity_id, calls, "registry"),
+    )
+    for tick in range(TICKS):
+        await run_tick(hass, coordinators, tick)
+    monkeypatch.undo()
+
+    report = {
+        "controllers": fleet_size,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "loop_ms_per_s": busy[0] / TICKS / interval * 1e3,
+        "retained_bytes_per_tick": retained / TICKS,
+        "peak_bytes_per_tick": mean(peaks),
+        "states_get_per_tick": calls["states"] / TICKS,
+        "registry_calls_per_tick": calls["registry"] / TICKS,
+    }
+    print(
+        "\n"
+        + " ".join(
+            f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in report.items()
+        )
+    )
+
+    assert all(c.last_update_success for c in coordinators)
+    # Parameters and entity_ids are cached, so a tick mostly reads the inputs
+    assert report["registry_calls_per_tick"] == 0
+    assert report["states_get_per_tick"] <= 2 * fleet_size
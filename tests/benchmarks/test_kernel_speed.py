@@ -0,0 +1,54 @@
+"""Micro-benchmark of the PID kernel against simple_pid.PID.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings. Wall-clock
+timings depend on the machine and its load, so they are only reported.
+"""
+
+from timeit import repeat
+
+import pytest
+from simple_pid import PID
+
+from custom_components.simple_pid_controller.kernel import PIDKernel
+
+STEPS = 20000
+
+
+def best_time(pid, step) -> float:
+    inputs = [20.0 + (n % 50) * 0.1 for n in range(STEPS)]
+
+    def run():
+        for x in inputs:
+            step(pid, x)
+
+    return min(repeat(run, number=1, repeat=5))
+
+
+def simple_pid_step(pid, x):
+    pid(x)
+    return pid.components
+
+
+def kernel_step(pid, x):
+    return pid.step(x)
+
+
+def test_kernel_speed_against_simple_pid():
+    """Time one step plus reading the terms, as done by update_pid."""
+    kwargs = {
+        "setpoint": 22.0,
+        "output_limits": (0.0, 100.0),
+        "proportional_on_measurement": True,
+    }
+    reference_pid = PID(2.0, 0.1, 0.5, sample_time=None, **kwargs)
+    kernel_pid = PIDKernel(2.0, 0.1, 0.5, **kwargs)
+    reference = best_time(reference_pid, simple_pid_step)
+    kernel = best_time(kernel_pid, kernel_step)
+
+    print(
+        f"\nsimple_pid: {reference / STEPS * 1e9:.0f} ns/step, "
+        f"kernel: {kernel / STEPS * 1e9:.0f} ns/step, "
+        f"speedup {reference / kernel:.2f}x"
+    )
+    # Both ran the same inputs, only the time between runs differs
+    assert kernel_pid.components[0] == pytest.approx(reference_pid.components[0])
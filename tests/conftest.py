@@ -32,7 +32,7 @@ def dummy_pid_class():
             if last_output is not None:
                 self._output = last_output
 
-        def __call__(self, input_value):
+        def __call__(self, input_value, dt=None):
             return self._output
 
     return DummyPID
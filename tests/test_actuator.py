@@ -0,0 +1,100 @@
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.simple_pid_controller.actuator import (
+    ActuatorOutput,
+    OutputDispatcher,
+)
+from custom_components.simple_pid_controller.const import (
+    CONF_OUTPUT_DEADBAND,
+    CONF_OUTPUT_ENTITY_ID,
+)
+from custom_components.simple_pid_controller.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_dispatcher_coalesces_same_service_and_value(hass):
+    """Writes staged together become one call per service and value."""
+    calls = async_mock_service(hass, "number", "set_value")
+    dispatcher = OutputDispatcher(hass)
+
+    dispatcher.async_stage("number.a", 10.0)
+    dispatcher.async_stage("number.b", 10.0)
+    dispatcher.async_stage("number.c", 20.0)
+    await hass.async_block_till_done()
+
+    assert dispatcher.as_dict() == {"writes": 3, "service_calls": 2}
+    assert [call.data["entity_id"] for call in calls] == [
+        ["number.a", "number.b"],
+        ["number.c"],
+    ]
+    assert calls[0].data["value"] == 10.0
+
+
+async def test_dispatcher_converts_percent_targets(hass):
+    lights = async_mock_service(hass, "light", "turn_on")
+    covers = async_mock_service(hass, "cover", "set_cover_position")
+    dispatcher = OutputDispatcher(hass)
+
+    dispatcher.async_stage("light.lamp", 142.3)
+    dispatcher.async_stage("cover.blind", 42.6)
+    await hass.async_block_till_done()
+
+    assert lights[0].data["brightness_pct"] == 100
+    assert covers[0].data["position"] == 43
+
+
+async def test_dispatcher_logs_failed_calls(hass, caplog):
+    """A missing service does not raise into the controller."""
+    dispatcher = OutputDispatcher(hass)
+    dispatcher.async_stage("number.missing", 1.0)
+    await hass.async_block_till_done()
+
+    assert "Writing PID output to ['number.missing'] failed" in caplog.text
+
+
+async def test_actuator_output_deadband_and_interval(hass, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(
+        "custom_components.simple_pid_controller.actuator.monotonic", lambda: now[0]
+    )
+    calls = async_mock_service(hass, "number", "set_value")
+    output = ActuatorOutput(
+        OutputDispatcher(hass), "number.heater", min_interval=5, deadband=1
+    )
+
+    assert output.async_write(10.0)
+    assert not output.async_write(None)
+    now[0] = 1.0
+    assert not output.async_write(20.0)  # too soon
+    now[0] = 6.0
+    assert not output.async_write(10.5)  # inside deadband
+    assert output.async_write(12.0)
+    await hass.async_block_till_done()
+
+    assert [call.data["value"] for call in calls] == [10.0, 12.0]
+
+
+async def test_controller_writes_output_entity(hass, config_entry):
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_OUTPUT_ENTITY_ID: "number.heater", CONF_OUTPUT_DEADBAND: 0.0},
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Mock after setup, which loads the real number platform
+    calls = async_mock_service(hass, "number", "set_value")
+    coordinator = config_entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert calls
+    assert calls[-1].data == {"entity_id": ["number.heater"], "value": coordinator.data}
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["data"]["output"]["entity_id"] == "number.heater"
+    assert result["data"]["output"]["dispatcher"]["service_calls"] == len(calls)
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.simple_pid_controller.autotune import (
+    AUTOTUNE_CANCELLED,
+    AUTOTUNE_SUCCEEDED,
+    AUTOTUNE_TIMEOUT,
+    EVENT_AUTOTUNE_FINISHED,
+    RelayAutotuner,
+)
+from custom_components.simple_pid_controller.const import DOMAIN
+import custom_components.simple_pid_controller.sensor as sensor_mod
+from custom_components.simple_pid_controller.simulation import (
+    FirstOrderPlant,
+    IntegratingPlant,
+)
+
+
+def _run(tuner, plant, initial, dt, steps):
+    plant.reset(initial, dt)
+    value = initial
+    for k in range(steps):
+        if tuner.finished:
+            return k
+        value = plant.step(tuner.update(value, k * dt), dt)
+    return steps
+
+
+def test_relay_on_integrating_plant_matches_theory():
+    """An integrating plant with dead time L oscillates with period 4L."""
+    tuner = RelayAutotuner(setpoint=0.0, bias=0.0, amplitude=1.0, cycles=3)
+    _run(tuner, IntegratingPlant(gain=0.5, dead_time=5.0), 0.0, 0.01, 100_000)
+
+    assert tuner.finished
+    assert len(tuner.periods) == 3
+    assert tuner.ultimate_period == pytest.approx(20.0, rel=0.01)
+    # Triangle wave of amplitude gain * relay * dead time
+    assert tuner.ultimate_gain == pytest.approx(4 / (3.14159265 * 2.5), rel=0.01)
+
+
+def test_relay_memory_is_bounded():
+    tuner = RelayAutotuner(setpoint=50.0, bias=50.0, amplitude=50.0, cycles=2)
+    plant = FirstOrderPlant(gain=1.0, time_constant=10.0, dead_time=2.0)
+    plant.reset(0.0, 1.0)
+    value = 0.0
+    for k in range(2000):
+        value = plant.step(tuner.update(value, float(k)), 1.0)
+    assert tuner.cycles_done > 10
+    assert len(tuner.periods) == len(tuner.amplitudes) == 2
+
+
+def test_relay_output_limits_and_reverse():
+    tuner = RelayAutotuner(
+        setpoint=20.0,
+        bias=80.0,
+        amplitude=40.0,
+        reverse=True,
+        output_limits=(0.0, 100.0),
+    )
+    assert (tuner.low, tuner.high) == (40.0, 100.0)
+    # Reverse acting: a value above the setpoint drives the output high
+    assert tuner.update(25.0, 0.0) == 100.0
+    assert tuner.update(15.0, 1.0) == 40.0
+
+    tuner.periods.append(10.0)
+    tuner.amplitudes.append(1.0)
+    kp, ki, kd = tuner.tunings("ziegler_nichols")
+    assert kp < 0 and ki < 0 and kd < 0
+
+    with pytest.raises(ValueError):
+        RelayAutotuner(20.0, 120.0, 10.0, output_limits=(0.0, 100.0))
+
+
+def test_tuning_rules():
+    tuner = RelayAutotuner(setpoint=0.0, bias=0.0, amplitude=1.0)
+    tuner.periods.append(10.0)
+    tuner.amplitudes.append(4 / 3.141592653589793)  # Ku == 1
+    assert tuner.tunings("ziegler_nichols") == pytest.approx((0.6, 0.12, 0.75))
+    assert tuner.tunings("ziegler_nichols_pi") == pytest.approx((0.45, 0.054, 0.0))
+
+
+async def _set_number(hass, entry, key, value):
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{entry.entry_id.lower()}_{key}", "value": value},
+        blocking=True,
+    )
+
+
+async def _start_autotune(hass, entry, **data):
+    await _set_number(hass, entry, "setpoint", 50.0)
+    await _set_number(hass, entry, "output_min", 0.0)
+    await _set_number(hass, entry, "output_max", 100.0)
+    await hass.services.async_call(
+        DOMAIN,
+        "autotune",
+        {"bias": 50.0, "amplitude": 50.0, "cycles": 2, **data},
+        target={"entity_id": f"sensor.{entry.entry_id.lower()}_pid_output"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_autotune_service_applies_gains(hass, config_entry, monkeypatch):
+    """The experiment runs on coordinator ticks and writes Kp/Ki/Kd."""
+    clock = [0.0]
+    monkeypatch.setattr(sensor_mod, "perf_counter", lambda: clock[0])
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    events = async_capture_events(hass, EVENT_AUTOTUNE_FINISHED)
+    await _start_autotune(hass, config_entry)
+    assert handle.autotune is not None
+    assert not handle.pid.auto_mode
+
+    plant = FirstOrderPlant(gain=1.0, time_constant=5.0, dead_time=2.0)
+    plant.reset(0.0, 1.0)
+    value = 0.0
+    for _ in range(500):
+        if handle.autotune_task is None:
+            break
+        hass.states.async_set("sensor.test_input", str(value))
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        value = plant.step(coordinator.data, 1.0)
+        clock[0] += 1.0
+
+    assert handle.autotune_task is None
+    assert handle.autotune is None
+    assert handle.pid.auto_mode
+    assert len(events) == 1
+    result = events[0].data
+    assert result["status"] == AUTOTUNE_SUCCEEDED
+    # Ultimate period of this plant is about 7 seconds
+    assert 5 < result["ultimate_period"] < 10
+    assert result["ultimate_gain"] > 0
+    assert handle.autotune_result == result
+    assert handle.params.kp == pytest.approx(result["kp"], abs=1e-4)
+    assert handle.params.ki == pytest.approx(result["ki"], abs=1e-4)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_autotune_timeout_restores_controller(hass, config_entry):
+    handle = config_entry.runtime_data.handle
+    events = async_capture_events(hass, EVENT_AUTOTUNE_FINISHED)
+    await _start_autotune(hass, config_entry, timeout=60)
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+
+    assert handle.autotune_task is None
+    assert handle.pid.auto_mode
+    assert [event.data["status"] for event in events] == [AUTOTUNE_TIMEOUT]
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_autotune_cancel(hass, config_entry):
+    handle = config_entry.runtime_data.handle
+    events = async_capture_events(hass, EVENT_AUTOTUNE_FINISHED)
+    await _start_autotune(hass, config_entry)
+
+    with pytest.raises(HomeAssistantError):
+        await _start_autotune(hass, config_entry)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "cancel_autotune",
+        target={"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert handle.autotune_task is None
+    assert handle.pid.auto_mode
+    assert [event.data["status"] for event in events] == [AUTOTUNE_CANCELLED]
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            "cancel_autotune",
+            target={"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"},
+            blocking=True,
+        )
@@ -0,0 +1,162 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_NAME
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.simple_pid_controller.cascade import async_link, creates_loop
+from custom_components.simple_pid_controller.const import (
+    CONF_CASCADE_SOURCE,
+    CONF_SENSOR_ENTITY_ID,
+    DOMAIN,
+)
+from custom_components.simple_pid_controller.coordinator import PIDDataCoordinator
+from custom_components.simple_pid_controller.scheduler import PIDTickScheduler
+
+
+async def test_scheduler_steps_outer_loops_first(hass):
+    """Within one tick an inner loop only starts once its outer loop is done."""
+    scheduler = PIDTickScheduler(hass)
+    calls = []
+
+    def make(name, depth):
+        async def update():
+            calls.append(f"{name} start")
+            await asyncio.sleep(0)
+            calls.append(f"{name} end")
+            return 1.0
+
+        coordinator = PIDDataCoordinator(
+            hass, name, update, interval=5, scheduler=scheduler
+        )
+        coordinator.cascade_depth = depth
+        return coordinator
+
+    coordinators = [make("inner", 1), make("outer", 0)]
+    unsubs = [c.async_add_listener(lambda: None) for c in coordinators]
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert calls == ["outer start", "outer end", "inner start", "inner end"]
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_links_reject_loops(hass):
+    async_link(hass, "inner", "outer")
+    assert creates_loop(hass, "outer", "inner")
+    assert creates_loop(hass, "inner", "inner")
+    with pytest.raises(HomeAssistantError):
+        async_link(hass, "outer", "inner")
+    async_link(hass, "inner", None)
+    assert not creates_loop(hass, "outer", "inner")
+
+
+@pytest.fixture
+async def cascade(hass, config_entry):
+    """Set up an outer controller feeding the setpoint of the test controller."""
+    hass.states.async_set("sensor.room", "20.0")
+    outer = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="OUTER",
+        title="Outer",
+        data={CONF_SENSOR_ENTITY_ID: "sensor.room", CONF_NAME: "Outer"},
+    )
+    outer.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_CASCADE_SOURCE: outer.entry_id}
+    )
+    # Setting up the first entry sets up every entry of the integration
+    assert await hass.config_entries.async_setup(outer.entry_id)
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.LOADED
+    yield outer, config_entry
+    for entry in (config_entry, outer):
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def _set_number(hass, entry, key, value):
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{entry.entry_id.lower()}_{key}", "value": value},
+        blocking=True,
+    )
+
+
+async def test_inner_setpoint_is_outer_output(hass, cascade):
+    outer, inner = cascade
+    outer_handle = outer.runtime_data.handle
+    inner_handle = inner.runtime_data.handle
+    assert inner.runtime_data.coordinator.cascade_depth == 1
+    assert outer.runtime_data.coordinator.cascade_depth == 0
+
+    await _set_number(hass, outer, "setpoint", 30.0)
+    await outer.runtime_data.coordinator.async_refresh()
+    await inner.runtime_data.coordinator.async_refresh()
+
+    expected = outer_handle.last_known_output
+    assert inner_handle.pid.setpoint == expected
+    assert inner_handle.telemetry.setpoint == expected
+    # The inner setpoint number is not written
+    assert inner_handle.params.setpoint != expected
+
+    # Removing the link returns to the own setpoint
+    hass.config_entries.async_update_entry(inner, options={})
+    await hass.async_block_till_done()
+    assert inner.runtime_data.coordinator.cascade_depth == 0
+    assert inner_handle.telemetry.setpoint == inner_handle.params.setpoint
+
+
+async def test_saturated_inner_loop_holds_outer_integral(hass, cascade):
+    """Anti-windup handoff: the outer I term stops while the inner loop is saturated."""
+    outer, inner = cascade
+    outer_handle = outer.runtime_data.handle
+    inner_handle = inner.runtime_data.handle
+    outer_coordinator = outer.runtime_data.coordinator
+    await _set_number(hass, outer, "setpoint", 50.0)
+    await _set_number(hass, outer, "ki", 1.0)
+    await _set_number(hass, inner, "output_max", 5.0)
+
+    await outer_coordinator.async_refresh()
+    await inner.runtime_data.coordinator.async_refresh()
+    assert inner_handle.output_saturation == 1
+
+    integral = outer_handle.last_contributions[1]
+    for _ in range(3):
+        await asyncio.sleep(0.01)
+        await outer_coordinator.async_refresh()
+        assert outer_handle.last_contributions[1] == integral
+    assert outer_handle.pid.Ki == 1.0
+
+    # Once the inner loop has room again the outer loop integrates
+    await _set_number(hass, inner, "output_max", 100.0)
+    await inner.runtime_data.coordinator.async_refresh()
+    assert inner_handle.output_saturation == 0
+    await asyncio.sleep(0.01)
+    await outer_coordinator.async_refresh()
+    assert outer_handle.last_contributions[1] > integral
+
+
+async def test_options_flow_rejects_cascade_loop(hass, cascade):
+    outer, inner = cascade
+    result = await hass.config_entries.options.async_init(outer.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SENSOR_ENTITY_ID: "sensor.room",
+            CONF_CASCADE_SOURCE: inner.entry_id,
+        },
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "cascade_loop"}
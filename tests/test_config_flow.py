@@ -15,6 +15,54 @@ from custom_components.simple_pid_controller.const import (
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    CONF_PID_ENGINE,
+    DEFAULT_PID_ENGINE,
+    CONF_UPDATE_MODE,
+    DEFAULT_UPDATE_MODE,
+    CONF_MIN_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    CONF_MAX_STALENESS,
+    DEFAULT_MAX_STALENESS,
+    CONF_HISTORY_DEPTH,
+    DEFAULT_HISTORY_DEPTH,
+    CONF_SCHEDULING_MODE,
+    DEFAULT_SCHEDULING_MODE,
+    CONF_MISSED_TICK_POLICY,
+    DEFAULT_MISSED_TICK_POLICY,
+    CONF_PUBLISH_DEADBAND,
+    DEFAULT_PUBLISH_DEADBAND,
+    CONF_PUBLISH_DEADBAND_PCT,
+    DEFAULT_PUBLISH_DEADBAND_PCT,
+    CONF_PUBLISH_MIN_INTERVAL,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    CONF_PUBLISH_HEARTBEAT,
+    DEFAULT_PUBLISH_HEARTBEAT,
+    CONF_OUTPUT_MIN_INTERVAL,
+    DEFAULT_OUTPUT_MIN_INTERVAL,
+    CONF_OUTPUT_DEADBAND,
+    DEFAULT_OUTPUT_DEADBAND,
+    CONF_OUTPUT_ENTITY_ID,
+    CONF_CASCADE_SOURCE,
+    CONF_GAIN_SCHEDULE_SOURCE,
+    DEFAULT_GAIN_SCHEDULE_SOURCE,
+    GAIN_SCHEDULE_SETPOINT,
+    GAIN_SCHEDULE_INPUT,
+    GAIN_SCHEDULE_ENTITY,
+    CONF_GAIN_SCHEDULE_ENTITY_ID,
+    CONF_GAIN_SCHEDULE_TABLE,
+    CONF_DT_SOURCE,
+    DEFAULT_DT_SOURCE,
+    CONF_INPUT_SAMPLING,
+    DEFAULT_INPUT_SAMPLING,
+    CONF_INPUT_FILTERS,
+    CONF_FILTER_EMA_ALPHA,
+    DEFAULT_FILTER_EMA_ALPHA,
+    CONF_FILTER_MEDIAN_WINDOW,
+    DEFAULT_FILTER_MEDIAN_WINDOW,
+    CONF_FILTER_KALMAN_PROCESS_NOISE,
+    DEFAULT_FILTER_KALMAN_PROCESS_NOISE,
+    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+    DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
 )
 from custom_components.simple_pid_controller.config_flow import (
     PIDControllerFlowHandler,
@@ -23,6 +71,35 @@ from custom_components.simple_pid_controller.config_flow import (
 
 SENSOR_ENTITY = "sensor.test_input"
 
+# Optional options filled in by the options flow when not submitted
+DEFAULT_OPTIONS = {
+    CONF_OUTPUT_ENTITY_ID: None,
+    CONF_PID_ENGINE: DEFAULT_PID_ENGINE,
+    CONF_UPDATE_MODE: DEFAULT_UPDATE_MODE,
+    CONF_MIN_INTERVAL: DEFAULT_MIN_INTERVAL,
+    CONF_MAX_STALENESS: DEFAULT_MAX_STALENESS,
+    CONF_HISTORY_DEPTH: DEFAULT_HISTORY_DEPTH,
+    CONF_SCHEDULING_MODE: DEFAULT_SCHEDULING_MODE,
+    CONF_MISSED_TICK_POLICY: DEFAULT_MISSED_TICK_POLICY,
+    CONF_PUBLISH_DEADBAND: DEFAULT_PUBLISH_DEADBAND,
+    CONF_PUBLISH_DEADBAND_PCT: DEFAULT_PUBLISH_DEADBAND_PCT,
+    CONF_PUBLISH_MIN_INTERVAL: DEFAULT_PUBLISH_MIN_INTERVAL,
+    CONF_PUBLISH_HEARTBEAT: DEFAULT_PUBLISH_HEARTBEAT,
+    CONF_OUTPUT_MIN_INTERVAL: DEFAULT_OUTPUT_MIN_INTERVAL,
+    CONF_OUTPUT_DEADBAND: DEFAULT_OUTPUT_DEADBAND,
+    CONF_CASCADE_SOURCE: None,
+    CONF_GAIN_SCHEDULE_SOURCE: DEFAULT_GAIN_SCHEDULE_SOURCE,
+    CONF_GAIN_SCHEDULE_ENTITY_ID: None,
+    CONF_GAIN_SCHEDULE_TABLE: None,
+    CONF_DT_SOURCE: DEFAULT_DT_SOURCE,
+    CONF_INPUT_SAMPLING: DEFAULT_INPUT_SAMPLING,
+    CONF_INPUT_FILTERS: [],
+    CONF_FILTER_EMA_ALPHA: DEFAULT_FILTER_EMA_ALPHA,
+    CONF_FILTER_MEDIAN_WINDOW: DEFAULT_FILTER_MEDIAN_WINDOW,
+    CONF_FILTER_KALMAN_PROCESS_NOISE: DEFAULT_FILTER_KALMAN_PROCESS_NOISE,
+    CONF_FILTER_KALMAN_MEASUREMENT_NOISE: DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+}
+
 
 @pytest.mark.parametrize(
     "user_input, expected_type, expected_data, expected_errors",
@@ -48,6 +125,29 @@ SENSOR_ENTITY = "sensor.test_input"
             },
             None,
         ),
+        # Happy path with an output entity
+        (
+            {
+                CONF_NAME: "My PID 3",
+                CONF_SENSOR_ENTITY_ID: SENSOR_ENTITY,
+                CONF_OUTPUT_ENTITY_ID: "number.heater",
+                CONF_INPUT_RANGE_MIN: DEFAULT_INPUT_RANGE_MIN,
+                CONF_INPUT_RANGE_MAX: DEFAULT_INPUT_RANGE_MAX,
+                CONF_OUTPUT_RANGE_MIN: DEFAULT_OUTPUT_RANGE_MIN,
+                CONF_OUTPUT_RANGE_MAX: DEFAULT_OUTPUT_RANGE_MAX,
+            },
+            FlowResultType.CREATE_ENTRY,
+            {
+                CONF_NAME: "My PID 3",
+                CONF_SENSOR_ENTITY_ID: SENSOR_ENTITY,
+                CONF_OUTPUT_ENTITY_ID: "number.heater",
+                CONF_INPUT_RANGE_MIN: DEFAULT_INPUT_RANGE_MIN,
+                CONF_INPUT_RANGE_MAX: DEFAULT_INPUT_RANGE_MAX,
+                CONF_OUTPUT_RANGE_MIN: DEFAULT_OUTPUT_RANGE_MIN,
+                CONF_OUTPUT_RANGE_MAX: DEFAULT_OUTPUT_RANGE_MAX,
+            },
+            None,
+        ),
         # Happy path specifying explicit valid ranges
         (
             {
@@ -165,6 +265,41 @@ def test_async_get_options_flow():
             },
             {"base": "output_range_min_max"},
         ),
+        (
+            {
+                CONF_SENSOR_ENTITY_ID: "sensor.new",
+                CONF_INPUT_RANGE_MIN: 1.0,
+                CONF_INPUT_RANGE_MAX: 10.0,
+                CONF_OUTPUT_RANGE_MIN: 1.0,
+                CONF_OUTPUT_RANGE_MAX: 10.0,
+                CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_SETPOINT,
+                CONF_GAIN_SCHEDULE_TABLE: "20, 1.0, 0.1, 0\n60, 2.0, 0.2, 0",
+            },
+            None,
+        ),
+        (
+            {
+                CONF_SENSOR_ENTITY_ID: "sensor.new",
+                CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_SETPOINT,
+                CONF_GAIN_SCHEDULE_TABLE: "20, 1.0, 0.1",
+            },
+            {"base": "gain_schedule_invalid"},
+        ),
+        (
+            {
+                CONF_SENSOR_ENTITY_ID: "sensor.new",
+                CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_INPUT,
+            },
+            {"base": "gain_schedule_invalid"},
+        ),
+        (
+            {
+                CONF_SENSOR_ENTITY_ID: "sensor.new",
+                CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_ENTITY,
+                CONF_GAIN_SCHEDULE_TABLE: "20, 1.0, 0.1, 0",
+            },
+            {"base": "gain_schedule_entity_missing"},
+        ),
     ],
 )
 async def test_options_flow(hass, config_entry, new_options, expected_errors):
@@ -184,7 +319,7 @@ async def test_options_flow(hass, config_entry, new_options, expected_errors):
         assert result2.get("errors") == expected_errors
     else:
         assert result2["type"] == FlowResultType.CREATE_ENTRY
-        assert result2.get("data") == new_options
+        assert result2.get("data") == {**DEFAULT_OPTIONS, **new_options}
 
 
 async def test_user_flow_duplicate_abort(hass):
@@ -145,3 +145,73 @@ def test_get_select_no_entity(monkeypatch, hass, config_entry):
     handle = PIDDeviceHandle(hass, config_entry)
     # Key mag willekeurig zijn, er is immers geen entity
     assert handle.get_select("nonexistent_key") is None
+
+
+def test_get_entity_id_is_cached(monkeypatch, hass, config_entry):
+    """Resolved entity_ids are served from the cache after the first lookup."""
+    lookups = []
+
+    class CountingRegistry(DummyRegistry):
+        def async_get_entity_id(self, platform, domain, unique_id):
+            lookups.append(unique_id)
+            return super().async_get_entity_id(platform, domain, unique_id)
+
+    monkeypatch.setattr(
+        er, "async_get", lambda hass_: CountingRegistry("number.pid_entry_kp")
+    )
+
+    handle = PIDDeviceHandle(hass, config_entry)
+    for _ in range(3):
+        assert handle._get_entity_id("number", "kp") == "number.pid_entry_kp"
+
+    assert len(lookups) == 1
+    assert handle.entity_id_cache_misses == 1
+    assert handle.entity_id_cache_hits == 2
+
+
+def test_get_entity_id_misses_are_not_cached(monkeypatch, hass, config_entry):
+    """A missing entity is looked up again so it is found once registered."""
+    registry = DummyRegistry(None)
+    monkeypatch.setattr(er, "async_get", lambda hass_: registry)
+
+    handle = PIDDeviceHandle(hass, config_entry)
+    assert handle._get_entity_id("number", "kp") is None
+
+    registry._entity_id = "number.pid_entry_kp"
+    assert handle._get_entity_id("number", "kp") == "number.pid_entry_kp"
+    assert handle.entity_id_cache_misses == 2
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_entity_id_cache_invalidated_on_rename(hass, config_entry):
+    """Renaming an entity in the registry drops the stale cached entity_id."""
+    handle = config_entry.runtime_data.handle
+    registry = er.async_get(hass)
+
+    old_entity_id = handle._get_entity_id("number", "kp")
+    assert old_entity_id is not None
+
+    registry.async_update_entity(old_entity_id, new_entity_id="number.renamed_kp")
+    await hass.async_block_till_done()
+
+    assert handle._get_entity_id("number", "kp") == "number.renamed_kp"
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_registry_events_filtered_to_cached_entities(hass, config_entry):
+    """Only registry changes of cached entity_ids reach the controller."""
+    handle = config_entry.runtime_data.handle
+    cached = handle._get_entity_id("number", "kp")
+
+    def event(action, entity_id, **extra):
+        return {"action": action, "entity_id": entity_id, **extra}
+
+    assert handle.async_filter_entity_registry_event(event("update", cached))
+    assert handle.async_filter_entity_registry_event(event("remove", cached))
+    assert handle.async_filter_entity_registry_event(
+        event("update", "number.renamed", old_entity_id=cached)
+    )
+    assert not handle.async_filter_entity_registry_event(event("create", cached))
+    assert not handle.async_filter_entity_registry_event(
+        event("update", "light.unrelated", old_entity_id="light.before")
+    )
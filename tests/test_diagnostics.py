@@ -36,3 +36,16 @@ async def test_config_entry_diagnostics(hass, config_entry):
     assert data["input_range_max"] == DEFAULT_INPUT_RANGE_MAX
     assert data["output_range_min"] == DEFAULT_OUTPUT_RANGE_MIN
     assert data["output_range_max"] == DEFAULT_OUTPUT_RANGE_MAX
+
+    # Entity-id cache counters are reported after a known sequence of lookups
+    handle = config_entry.runtime_data.handle
+    handle._entity_id_cache.clear()
+    handle.entity_id_cache_hits = handle.entity_id_cache_misses = 0
+    handle.get_number("kp")
+    handle.get_number("kp")
+    handle.get_switch("auto_mode")
+    handle.get_number("missing")
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    cache = result["data"]["entity_id_cache"]
+    assert cache == {"size": 2, "hits": 1, "misses": 3}
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import pytest
+
+from custom_components.simple_pid_controller.const import (
+    CONF_DT_SOURCE,
+    CONF_FILTER_MEDIAN_WINDOW,
+    CONF_INPUT_FILTERS,
+    CONF_PID_ENGINE,
+    DT_SOURCE_MEASUREMENT,
+    FILTER_MEDIAN,
+    PID_ENGINE_KERNEL,
+    PID_ENGINE_SIMPLE_PID,
+    PID_ENGINE_VECTORIZED,
+)
+
+
+@pytest.mark.parametrize(
+    "engine", [PID_ENGINE_SIMPLE_PID, PID_ENGINE_KERNEL, PID_ENGINE_VECTORIZED]
+)
+async def test_measurement_dt_steps_on_new_reports_only(
+    hass, config_entry, freezer, engine
+):
+    """The time step is the time between reports; ticks without one are skipped."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_DT_SOURCE: DT_SOURCE_MEASUREMENT, CONF_PID_ENGINE: engine},
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+
+    hass.states.async_set("sensor.test_input", "20.0")
+    await coordinator.async_refresh()
+    steps = len(handle.history)
+    output = handle.last_known_output
+
+    # A late tick without a new report does not step the controller
+    freezer.tick(timedelta(seconds=30))
+    await coordinator.async_refresh()
+    assert len(handle.history) == steps
+    assert handle.skipped_steps >= 1
+    assert coordinator.data == output
+
+    # An unchanged value reported again is a new measurement
+    hass.states.async_set("sensor.test_input", "20.0", force_update=True)
+    await coordinator.async_refresh()
+    assert len(handle.history) == steps + 1
+    assert handle.telemetry.dt == pytest.approx(30.0)
+
+    freezer.tick(timedelta(seconds=5))
+    hass.states.async_set("sensor.test_input", "21.0")
+    freezer.tick(timedelta(seconds=60))
+    await coordinator.async_refresh()
+    assert handle.telemetry.dt == pytest.approx(5.0)
+    assert handle.history.latest("dt") == pytest.approx(5.0)
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_skipped_ticks_leave_the_input_filter_alone(hass, config_entry):
+    """Ticks without a new report do not feed stateful filters."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_DT_SOURCE: DT_SOURCE_MEASUREMENT,
+            CONF_INPUT_FILTERS: [FILTER_MEDIAN],
+            CONF_FILTER_MEDIAN_WINDOW: 5,
+        },
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    median = handle.input_filter.filters[0]
+
+    for value in ("10.0", "20.0", "10.0"):
+        hass.states.async_set("sensor.test_input", value)
+        await coordinator.async_refresh()
+        # Repeated ticks on the same report
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+    assert handle.skipped_steps >= 6
+    # Only the three reports reached the filter
+    assert list(median._samples) == [10.0, 20.0, 10.0]
+    assert handle.telemetry.input == 10.0
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,223 @@
+import random
+
+import numpy as np
+import pytest
+from simple_pid import PID
+
+from custom_components.simple_pid_controller.engine import EnginePID, VectorPIDEngine
+from custom_components.simple_pid_controller.const import (
+    CONF_PID_ENGINE,
+    PID_ENGINE_VECTORIZED,
+)
+
+
+class FakeClock:
+    """Deterministic time source shared by the engine and the reference PID."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_reference(clock, **kwargs):
+    return PID(sample_time=None, time_fn=clock, **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_step_matches_simple_pid(seed):
+    """Randomized parity check of a batch of controllers against simple_pid."""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    engine = VectorPIDEngine(capacity=2, time_fn=clock)
+
+    references = []
+    slots = []
+    for _ in range(8):
+        kwargs = {
+            "Kp": rng.uniform(-5, 5),
+            "Ki": rng.uniform(-1, 1),
+            "Kd": rng.uniform(-1, 1),
+            "setpoint": rng.uniform(0, 100),
+            "proportional_on_measurement": rng.random() < 0.5,
+        }
+        limits = rng.choice([(None, None), (0.0, 100.0), (-10.0, None), (None, 5.0)])
+        references.append(make_reference(clock, output_limits=limits, **kwargs))
+        slots.append(
+            engine.allocate(
+                kwargs["Kp"],
+                kwargs["Ki"],
+                kwargs["Kd"],
+                kwargs["setpoint"],
+                limits,
+                True,
+                kwargs["proportional_on_measurement"],
+            )
+        )
+
+    slots = np.array(slots)
+    for _ in range(200):
+        clock.now += rng.uniform(0.01, 2.0)
+        inputs = np.array([rng.uniform(0, 100) for _ in references])
+
+        # Occasionally change settings or toggle auto mode on one controller
+        i = rng.randrange(len(references))
+        action = rng.random()
+        if action < 0.05:
+            references[i].set_auto_mode(False)
+            engine.set_auto_mode(slots[i], False)
+        elif action < 0.10:
+            last = rng.uniform(-20, 120)
+            references[i].set_auto_mode(True, last)
+            engine.set_auto_mode(slots[i], True, last)
+        elif action < 0.15:
+            limits = (rng.uniform(-50, 0), rng.uniform(1, 50))
+            references[i].output_limits = limits
+            engine.set_output_limits(slots[i], limits)
+
+        expected = [pid(x) for pid, x in zip(references, inputs)]
+        actual = engine.step(slots, inputs)
+
+        for exp, act in zip(expected, actual):
+            if exp is None:
+                assert np.isnan(act)
+            else:
+                assert act == pytest.approx(exp, rel=1e-12, abs=1e-12)
+
+        for pid, slot in zip(references, slots):
+            assert engine.integral[slot] == pytest.approx(
+                pid.components[1], rel=1e-12, abs=1e-12
+            )
+
+
+def test_explicit_dt_matches_simple_pid():
+    """A fixed dt gives the same result as simple_pid's dt argument."""
+    clock = FakeClock()
+    engine = VectorPIDEngine(time_fn=clock)
+    pid = EnginePID(engine, 2.0, 0.5, 0.1, setpoint=10, output_limits=(0, 20))
+    reference = make_reference(
+        clock, Kp=2.0, Ki=0.5, Kd=0.1, setpoint=10, output_limits=(0, 20)
+    )
+
+    for x in [0.0, 2.0, 5.0, 9.0, 11.0, 10.5]:
+        clock.now += 1.0
+        assert pid(x, dt=0.5) == pytest.approx(reference(x, dt=0.5))
+    assert pid.components == pytest.approx(reference.components)
+
+
+def test_engine_pid_interface():
+    """EnginePID exposes the simple_pid.PID attributes used by the integration."""
+    engine = VectorPIDEngine()
+    pid = EnginePID(engine, 1.0, 0.1, 0.05, setpoint=50, auto_mode=False)
+
+    pid.tunings = (2.0, 0.2, 0.02)
+    assert (pid.Kp, pid.Ki, pid.Kd) == (2.0, 0.2, 0.02)
+
+    pid.output_limits = (None, 10.0)
+    assert pid.output_limits == (None, 10.0)
+    with pytest.raises(ValueError):
+        pid.output_limits = (5.0, 1.0)
+
+    # Manual mode without a previous output returns None
+    assert pid(10.0) is None
+    pid._last_output = 7.0
+    assert pid(10.0) == 7.0
+
+    pid.set_auto_mode(True, 30.0)
+    assert pid.auto_mode is True
+    # Integral starts from the clamped last output
+    assert pid.components[1] == 10.0
+
+    pid.release()
+    assert len(engine) == 0
+
+
+def test_engine_reuses_released_slots_and_grows():
+    engine = VectorPIDEngine(capacity=1)
+    first = engine.allocate()
+    second = engine.allocate()
+    assert engine.capacity >= 2
+
+    engine.release(first)
+    assert engine.allocate() == first
+    assert len(engine) == 2
+    assert second != first
+
+
+async def test_staged_controllers_step_in_one_pass(monkeypatch):
+    """Controllers staged in the same loop iteration share one step call."""
+    engine = VectorPIDEngine()
+    pids = [EnginePID(engine, 1.0, 0.0, 0.0, setpoint=10) for _ in range(5)]
+
+    calls = []
+    original_step = engine.step
+
+    def counting_step(slots, inputs, dt=None):
+        calls.append(len(slots))
+        return original_step(slots, inputs, dt)
+
+    monkeypatch.setattr(engine, "step", counting_step)
+
+    futures = [pid.async_call(float(i)) for i, pid in enumerate(pids)]
+    outputs = [await future for future in futures]
+
+    assert calls == [5]
+    assert outputs == [10.0 - i for i in range(5)]
+
+
+async def test_staged_dt_per_controller():
+    """A staged dt is used for its slot, the others measure their own."""
+    clock = FakeClock()
+    engine = VectorPIDEngine(time_fn=clock)
+    timed = EnginePID(engine, 0.0, 1.0, 0.0, setpoint=10)
+    measured = EnginePID(engine, 0.0, 1.0, 0.0, setpoint=10)
+
+    clock.now = 4.0
+    futures = [timed.async_call(0.0, 0.5), measured.async_call(0.0)]
+    outputs = [await future for future in futures]
+
+    # Integral of an error of 10 over the staged 0.5 s and the measured 4 s
+    assert outputs == [pytest.approx(5.0), pytest.approx(40.0)]
+
+
+async def test_restaged_slot_resolves_both_futures(monkeypatch):
+    """Staging a slot twice steps it once and resolves both callers."""
+    engine = VectorPIDEngine()
+    pid = EnginePID(engine, 1.0, 0.0, 0.0, setpoint=10)
+
+    calls = []
+    original_step = engine.step
+
+    def counting_step(slots, inputs, dt=None):
+        calls.append(list(inputs))
+        return original_step(slots, inputs, dt)
+
+    monkeypatch.setattr(engine, "step", counting_step)
+
+    first = pid.async_call(2.0)
+    second = pid.async_call(4.0)
+
+    assert await first == 6.0
+    assert await second == 6.0
+    assert calls == [[4.0]]
+
+
+async def test_vectorized_engine_option(hass, config_entry):
+    """A controller configured for the vectorized engine runs on EnginePID."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_PID_ENGINE: PID_ENGINE_VECTORIZED}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    assert isinstance(handle.pid, EnginePID)
+
+    output = await coordinator.update_method()
+    assert output is not None
+    assert handle.last_known_output == output
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,165 @@
+import pytest
+
+from custom_components.simple_pid_controller.const import (
+    CONF_FILTER_MEDIAN_WINDOW,
+    CONF_INPUT_FILTERS,
+    CONF_INPUT_SAMPLING,
+    INPUT_SAMPLING_TIME_WEIGHTED,
+    FILTER_EMA,
+    FILTER_KALMAN,
+    FILTER_MEDIAN,
+)
+from custom_components.simple_pid_controller.filters import (
+    EMAFilter,
+    FilterChain,
+    KalmanFilter,
+    MedianFilter,
+    TimeWeightedAverage,
+)
+import custom_components.simple_pid_controller as pid_mod
+import custom_components.simple_pid_controller.sensor as sensor_mod
+
+
+def test_ema_starts_at_first_sample():
+    ema = EMAFilter(0.5)
+    assert ema.update(10.0) == 10.0
+    assert ema.update(20.0) == 15.0
+    assert ema.update(20.0) == 17.5
+    ema.reset()
+    assert ema.update(4.0) == 4.0
+
+    with pytest.raises(ValueError):
+        EMAFilter(0.0)
+
+
+def test_median_rejects_spikes():
+    median = MedianFilter(3)
+    assert median.update(1.0) == 1.0
+    assert median.update(3.0) == 2.0
+    assert median.update(100.0) == 3.0
+    assert median.update(2.0) == 3.0
+    assert median.update(2.0) == 2.0
+    # The window never grows beyond its size
+    assert len(median._sorted) == 3
+
+
+def test_median_matches_sorting_the_window():
+    values = [5.0, 1.0, 4.0, 4.0, 9.0, 2.0, 6.0, 5.0, 3.0, 5.0, 8.0, 0.0]
+    median = MedianFilter(4)
+    for n, value in enumerate(values, start=1):
+        window = sorted(values[max(0, n - 4) : n])
+        mid = len(window) // 2
+        expected = (
+            window[mid] if len(window) % 2 else (window[mid - 1] + window[mid]) / 2
+        )
+        assert median.update(value) == expected
+
+
+def test_kalman_converges_and_smooths():
+    kalman = KalmanFilter(process_noise=0.01, measurement_noise=1.0)
+    assert kalman.update(20.0) == 20.0
+    for k in range(200):
+        value = kalman.update(22.0 + (0.5 if k % 2 else -0.5))
+    assert value == pytest.approx(22.0, abs=0.1)
+    # Steady state gain is well below one, so single spikes are damped
+    assert kalman.update(32.0) - value < 2.0
+
+    with pytest.raises(ValueError):
+        KalmanFilter(0.0, 1.0)
+
+
+def test_chain_runs_filters_in_order():
+    chain = FilterChain.from_options([FILTER_MEDIAN, FILTER_EMA], 0.5, 3, 0.01, 1.0)
+    assert [type(f) for f in chain.filters] == [MedianFilter, EMAFilter]
+    assert chain.update(10.0) == 10.0
+    # Median of (10, 100) is 55, the EMA halves the step
+    assert chain.update(100.0) == 32.5
+    assert not FilterChain(())
+
+    with pytest.raises(ValueError):
+        FilterChain.from_options(["unknown"], 0.5, 3, 0.01, 1.0)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_filtered_input_drives_the_pid(hass, config_entry):
+    """The PID sees the filtered value, the history keeps both."""
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_INPUT_FILTERS: [FILTER_MEDIAN, FILTER_KALMAN],
+            CONF_FILTER_MEDIAN_WINDOW: 3,
+        },
+    )
+    await hass.async_block_till_done()
+    chain = handle.input_filter
+    assert len(chain.filters) == 2
+
+    for value in ("20.0", "20.0", "90.0", "20.0"):
+        hass.states.async_set("sensor.test_input", value)
+        await coordinator.async_refresh()
+
+    assert handle.telemetry.raw_input == 20.0
+    assert handle.history.column("raw_input")[-2] == 90.0
+    # The spike never reached the controller, which starts from 25.0
+    assert max(handle.history.column("input")[-3:]) <= 25.0
+
+    # Unrelated option changes keep the filter state
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={**config_entry.options, "history_depth": 50},
+    )
+    await hass.async_block_till_done()
+    assert handle.input_filter is chain
+
+
+def test_time_weighted_average_resets_every_take():
+    average = TimeWeightedAverage()
+    assert average.take(0.0) is None
+
+    average.add(10.0, 0.0)
+    average.add(20.0, 1.0)
+    average.add(40.0, 3.0)
+    # 10 for 1 s, 20 for 2 s and 40 for 1 s
+    assert average.take(4.0) == (22.5, 10.0, 40.0)
+    # The next period starts from the value still current
+    assert average.take(6.0) == (40.0, 40.0, 40.0)
+
+    # Unavailable stretches do not count
+    average.add(None, 6.0)
+    average.add(20.0, 9.0)
+    assert average.take(10.0) == (20.0, 20.0, 40.0)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_time_weighted_sampling_drives_the_pid(hass, config_entry, monkeypatch):
+    """Every state change between two ticks counts, weighted by its duration."""
+    clock = [0.0]
+    monkeypatch.setattr(pid_mod, "perf_counter", lambda: clock[0])
+    monkeypatch.setattr(sensor_mod, "perf_counter", lambda: clock[0])
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_INPUT_SAMPLING: INPUT_SAMPLING_TIME_WEIGHTED}
+    )
+    await hass.async_block_till_done()
+    assert handle.input_average is not None
+
+    clock[0] = 10.0
+    await coordinator.async_refresh()
+    for value in ("30.0", "50.0"):
+        hass.states.async_set("sensor.test_input", value)
+        await hass.async_block_till_done()
+        clock[0] += 2.0
+    clock[0] += 6.0
+    await coordinator.async_refresh()
+
+    # 30 for 2 s and 50 for 8 s
+    assert handle.telemetry.input == pytest.approx(46.0)
+    # The period starts with the value current at the previous tick
+    assert handle.telemetry.input_min == 25.0
+    assert handle.telemetry.input_max == 50.0
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert handle.input_average is None
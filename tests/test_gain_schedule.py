@@ -0,0 +1,125 @@
+import pytest
+
+from custom_components.simple_pid_controller.const import (
+    CONF_GAIN_SCHEDULE_ENTITY_ID,
+    CONF_GAIN_SCHEDULE_SOURCE,
+    CONF_GAIN_SCHEDULE_TABLE,
+    GAIN_SCHEDULE_ENTITY,
+    GAIN_SCHEDULE_OFF,
+    GAIN_SCHEDULE_SETPOINT,
+)
+from custom_components.simple_pid_controller.gain_schedule import GainSchedule
+
+TABLE = """
+# setpoint, kp, ki, kd
+60, 4.0, 0.4, 0.0
+20, 1.0, 0.1, 1.0
+40, 2.0, 0.2, 0.0
+"""
+
+
+def test_lookup_interpolates_between_sorted_breakpoints():
+    schedule = GainSchedule.parse(TABLE)
+    assert schedule.breakpoints == (20.0, 40.0, 60.0)
+    assert len(schedule) == 3
+    assert schedule.lookup(20.0) == (1.0, 0.1, 1.0)
+    assert schedule.lookup(30.0) == pytest.approx((1.5, 0.15, 0.5))
+    assert schedule.lookup(50.0) == pytest.approx((3.0, 0.3, 0.0))
+    # Clamped to the nearest breakpoint outside the table
+    assert schedule.lookup(-5.0) == (1.0, 0.1, 1.0)
+    assert schedule.lookup(60.0) == (4.0, 0.4, 0.0)
+    assert schedule.lookup(100.0) == (4.0, 0.4, 0.0)
+
+
+@pytest.mark.parametrize(
+    "table",
+    ["", "# only a comment", "20, 1, 0.1", "20, 1, x, 0", "20, 1, 0, 0\n20, 2, 0, 0"],
+)
+def test_parse_rejects_invalid_tables(table):
+    with pytest.raises(ValueError):
+        GainSchedule.parse(table)
+
+
+async def _set_number(hass, entry, key, value):
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{entry.entry_id.lower()}_{key}", "value": value},
+        blocking=True,
+    )
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_gains_follow_the_setpoint(hass, config_entry):
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    await _set_number(hass, config_entry, "kp", 9.0)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_SETPOINT,
+            CONF_GAIN_SCHEDULE_TABLE: TABLE,
+        },
+    )
+    await hass.async_block_till_done()
+    # Applied in place, the entry is not reloaded
+    assert config_entry.runtime_data.handle is handle
+    schedule = handle.gain_schedule
+
+    await _set_number(hass, config_entry, "setpoint", 30.0)
+    await coordinator.async_refresh()
+    assert handle.pid.tunings == pytest.approx((1.5, 0.15, 0.5))
+    # History records the scheduled gains, not the number entities
+    assert handle.history.latest("kp") == pytest.approx(1.5)
+    assert handle.history.latest("ki") == pytest.approx(0.15)
+    assert handle.history.latest("kd") == pytest.approx(0.5)
+
+    await _set_number(hass, config_entry, "setpoint", 50.0)
+    await coordinator.async_refresh()
+    assert handle.pid.tunings == pytest.approx((3.0, 0.3, 0.0))
+
+    # A change to an unrelated option keeps the parsed table
+    hass.config_entries.async_update_entry(
+        config_entry, options={**config_entry.options, "history_depth": 50}
+    )
+    await hass.async_block_till_done()
+    assert handle.gain_schedule is schedule
+    await coordinator.async_refresh()
+    assert handle.pid.tunings == pytest.approx((3.0, 0.3, 0.0))
+
+    # Without a schedule the number entities set the gains again
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={**config_entry.options, CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_OFF},
+    )
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    assert handle.pid.Kp == 9.0
+    assert handle.history.latest("kp") == 9.0
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_gains_follow_an_auxiliary_entity(hass, config_entry):
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    hass.states.async_set("sensor.outdoor", "40.0")
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_GAIN_SCHEDULE_SOURCE: GAIN_SCHEDULE_ENTITY,
+            CONF_GAIN_SCHEDULE_ENTITY_ID: "sensor.outdoor",
+            CONF_GAIN_SCHEDULE_TABLE: TABLE,
+        },
+    )
+    await hass.async_block_till_done()
+    assert handle.pid.tunings == (2.0, 0.2, 0.0)
+
+    # Gains stay put while the entity has no numeric state
+    hass.states.async_set("sensor.outdoor", "unavailable")
+    await coordinator.async_refresh()
+    assert handle.pid.tunings == (2.0, 0.2, 0.0)
+
+    hass.states.async_set("sensor.outdoor", "60.0")
+    await coordinator.async_refresh()
+    assert handle.pid.tunings == (4.0, 0.4, 0.0)
+    assert handle.scheduled_gains == (4.0, 0.4, 0.0)
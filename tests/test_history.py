@@ -0,0 +1,150 @@
+import pytest
+
+from custom_components.simple_pid_controller.const import CONF_HISTORY_DEPTH
+from custom_components.simple_pid_controller.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.simple_pid_controller.history import (
+    HISTORY_COLUMNS,
+    AggregateHistory,
+    AggregateTier,
+    HistoryBuffer,
+)
+
+
+def append(buffer, value, **overrides):
+    sample = {name: value for name in HISTORY_COLUMNS}
+    sample.update(overrides)
+    buffer.append(
+        sample["input"],
+        sample["output"],
+        sample["p"],
+        sample["i"],
+        sample["d"],
+        sample["i_delta"],
+        sample["kp"],
+        sample["ki"],
+        sample["kd"],
+        sample["setpoint"],
+        sample["dt"],
+    )
+
+
+def test_history_wraps_around_oldest_first():
+    """Once full, new samples overwrite the oldest ones."""
+    buffer = HistoryBuffer(3)
+    assert len(buffer) == 0
+    assert buffer.latest("input") is None
+    assert buffer.column("input") == []
+
+    for value in range(1, 6):
+        append(buffer, float(value))
+
+    assert len(buffer) == 3
+    assert buffer.column("input") == [3.0, 4.0, 5.0]
+    assert buffer.latest("output") == 5.0
+    assert buffer.as_dict().keys() == set(HISTORY_COLUMNS)
+
+
+def test_history_stores_missing_values_as_none():
+    buffer = HistoryBuffer(2)
+    append(buffer, 1.0, output=None, dt=None)
+
+    assert buffer.column("output") == [None]
+    assert buffer.latest("dt") is None
+    assert buffer.latest("input") == 1.0
+
+
+def test_history_rejects_invalid_depth():
+    with pytest.raises(ValueError):
+        HistoryBuffer(0)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_history_recorded_on_update(hass, config_entry):
+    """Each PID step stores one sample, exposed in diagnostics."""
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+
+    before = len(handle.history)
+    await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    assert len(handle.history) == before + 1
+    assert handle.history.latest("output") == coordinator.data
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["data"]["history"]["output"][-1] == coordinator.data
+
+
+async def test_history_depth_from_options(hass, config_entry):
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_HISTORY_DEPTH: 5}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data.handle.history.depth == 5
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def test_aggregate_tier_buckets_by_period():
+    """Samples are folded into min/max/mean/last per bucket."""
+    tier = AggregateTier(60, 3)
+    tier.add(0.0, (1.0, 10.0, None, 0.0, 0.0, 0.0))
+    tier.add(30.0, (3.0, 20.0, None, 0.0, 0.0, 0.0))
+    tier.add(61.0, (5.0, None, None, 0.0, 0.0, 0.0))
+
+    buckets = tier.as_list()
+    assert len(buckets) == 2
+    assert buckets[0]["input"] == {
+        "min": 1.0,
+        "max": 3.0,
+        "mean": 2.0,
+        "last": 3.0,
+        "samples": 2,
+    }
+    assert buckets[0]["error"] is None
+    assert buckets[1]["start"] == "1970-01-01T00:01:00+00:00"
+    assert buckets[1]["output"] is None
+
+
+def test_aggregate_tier_memory_is_bounded():
+    """Old buckets are overwritten and gaps do not use slots."""
+    tier = AggregateTier(60, 3)
+    nbytes = tier.nbytes
+    for minute in (0, 1, 5, 6, 100):
+        tier.add(minute * 60.0, (float(minute),) * 6)
+
+    assert len(tier) == 3
+    assert [b["input"]["last"] for b in tier.as_list()] == [5.0, 6.0, 100.0]
+    assert tier.nbytes == nbytes
+
+    # Late samples are folded into the current bucket
+    tier.add(0.0, (200.0,) * 6)
+    assert tier.as_list()[-1]["input"]["max"] == 200.0
+
+
+def test_aggregate_history_tiers():
+    history = AggregateHistory(2, 2)
+    for second in range(0, 7200, 30):
+        history.add(float(second), 1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+
+    result = history.as_dict()
+    assert len(result["minute"]) == 2
+    assert len(result["hour"]) == 2
+    assert result["hour"][0]["d"]["samples"] == 120
+    assert result["bytes"] == history.nbytes
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_history_aggregates_in_diagnostics(hass, config_entry):
+    coordinator = config_entry.runtime_data.coordinator
+    await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    aggregates = result["data"]["history_aggregates"]
+    assert aggregates["minute"][-1]["output"]["last"] == coordinator.data
+    assert aggregates["hour"][-1]["input"]["samples"] >= 1
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+from simple_pid import PID
+
+from custom_components.simple_pid_controller.const import (
+    CONF_PID_ENGINE,
+    PID_ENGINE_KERNEL,
+)
+from custom_components.simple_pid_controller.kernel import PIDKernel
+
+
+class FakeClock:
+    """Deterministic time source shared by the kernel and the reference PID."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_kernel_matches_simple_pid(seed):
+    """Randomized parity check against simple_pid 2.0.1."""
+    rng = random.Random(seed)
+    clock = FakeClock()
+    kwargs = {
+        "Kp": rng.uniform(-5, 5),
+        "Ki": rng.uniform(-1, 1),
+        "Kd": rng.uniform(-1, 1),
+        "setpoint": rng.uniform(0, 100),
+        "output_limits": rng.choice(
+            [(None, None), (0.0, 100.0), (-10.0, None), (None, 5.0)]
+        ),
+        "proportional_on_measurement": rng.random() < 0.5,
+        "starting_output": rng.uniform(-20, 20),
+    }
+    reference = PID(sample_time=None, time_fn=clock, **kwargs)
+    kernel = PIDKernel(time_fn=clock, **kwargs)
+
+    for _ in range(300):
+        clock.now += rng.choice([0.0, rng.uniform(0.01, 2.0)])
+        x = rng.uniform(0, 100)
+        dt = rng.uniform(0.1, 5.0) if rng.random() < 0.2 else None
+
+        action = rng.random()
+        if action < 0.05:
+            reference.set_auto_mode(False)
+            kernel.set_auto_mode(False)
+        elif action < 0.10:
+            last = rng.choice([None, rng.uniform(-20, 120)])
+            reference.set_auto_mode(True, last)
+            kernel.set_auto_mode(True, last)
+        elif action < 0.15:
+            limits = rng.choice([None, (rng.uniform(-50, 0), rng.uniform(1, 50))])
+            reference.output_limits = limits
+            kernel.output_limits = limits
+        elif action < 0.20:
+            tunings = (rng.uniform(-5, 5), rng.uniform(-1, 1), rng.uniform(-1, 1))
+            reference.tunings = tunings
+            kernel.tunings = tunings
+        elif action < 0.25:
+            enabled = not reference.proportional_on_measurement
+            reference.proportional_on_measurement = enabled
+            kernel.proportional_on_measurement = enabled
+
+        expected = reference(x, dt)
+        output, p, i, d = kernel.step(x, dt)
+
+        if expected is None:
+            assert output is None
+        else:
+            assert output == pytest.approx(expected, rel=1e-12, abs=1e-12)
+        assert (p, i, d) == pytest.approx(reference.components, rel=1e-12, abs=1e-12)
+        assert kernel.output_limits == reference.output_limits
+        assert kernel.auto_mode == reference.auto_mode
+
+
+def test_kernel_interface():
+    """PIDKernel exposes the simple_pid.PID attributes used by the integration."""
+    pid = PIDKernel(1.0, 0.1, 0.05, setpoint=50, auto_mode=False)
+
+    # Manual mode without a previous output returns None
+    assert pid(10.0) is None
+    pid._last_output = 7.0
+    assert pid(10.0) == 7.0
+
+    pid.output_limits = (0.0, 10.0)
+    assert pid._last_output == 7.0
+    with pytest.raises(ValueError):
+        pid.output_limits = (5.0, 1.0)
+
+    pid.auto_mode = True
+    assert pid.components == (0.0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        pid(10.0, dt=0)
+    with pytest.raises(ValueError):
+        PIDKernel(sample_time=1.0)
+    with pytest.raises(AttributeError):
+        pid.unknown = 1
+
+
+async def test_kernel_engine_option(hass, config_entry):
+    """A controller configured for the kernel engine runs on PIDKernel."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_PID_ENGINE: PID_ENGINE_KERNEL}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    assert isinstance(handle.pid, PIDKernel)
+
+    output = await coordinator.update_method()
+    assert output is not None
+    assert handle.telemetry.output == output
+    assert handle.last_contributions[:3] == handle.pid.components
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -163,3 +163,20 @@ async def test_controlparameter_number_unexpected_key(
     assert f"Unknown PID key '{invalid_key}'. Using default values:" in caplog.text
     assert num._attr_native_min_value == expected_min
     assert num._attr_native_max_value == expected_max
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_set_value_pushes_into_handle_params(hass, config_entry):
+    """Setting a number writes the value into the handle's parameter struct."""
+    handle = config_entry.runtime_data.handle
+    version = handle.params.version
+
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{config_entry.entry_id}_kp", "value": 2.5},
+        blocking=True,
+    )
+
+    assert handle.params.kp == 2.5
+    assert handle.params.version == version + 1
@@ -0,0 +1,78 @@
+import pytest
+
+from custom_components.simple_pid_controller.const import (
+    CONF_PUBLISH_DEADBAND,
+    CONF_PUBLISH_HEARTBEAT,
+)
+from custom_components.simple_pid_controller.publish import PublishGate, PublishPolicy
+
+
+def test_default_policy_skips_unchanged_values():
+    gate = PublishGate(PublishPolicy())
+    assert gate.should_publish(1.0, True, 0.0)
+    assert not gate.should_publish(1.0, True, 1.0)
+    assert gate.should_publish(1.01, True, 2.0)
+    assert gate.should_publish(None, True, 3.0)
+    assert not gate.should_publish(None, True, 4.0)
+    # Availability changes are always published
+    assert gate.should_publish(None, False, 5.0)
+
+
+def test_deadband_absolute_and_relative():
+    """The larger of the absolute and relative deadband applies."""
+    gate = PublishGate(PublishPolicy(deadband=0.5, deadband_pct=10))
+    assert gate.should_publish(10.0, True, 0.0)
+    assert not gate.should_publish(10.6, True, 1.0)
+    assert gate.should_publish(11.1, True, 2.0)
+
+    gate = PublishGate(PublishPolicy(deadband=0.5, deadband_pct=10))
+    assert gate.should_publish(1.0, True, 0.0)
+    assert not gate.should_publish(1.4, True, 1.0)
+    assert gate.should_publish(1.6, True, 2.0)
+
+
+def test_min_interval_and_heartbeat():
+    gate = PublishGate(PublishPolicy(deadband=100, min_interval=5, heartbeat=60))
+    assert gate.should_publish(1.0, True, 0.0)
+    assert not gate.should_publish(500.0, True, 4.0)
+    assert gate.should_publish(500.0, True, 5.0)
+    assert not gate.should_publish(501.0, True, 64.0)
+    # Heartbeat forces a write even inside the deadband
+    assert gate.should_publish(501.0, True, 65.0)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_output_sensor_publishes_only_changes(hass, config_entry):
+    """The controller computes every refresh, the state is written on change."""
+    coordinator = config_entry.runtime_data.coordinator
+    handle = config_entry.runtime_data.handle
+    entity_id = f"sensor.{config_entry.entry_id.lower()}_pid_output"
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    reported = hass.states.get(entity_id).last_reported
+
+    # Manual mode keeps the output constant
+    handle.params.set("auto_mode", False)
+    steps = len(handle.history)
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(handle.history) == steps + 2
+    assert hass.states.get(entity_id).last_reported == reported
+
+
+async def test_publish_policy_from_options(hass, config_entry):
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_PUBLISH_DEADBAND: 0.5, CONF_PUBLISH_HEARTBEAT: 30}
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data.handle.publish_policy == PublishPolicy(
+        deadband=0.5, heartbeat=30
+    )
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.simple_pid_controller import PIDParameters
+from custom_components.simple_pid_controller.const import DOMAIN, MAX_REPLAY_STEPS
+from custom_components.simple_pid_controller.replay import (
+    ReplayStats,
+    ShadowController,
+)
+
+
+def _params(**kwargs):
+    return PIDParameters(
+        **{
+            "kp": 2.0,
+            "ki": 0.0,
+            "kd": 0.0,
+            "setpoint": 10.0,
+            "sample_time": 1.0,
+            "output_min": -100.0,
+            "output_max": 100.0,
+            "start_mode": "Zero start",
+            **kwargs,
+        }
+    )
+
+
+INPUTS = ([0.0, 5.0, 12.5], [4.0, 8.0, 11.0])
+SETPOINTS = ([0.0], [10.0])
+ACTUALS = ([0.0], [0.0])
+
+
+def test_shadow_follows_latest_samples():
+    shadow = ShadowController(_params())
+    stats = ReplayStats()
+    shadow.replay(0.0, 20.0, INPUTS, SETPOINTS, ACTUALS, stats)
+
+    result = stats.as_dict()
+    assert result["ticks"] == 20
+    # Errors are -6 for 5 ticks, -2 for 8 and +1 for 7
+    assert result["iae"] == pytest.approx(5 * 6 + 8 * 2 + 7 * 1)
+    assert result["max_abs_error"] == 6.0
+    assert (result["output_min"], result["output_max"]) == (-2.0, 12.0)
+    assert result["output_travel"] == pytest.approx(8 + 6)
+    assert result["mean_abs_output_difference"] == pytest.approx(
+        (5 * 12 + 8 * 4 + 7 * 2) / 20
+    )
+
+
+def test_chunks_match_a_single_pass():
+    """State carries over, so splitting the period changes nothing."""
+    params = _params(ki=0.1)
+    single = ReplayStats()
+    ShadowController(params).replay(0.0, 20.0, INPUTS, SETPOINTS, ACTUALS, single)
+
+    shadow = ShadowController(params)
+    total = ReplayStats()
+    for start in range(0, 20, 3):
+        shadow.replay(
+            float(start),
+            float(min(start + 3, 20)),
+            INPUTS,
+            SETPOINTS,
+            ACTUALS,
+            total,
+        )
+    assert total.as_dict() == pytest.approx(single.as_dict())
+
+
+def test_replay_without_input_records_nothing():
+    stats = ReplayStats()
+    shadow = ShadowController(_params())
+    shadow.replay(0.0, 10.0, ([], []), SETPOINTS, ACTUALS, stats)
+    assert stats.as_dict()["ticks"] == 0
+    assert stats.as_dict()["output_mean"] is None
+    assert shadow.next_tick is None
+
+
+async def _call_replay(hass, entry, **data):
+    return await hass.services.async_call(
+        DOMAIN,
+        "replay",
+        data,
+        target={"entity_id": f"sensor.{entry.entry_id.lower()}_pid_output"},
+        blocking=True,
+        return_response=True,
+    )
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_replay_service_needs_recorder(hass, config_entry):
+    with pytest.raises(HomeAssistantError, match="recorder"):
+        await _call_replay(
+            hass,
+            config_entry,
+            start=(dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+        )
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_replay_service_rejects_empty_period(hass, config_entry):
+    now = dt_util.utcnow()
+    with pytest.raises(HomeAssistantError, match="before"):
+        await _call_replay(
+            hass,
+            config_entry,
+            start=now.isoformat(),
+            end=(now - timedelta(minutes=1)).isoformat(),
+        )
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_replay_service_rejects_too_many_steps(hass, config_entry):
+    now = dt_util.utcnow()
+    sample_time = config_entry.runtime_data.handle.params.sample_time
+    span = timedelta(seconds=(MAX_REPLAY_STEPS + 1) * sample_time)
+    with pytest.raises(HomeAssistantError, match="limited"):
+        await _call_replay(
+            hass,
+            config_entry,
+            start=(now - span).isoformat(),
+            end=now.isoformat(),
+        )
@@ -0,0 +1,63 @@
+"""Replay service tests against a real recorder database."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.simple_pid_controller.const import DOMAIN
+
+
+@pytest.fixture(autouse=True)
+def _enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Set up the recorder before hass is created."""
+
+
+async def call_replay(hass, entry, **data):
+    return await hass.services.async_call(
+        DOMAIN,
+        "replay",
+        data,
+        target={"entity_id": f"sensor.{entry.entry_id.lower()}_pid_output"},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_replay_service_streams_recorder_history(hass, config_entry, freezer):
+    start = dt_util.utcnow().replace(microsecond=0)
+    freezer.move_to(start)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    for hour, value in enumerate((20.0, 22.0, 24.0, 26.0)):
+        freezer.move_to(start + timedelta(hours=hour))
+        hass.states.async_set("sensor.test_input", str(value))
+        await hass.async_block_till_done()
+    freezer.move_to(start + timedelta(hours=4))
+    await async_wait_recording_done(hass)
+
+    response = await call_replay(
+        hass,
+        config_entry,
+        start=start.isoformat(),
+        end=(start + timedelta(hours=4)).isoformat(),
+        chunk_hours=1,
+        kp=1.0,
+        ki=0.0,
+        kd=0.0,
+    )
+
+    assert response["kp"] == 1.0
+    assert response["chunks"] == 4
+    assert (
+        response["ticks"]
+        == 4 * 3600 / config_entry.runtime_data.handle.params.sample_time
+    )
+    assert response["max_abs_error"] > 0
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
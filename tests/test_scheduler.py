@@ -0,0 +1,232 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.simple_pid_controller.const import (
+    CONF_MISSED_TICK_POLICY,
+    CONF_SCHEDULING_MODE,
+    MISSED_TICK_CATCH_UP,
+    MISSED_TICK_SKIP,
+    SCHEDULING_MODE_DEADLINE,
+)
+from custom_components.simple_pid_controller.coordinator import PIDDataCoordinator
+from custom_components.simple_pid_controller.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.simple_pid_controller.scheduler import PIDTickScheduler
+
+
+def make_coordinator(hass, scheduler, name, calls, interval=5):
+    async def update():
+        calls.append(name)
+        return 1.0
+
+    return PIDDataCoordinator(
+        hass, name, update, interval=interval, scheduler=scheduler
+    )
+
+
+async def test_coordinators_share_one_bucket(hass):
+    """Coordinators with the same interval are ticked by one timer."""
+    scheduler = PIDTickScheduler(hass)
+    calls = []
+    first = make_coordinator(hass, scheduler, "first", calls)
+    second = make_coordinator(hass, scheduler, "second", calls)
+
+    unsubs = [c.async_add_listener(lambda: None) for c in (first, second)]
+
+    buckets = scheduler.as_dict()
+    assert len(buckets) == 1
+    assert buckets[0]["interval"] == 5
+    assert buckets[0]["controllers"] == 2
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert sorted(calls) == ["first", "second"]
+    assert scheduler.as_dict()[0]["ticks"] == 1
+    assert scheduler.as_dict()[0]["last_wall_time"] is not None
+
+    for unsub in unsubs:
+        unsub()
+    assert scheduler.as_dict() == []
+
+
+async def test_slow_tick_is_not_overlapped(hass):
+    """A timer tick is skipped while the previous tick is still running."""
+    scheduler = PIDTickScheduler(hass)
+    release = asyncio.Event()
+    calls = []
+
+    async def update():
+        calls.append(1)
+        await release.wait()
+        return 1.0
+
+    coordinator = PIDDataCoordinator(
+        hass, "slow", update, interval=5, scheduler=scheduler
+    )
+    unsub = coordinator.async_add_listener(lambda: None)
+
+    # The first tick is still running, so only yield to the loop
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=5))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=10))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert calls == [1]
+    assert scheduler.as_dict()[0]["skipped"] == 1
+
+    release.set()
+    await hass.async_block_till_done()
+    assert scheduler.as_dict()[0]["ticks"] == 1
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=15))
+    await hass.async_block_till_done()
+    assert calls == [1, 1]
+
+    unsub()
+
+
+async def test_interval_change_moves_bucket(hass):
+    """Changing update_interval moves the coordinator to another bucket."""
+    scheduler = PIDTickScheduler(hass)
+    calls = []
+    coordinator = make_coordinator(hass, scheduler, "pid", calls)
+    unsub = coordinator.async_add_listener(lambda: None)
+    assert scheduler.interval_of(coordinator) == 5
+
+    coordinator.update_interval = timedelta(seconds=2)
+    assert scheduler.interval_of(coordinator) == 2
+    assert [b["interval"] for b in scheduler.as_dict()] == [2]
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert calls == ["pid"]
+
+    await coordinator.async_shutdown()
+    assert scheduler.as_dict() == []
+    unsub()
+
+
+async def test_coordinator_without_scheduler_uses_own_timer(hass):
+    """Without a scheduler the coordinator keeps its own timer."""
+    calls = []
+    coordinator = make_coordinator(hass, None, "pid", calls)
+    unsub = coordinator.async_add_listener(lambda: None)
+    assert coordinator._unsub_refresh is not None
+    unsub()
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_scheduler_in_diagnostics(hass, config_entry):
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    scheduler = result["data"]["scheduler"]
+
+    assert scheduler["bucket"] == 10
+    assert scheduler["buckets"][0]["controllers"] == 1
+
+
+def make_deadline_coordinator(hass, scheduler, name, calls, policy, interval=0.2):
+    async def update():
+        calls.append(name)
+        return 1.0
+
+    return PIDDataCoordinator(
+        hass,
+        name,
+        update,
+        interval=interval,
+        scheduler=scheduler,
+        missed_tick_policy=policy,
+    )
+
+
+async def test_deadline_bucket_keeps_fixed_grid(hass):
+    """Deadline buckets fire on start + n * interval without drift."""
+    scheduler = PIDTickScheduler(hass)
+    calls = []
+    coordinator = make_deadline_coordinator(
+        hass, scheduler, "pid", calls, MISSED_TICK_SKIP
+    )
+    unsub = coordinator.async_add_listener(lambda: None)
+
+    bucket = scheduler._bucket_of[coordinator]
+    start = bucket.deadline
+    assert bucket.policy == MISSED_TICK_SKIP
+    assert scheduler.as_dict()[0]["policy"] == MISSED_TICK_SKIP
+
+    for n in range(1, 4):
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=0.2 * n))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert len(calls) == 3
+    assert bucket.deadline == pytest.approx(start + 3 * 0.2)
+
+    unsub()
+    assert scheduler.as_dict() == []
+    assert bucket.timer is None
+
+
+@pytest.mark.parametrize(
+    ("policy", "skipped", "behind"),
+    [(MISSED_TICK_SKIP, 3, False), (MISSED_TICK_CATCH_UP, 0, True)],
+)
+async def test_deadline_missed_tick_policy(hass, policy, skipped, behind):
+    """Skip jumps to the next future deadline, catch-up replays overdue ticks."""
+    scheduler = PIDTickScheduler(hass)
+    calls = []
+    coordinator = make_deadline_coordinator(hass, scheduler, "pid", calls, policy)
+    unsub = coordinator.async_add_listener(lambda: None)
+    bucket = scheduler._bucket_of[coordinator]
+    bucket.timer.cancel()
+
+    # Pretend the loop was blocked for 3.5 periods
+    bucket.deadline = hass.loop.time() - 3.5 * 0.2
+    await scheduler._async_deadline_tick(bucket)
+
+    assert calls == ["pid"]
+    assert bucket.skipped == skipped
+    assert (bucket.deadline < hass.loop.time()) is behind
+
+    unsub()
+
+
+async def test_timer_and_deadline_buckets_are_separate(hass):
+    """Timer and deadline controllers with the same interval use separate buckets."""
+    scheduler = PIDTickScheduler(hass)
+    calls = []
+    timer = make_coordinator(hass, scheduler, "timer", calls, interval=0.2)
+    deadline = make_deadline_coordinator(
+        hass, scheduler, "deadline", calls, MISSED_TICK_CATCH_UP
+    )
+    unsubs = [c.async_add_listener(lambda: None) for c in (timer, deadline)]
+
+    assert [b["policy"] for b in scheduler.as_dict()] == [None, MISSED_TICK_CATCH_UP]
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_deadline_scheduling_option(hass, config_entry):
+    """The scheduling mode option puts the controller in a deadline bucket."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_SCHEDULING_MODE: SCHEDULING_MODE_DEADLINE,
+            CONF_MISSED_TICK_POLICY: MISSED_TICK_CATCH_UP,
+        },
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["data"]["scheduler"]["buckets"][0]["policy"] == MISSED_TICK_CATCH_UP
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
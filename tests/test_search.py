@@ -0,0 +1,220 @@
+import asyncio
+
+import numpy as np
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.simple_pid_controller import PIDParameters
+from custom_components.simple_pid_controller.const import DOMAIN
+from custom_components.simple_pid_controller.search import (
+    EVENT_SEARCH_PROGRESS,
+    async_search_gains,
+    default_workers,
+    evaluate_candidates,
+    grid_candidates,
+    latin_hypercube_candidates,
+    rank,
+)
+from custom_components.simple_pid_controller.simulation import FirstOrderPlant
+
+BOUNDS = [(0.0, 10.0), (0.0, 1.0), (0.0, 0.0)]
+
+
+def _params():
+    return PIDParameters(
+        setpoint=50.0,
+        sample_time=1.0,
+        output_min=0.0,
+        output_max=100.0,
+        start_mode="Zero start",
+    )
+
+
+def _plant():
+    return FirstOrderPlant(gain=1.0, time_constant=30.0, dead_time=3.0)
+
+
+def test_grid_candidates_fix_equal_bounds():
+    candidates = grid_candidates(BOUNDS, 30)
+    # Two varying axes with 5 points each, kd fixed
+    assert candidates.shape == (25, 3)
+    assert set(candidates[:, 0]) == {0.0, 2.5, 5.0, 7.5, 10.0}
+    assert set(candidates[:, 2]) == {0.0}
+
+
+def test_latin_hypercube_covers_every_stratum():
+    candidates = latin_hypercube_candidates(BOUNDS, 50, seed=1)
+    assert candidates.shape == (50, 3)
+    for column, (low, high) in zip(candidates.T, BOUNDS[:2]):
+        strata = np.floor((column - low) / (high - low) * 50)
+        assert sorted(strata) == list(range(50))
+    np.testing.assert_array_equal(
+        candidates, latin_hypercube_candidates(BOUNDS, 50, seed=1)
+    )
+
+
+def test_rank_orders_by_iae():
+    results = evaluate_candidates(
+        _plant(), _params(), [(0.1, 0.0, 0.0), (2.0, 0.05, 0.0)], 1800, 20.0
+    )
+    ranked = rank(results)
+    # A pure small P controller never reaches the setpoint
+    assert ranked[0].kp == 2.0
+    assert ranked[0].iae < ranked[1].iae
+    assert ranked[1].settling_time is None
+
+
+@pytest.mark.parametrize("cpus, workers", [(None, 1), (1, 1), (3, 2), (32, 4)])
+def test_default_workers_leave_a_cpu(monkeypatch, cpus, workers):
+    monkeypatch.setattr(
+        "custom_components.simple_pid_controller.search.os.cpu_count", lambda: cpus
+    )
+    assert default_workers() == workers
+
+
+async def test_search_gains_in_process_pool(hass):
+    """Candidates are spread over worker processes and streamed per batch."""
+    candidates = latin_hypercube_candidates(BOUNDS, 16, seed=3)
+    batches = []
+    ranked = await async_search_gains(
+        hass,
+        _plant(),
+        _params(),
+        candidates,
+        1800,
+        20.0,
+        max_workers=2,
+        on_batch=lambda batch, done, total: batches.append((len(batch), done, total)),
+    )
+    assert len(ranked) == 16
+    assert [result.rank_key for result in ranked] == sorted(
+        result.rank_key for result in ranked
+    )
+    assert len(batches) == 8
+    assert batches[-1][1:] == (16, 16)
+    # Same results as evaluating in this process
+    serial = rank(evaluate_candidates(_plant(), _params(), candidates, 1800, 20.0))
+    assert ranked == serial
+
+
+async def test_search_gains_cancel(hass):
+    task = asyncio.ensure_future(
+        async_search_gains(
+            hass,
+            _plant(),
+            _params(),
+            latin_hypercube_candidates(BOUNDS, 400, seed=3),
+            3600,
+            20.0,
+            max_workers=1,
+        )
+    )
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # The pool shuts down in the executor once the running batch is done
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def _set_number(hass, entry, key, value):
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{entry.entry_id.lower()}_{key}", "value": value},
+        blocking=True,
+    )
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_search_gains_service(hass, config_entry):
+    events = async_capture_events(hass, EVENT_SEARCH_PROGRESS)
+    await _set_number(hass, config_entry, "setpoint", 50.0)
+    await _set_number(hass, config_entry, "output_min", 0.0)
+    await _set_number(hass, config_entry, "output_max", 100.0)
+    await _set_number(hass, config_entry, "sample_time", 1.0)
+    response = await hass.services.async_call(
+        DOMAIN,
+        "search_gains",
+        {
+            "plant": "first_order",
+            "gain": 1.0,
+            "time_constant": 30.0,
+            "duration": 1800,
+            "method": "grid",
+            "samples": 9,
+            "top": 3,
+            "max_workers": 2,
+        },
+        target={"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+
+    handle = config_entry.runtime_data.handle
+    assert response["candidates"] == 9
+    assert len(response["results"]) == 3
+    assert response["results"][0]["iae"] <= response["results"][1]["iae"]
+    assert handle.search_result == response
+    assert handle.search_task is None
+    assert events[-1].data["done"] == 9
+    assert events[-1].data["best"] == response["results"][0]
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_search_gains_service_invalid_bounds(hass, config_entry):
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            "search_gains",
+            {
+                "plant": "first_order",
+                "gain": 1.0,
+                "kp_min": 5.0,
+                "kp_max": 1.0,
+                "sample_time": 1.0,
+                "setpoint": 50.0,
+            },
+            target={"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_cancel_search_service(hass, config_entry):
+    target = {"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"}
+    search = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            "search_gains",
+            {
+                "plant": "first_order",
+                "gain": 1.0,
+                "duration": 3600,
+                "samples": 400,
+                "max_workers": 1,
+                "sample_time": 1.0,
+                "setpoint": 50.0,
+                "initial_value": 20.0,
+            },
+            target=target,
+            blocking=True,
+            return_response=True,
+        )
+    )
+    await asyncio.sleep(0)
+    await hass.services.async_call(
+        DOMAIN, "cancel_search", target=target, blocking=True
+    )
+    with pytest.raises(HomeAssistantError, match="cancelled"):
+        await search
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert config_entry.runtime_data.handle.search_task is None
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN, "cancel_search", target=target, blocking=True
+        )
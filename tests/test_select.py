@@ -24,20 +24,21 @@ async def test_pid_start_modes(hass, config_entry):
         handle = config_entry.runtime_data.handle
         handle.init_phase = True
         handle.last_known_output = 80.0
+        # switch to manual so the next tick applies the start mode
+        handle.pid.set_auto_mode(False)
 
         handle.get_input_sensor_value = lambda: base_input
-        handle.get_select = lambda key: start_mode if key == "start_mode" else None
-        handle.get_number = lambda key: {
-            "kp": 1.0,
-            "ki": 0.1,
-            "kd": 0.01,
-            "setpoint": setpoint,
-            "starting_output": 50.0,
-            "sample_time": sample_time,
-            "output_min": 0.0,
-            "output_max": 100.0,
-        }[key]
-        handle.get_switch = lambda key: True
+        handle.params.set("start_mode", start_mode)
+        handle.params.update(
+            kp=1.0,
+            ki=0.1,
+            kd=0.01,
+            setpoint=setpoint,
+            starting_output=50.0,
+            sample_time=sample_time,
+            output_min=0.0,
+            output_max=100.0,
+        )
 
         # trigger initial update
         hass.bus.async_fire("homeassistant_started")
@@ -2,9 +2,11 @@ import pytest
 from datetime import timedelta
 from homeassistant.util.dt import utcnow
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from custom_components.simple_pid_controller import PIDTelemetry
 from custom_components.simple_pid_controller.sensor import (
     PIDContributionSensor,
     PIDOutputSensor,
+    PIDSampleTimeSensor,
 )
 from custom_components.simple_pid_controller.coordinator import PIDDataCoordinator
 from custom_components.simple_pid_controller.sensor import async_setup_entry
@@ -21,20 +23,17 @@ async def test_pid_output_and_contributions_update(hass, config_entry):
     handle = config_entry.runtime_data.handle
 
     handle.get_input_sensor_value = lambda: 10.0
-    handle.get_select = lambda key: {
-        "start_mode": "Startup value",
-    }[key]
-    handle.get_number = lambda key: {
-        "kp": 1.0,
-        "ki": 0.1,
-        "kd": 0.01,
-        "setpoint": 20.0,
-        "starting_output": 50.0,
-        "sample_time": sample_time,
-        "output_min": 0.0,
-        "output_max": 100.0,
-    }[key]
-    handle.get_switch = lambda key: True
+    handle.params.set("start_mode", "Startup value")
+    handle.params.update(
+        kp=1.0,
+        ki=0.1,
+        kd=0.01,
+        setpoint=20.0,
+        starting_output=50.0,
+        sample_time=sample_time,
+        output_min=0.0,
+        output_max=100.0,
+    )
 
     # 1) trigger initial update
     hass.bus.async_fire("homeassistant_started")
@@ -57,8 +56,18 @@ async def test_pid_output_and_contributions_update(hass, config_entry):
 async def test_pid_contribution_native_value_rounding_and_none(hass, config_entry):
     """Test that PIDContributionSensor.native_value rounds correctly and returns None for unknown key."""
     handle = config_entry.runtime_data.handle
-    # Provide known contributions
-    handle.last_contributions = (0.1234, 1.9876, 2.5555, 3.3789)
+    # Provide a known telemetry snapshot
+    handle.telemetry = PIDTelemetry(
+        input=25.0,
+        setpoint=50.0,
+        error=-25.0,
+        p=0.1234,
+        i=1.9876,
+        d=2.5555,
+        i_delta=3.3789,
+        dt=5.0,
+        output=10.0,
+    )
     coordinator = PIDDataCoordinator(hass, "test", lambda: 0, interval=1)
 
     # Map contribution keys to expected values
@@ -107,46 +116,32 @@ async def test_pid_contribution_native_value_rounding_and_none(hass, config_entr
 @pytest.mark.usefixtures("setup_integration")
 @pytest.mark.asyncio
 async def test_listeners_trigger_refresh_sensor(hass, config_entry, monkeypatch):
-    """Lines 131-132: coordinator.async_request_refresh called on sensor state change."""
-    # Prepare handle
-    handle = config_entry.runtime_data.handle
-    handle.get_input_sensor_value = lambda: 0.0
-    handle.get_number = lambda key: 0.0
-    handle.get_switch = lambda key: True
-
-    # Capture listeners
-    listeners = []
-    monkeypatch.setattr(
-        type(hass.bus),
-        "async_listen",
-        lambda self, event, cb: listeners.append((event, cb)),
-    )
-
-    # Run setup to register listeners
-    entities = []
-    await async_setup_entry(hass, config_entry, lambda ents: entities.extend(ents))
-    coordinator = entities[0].coordinator
+    """coordinator.async_request_refresh is called when a parameter entity changes."""
+    coordinator = config_entry.runtime_data.coordinator
 
     # Patch refresh method
     called = []
-    monkeypatch.setattr(
-        coordinator, "async_request_refresh", lambda: called.append(True)
-    )
 
-    # Simulate state change event for kp
-    entry_id = config_entry.entry_id
-    test_entity = f"number.{entry_id}_kp"
-    callback = next(cb for evt, cb in listeners if evt == "state_changed")
+    async def fake_refresh():
+        called.append(True)
+
+    monkeypatch.setattr(coordinator, "async_request_refresh", fake_refresh)
 
-    from types import SimpleNamespace
+    # A state change on an unrelated entity is not routed to the controller
+    hass.states.async_set("sensor.unrelated", "1")
+    await hass.async_block_till_done()
+    assert not called
 
-    event = SimpleNamespace(data={"entity_id": test_entity})
-    callback(event)
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{config_entry.entry_id}_kp", "value": 2.0},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
     assert (
         called
-    ), "Coordinator.async_request_refresh was not called on sensor state change"
-
-    await async_unload_entry(hass, config_entry)
+    ), "Coordinator.async_request_refresh was not called on parameter state change"
 
 
 @pytest.mark.usefixtures("setup_integration")
@@ -157,8 +152,6 @@ async def test_update_pid_raises_on_missing_input(hass, config_entry):
     # Force no input value
     handle.get_input_sensor_value = lambda: None
     # Provide defaults for numbers and switches
-    handle.get_number = lambda key: 0.0
-    handle.get_switch = lambda key: True
     # Setup entry to get coordinator with update_method
     entities: list = []
     await async_setup_entry(hass, config_entry, lambda e: entities.extend(e))
@@ -185,18 +178,17 @@ async def test_update_pid_output_limits_none_when_windup_protection_disabled(
     handle.last_contributions = (0.0, 0.0, 0.0, 0.0)
     handle.last_known_output = 0.0
     handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: {
-        "kp": 1.0,
-        "ki": 0.1,
-        "kd": 0.01,
-        "setpoint": 5.0,
-        "starting_output": 0.0,
-        "sample_time": 5.0,
-        "output_min": 0.0,
-        "output_max": 100.0,
-    }.get(key, 0.0)
-    handle.get_switch = lambda key: False if key == "windup_protection" else True
-    handle.get_select = lambda key: "Zero start" if key == "start_mode" else None
+    handle.params.update(
+        kp=1.0,
+        ki=0.1,
+        kd=0.01,
+        setpoint=5.0,
+        starting_output=0.0,
+        sample_time=5.0,
+        output_min=0.0,
+        output_max=100.0,
+    )
+    handle.params.update(windup_protection=False, start_mode="Zero start")
 
     coordinator = config_entry.runtime_data.coordinator
     await coordinator.update_method()
@@ -273,18 +265,17 @@ async def test_update_pid_invalid_start_mode_defaults(
     handle.last_contributions = (0.0, 0.0, 0.0, 0.0)
     handle.last_known_output = 99.9  # some non‐zero initial
     handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: {
-        "kp": 1.0,
-        "ki": 0.1,
-        "kd": 0.01,
-        "setpoint": 5.0,
-        "starting_output": 0.0,
-        "sample_time": 5.0,
-        "output_min": 0.0,
-        "output_max": 100.0,
-    }[key]
-    handle.get_switch = lambda key: True
-    handle.get_select = lambda key: "Invalid Mode" if key == "start_mode" else None
+    handle.params.update(
+        kp=1.0,
+        ki=0.1,
+        kd=0.01,
+        setpoint=5.0,
+        starting_output=0.0,
+        sample_time=5.0,
+        output_min=0.0,
+        output_max=100.0,
+    )
+    handle.params.set("start_mode", "Invalid Mode")
 
     # Run setup and trigger one PID update
     entities = []
@@ -324,18 +315,17 @@ async def test_update_pid_uses_last_known_value(
     handle.last_known_output = 73.5
     handle.last_contributions = (0.0, 0.0, 0.0, 0.0)
     handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: {
-        "kp": 1.0,
-        "ki": 0.1,
-        "kd": 0.01,
-        "setpoint": 5.0,
-        "starting_output": 0.0,
-        "sample_time": 5.0,
-        "output_min": 0.0,
-        "output_max": 100.0,
-    }[key]
-    handle.get_switch = lambda key: True
-    handle.get_select = lambda key: "Last known value" if key == "start_mode" else None
+    handle.params.update(
+        kp=1.0,
+        ki=0.1,
+        kd=0.01,
+        setpoint=5.0,
+        starting_output=0.0,
+        sample_time=5.0,
+        output_min=0.0,
+        output_max=100.0,
+    )
+    handle.params.set("start_mode", "Last known value")
 
     entities = []
     await sensor_module.async_setup_entry(
@@ -352,29 +342,47 @@ async def test_update_pid_uses_last_known_value(
 
 
 @pytest.mark.usefixtures("setup_integration")
-def test_pid_contribution_error_when_input_or_setpoint_none(hass, config_entry):
-    """Line 258: native_value for 'error' should be 0 when input or setpoint is None."""
+def test_pid_contribution_none_without_telemetry(hass, config_entry):
+    """Sensors report None until the first PID step published a snapshot."""
     handle = config_entry.runtime_data.handle
-    handle.last_contributions = (1.0, 2.0, 3.0, 4.0)
+    handle.telemetry = None
     coordinator = PIDDataCoordinator(hass, "test", lambda: 0, interval=1)
 
-    # Case 1: input_value is None → error = 0
-    handle.get_input_sensor_value = lambda: None
-    handle.get_number = lambda key: 5.0
-    sensor = PIDContributionSensor(
-        hass, config_entry, "error", "Error Sensor", coordinator
-    )
-    assert sensor._handle is handle
-    assert sensor.native_value == 0
+    for key in ("error", "pid_p_contrib"):
+        sensor = PIDContributionSensor(hass, config_entry, key, key, coordinator)
+        assert sensor._handle is handle
+        assert sensor.native_value is None
 
-    # Case 2: setpoint is None → error = 0
-    handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: None
-    sensor = PIDContributionSensor(
-        hass, config_entry, "error", "Error Sensor", coordinator
+    sensor = PIDSampleTimeSensor(
+        hass, config_entry, "actual_sample_time", "Actual Sample Time", coordinator
     )
-    assert sensor._handle is handle
-    assert sensor.native_value == 0
+    assert sensor.native_value is None
+
+
+@pytest.mark.usefixtures("setup_integration")
+@pytest.mark.asyncio
+async def test_pid_step_publishes_consistent_telemetry(hass, config_entry):
+    """Error and terms shown by the sensors come from the same PID step."""
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+
+    handle.get_input_sensor_value = lambda: 12.0
+    handle.params.set("setpoint", 20.0)
+    output = await coordinator.update_method()
+
+    telemetry = handle.telemetry
+    assert telemetry.input == 12.0
+    assert telemetry.error == -8.0
+    assert telemetry.output == output
+    assert telemetry.p == handle.last_contributions[0]
+
+    # Later input changes do not leak into the published error
+    handle.get_input_sensor_value = lambda: 99.0
+    sensor = PIDContributionSensor(hass, config_entry, "error", "Error", coordinator)
+    assert sensor.native_value == -8.0
+
+    with pytest.raises(AttributeError):
+        telemetry.error = 0.0
 
 
 @pytest.mark.usefixtures("setup_integration")
@@ -389,18 +397,17 @@ async def test_update_pid_adjusts_update_interval(hass, config_entry, monkeypatc
     sample_time = 5
 
     handle.get_input_sensor_value = lambda: 10.0
-    handle.get_select = lambda key: {"start_mode": "Startup value"}[key]
-    handle.get_number = lambda key: {
-        "kp": 1.0,
-        "ki": 0.1,
-        "kd": 0.01,
-        "setpoint": 20.0,
-        "starting_output": 0.0,
-        "sample_time": sample_time,
-        "output_min": 0.0,
-        "output_max": 100.0,
-    }[key]
-    handle.get_switch = lambda key: True
+    handle.params.set("start_mode", "Startup value")
+    handle.params.update(
+        kp=1.0,
+        ki=0.1,
+        kd=0.01,
+        setpoint=20.0,
+        starting_output=0.0,
+        sample_time=sample_time,
+        output_min=0.0,
+        output_max=100.0,
+    )
 
     entities = []
     await async_setup_entry(hass, config_entry, lambda e: entities.extend(e))
@@ -412,7 +419,33 @@ async def test_update_pid_adjusts_update_interval(hass, config_entry, monkeypatc
     assert coordinator.update_interval == timedelta(seconds=sample_time)
 
     sample_time = 15
+    handle.params.set("sample_time", sample_time)
     await coordinator.update_method()
     assert coordinator.update_interval == timedelta(seconds=sample_time)
 
     await async_unload_entry(hass, config_entry)
+
+
+@pytest.mark.usefixtures("setup_integration")
+@pytest.mark.asyncio
+async def test_update_pid_only_reapplies_changed_parameters(
+    monkeypatch, hass, config_entry
+):
+    """PID settings are only reassigned when the parameter version moves."""
+    monkeypatch.setattr(PIDDataCoordinator, "_schedule_refresh", lambda self, *_: None)
+
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    handle.get_input_sensor_value = lambda: 10.0
+
+    await coordinator.update_method()
+    assert handle.applied_params_version == handle.params.version
+
+    # Changes made directly on the PID object survive an unchanged tick
+    handle.pid.tunings = (9.0, 9.0, 9.0)
+    await coordinator.update_method()
+    assert handle.pid.tunings == (9.0, 9.0, 9.0)
+
+    handle.params.set("kp", 3.0)
+    await coordinator.update_method()
+    assert handle.pid.tunings == (3.0, handle.params.ki, handle.params.kd)
@@ -0,0 +1,171 @@
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.simple_pid_controller import PIDParameters
+from custom_components.simple_pid_controller.const import DOMAIN
+from custom_components.simple_pid_controller.simulation import (
+    FirstOrderPlant,
+    IntegratingPlant,
+    PlantModel,
+    SecondOrderPlant,
+    simulate,
+)
+
+
+def _params(**overrides):
+    values = {
+        "kp": 2.0,
+        "ki": 0.05,
+        "kd": 0.0,
+        "setpoint": 50.0,
+        "sample_time": 1.0,
+        "output_min": 0.0,
+        "output_max": 100.0,
+        "start_mode": "Zero start",
+    }
+    values.update(overrides)
+    return PIDParameters(**values)
+
+
+def _run_open_loop(plant, output, steps, dt=1.0):
+    plant.reset(20.0, dt)
+    return [plant.step(output, dt) for _ in range(steps)]
+
+
+def test_first_order_plant_settles_at_gain():
+    values = _run_open_loop(FirstOrderPlant(gain=0.5, time_constant=10.0), 10.0, 100)
+    assert values[9] == pytest.approx(20.0 + 5.0 * (1 - 2.718281828**-1), rel=1e-6)
+    assert values[-1] == pytest.approx(25.0, abs=1e-3)
+
+
+def test_integrating_plant_ramps():
+    values = _run_open_loop(IntegratingPlant(gain=0.1), 5.0, 10)
+    assert values[-1] == pytest.approx(25.0)
+
+
+def test_plant_model_is_abstract():
+    with pytest.raises(TypeError):
+        PlantModel(gain=1.0)
+
+
+def test_dead_time_delays_output():
+    values = _run_open_loop(IntegratingPlant(gain=1.0, dead_time=3.0), 1.0, 5)
+    assert values == [20.0, 20.0, 20.0, 21.0, 22.0]
+
+
+def test_second_order_plant_overshoots_when_underdamped():
+    values = _run_open_loop(
+        SecondOrderPlant(gain=1.0, time_constant=5.0, damping=0.3), 10.0, 300
+    )
+    assert max(values) > 30.5
+    assert values[-1] == pytest.approx(30.0, abs=0.05)
+
+
+def test_simulate_pi_reaches_setpoint():
+    result = simulate(
+        FirstOrderPlant(gain=1.0, time_constant=60.0, dead_time=5.0),
+        _params(),
+        duration=4 * 3600,
+        initial_value=20.0,
+    )
+    assert len(result.time) == 4 * 3600
+    assert result.output.max() <= 100.0
+    metrics = result.metrics()
+    assert abs(metrics["final_error"]) < 0.01
+    assert metrics["settling_time"] is not None
+    assert metrics["rise_time"] < metrics["settling_time"]
+    assert metrics["iae"] > 0
+
+
+def test_simulate_setpoint_changes():
+    result = simulate(
+        FirstOrderPlant(gain=1.0, time_constant=30.0),
+        _params(),
+        duration=3600,
+        initial_value=20.0,
+        setpoint_changes=[(1800.0, 40.0)],
+    )
+    assert result.setpoint[1799] == 50.0
+    assert result.setpoint[1800] == 40.0
+    assert result.input[-1] == pytest.approx(40.0, abs=0.01)
+
+
+def test_simulate_windup_switch_removes_limits():
+    plant = IntegratingPlant(gain=0.001)
+    limited = simulate(plant, _params(), duration=100, initial_value=0.0)
+    unlimited = simulate(
+        plant, _params(windup_protection=False), duration=100, initial_value=0.0
+    )
+    assert limited.output.max() == 100.0
+    assert unlimited.output.max() > 100.0
+
+
+def test_simulate_manual_mode_holds_last_output():
+    result = simulate(
+        FirstOrderPlant(gain=1.0, time_constant=10.0),
+        _params(auto_mode=False),
+        duration=100,
+        initial_value=20.0,
+        last_known_output=7.0,
+    )
+    assert set(result.output) == {7.0}
+    assert result.input[-1] == pytest.approx(27.0, abs=0.01)
+
+
+def test_simulate_start_mode_startup_value():
+    result = simulate(
+        IntegratingPlant(gain=0.0),
+        _params(kp=0.0, ki=0.0, start_mode="Startup value", starting_output=30.0),
+        duration=10,
+        initial_value=50.0,
+    )
+    assert result.output[0] == 30.0
+
+
+def test_simulate_rejects_bad_sample_time():
+    with pytest.raises(ValueError):
+        simulate(IntegratingPlant(gain=1.0), _params(sample_time=None), 10, 0.0)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_simulate_service(hass, config_entry):
+    """The service simulates with the controller's parameters and overrides."""
+    await config_entry.runtime_data.coordinator.async_refresh()
+    response = await hass.services.async_call(
+        DOMAIN,
+        "simulate",
+        {
+            "plant": "first_order",
+            "gain": 1.0,
+            "time_constant": 30.0,
+            "duration": 1800,
+            "kp": 2.0,
+            "ki": 0.05,
+            "sample_time": 1.0,
+        },
+        target={"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["samples"] == 1800
+    assert response["sample_time"] == 1.0
+    assert abs(response["final_error"]) < 0.1
+    assert set(response) >= {"iae", "ise", "overshoot_pct", "settling_time"}
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_simulate_service_step_limit(hass, config_entry):
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            "simulate",
+            {
+                "plant": "integrating",
+                "gain": 1.0,
+                "duration": 10_000_000,
+                "sample_time": 1.0,
+            },
+            target={"entity_id": f"sensor.{config_entry.entry_id.lower()}_pid_output"},
+            blocking=True,
+            return_response=True,
+        )
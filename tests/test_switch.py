@@ -58,3 +58,16 @@ async def test_async_added_to_hass_restores_previous_state(
 
     await switch.async_added_to_hass()
     assert switch.is_on is expected
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_switch_pushes_into_handle_params(hass, config_entry):
+    """Toggling a switch writes its state into the handle's parameter struct."""
+    handle = config_entry.runtime_data.handle
+    entity_id = f"switch.{config_entry.entry_id}_windup_protection"
+    assert handle.params.windup_protection is True
+
+    await hass.services.async_call(
+        "switch", "turn_off", {"entity_id": entity_id}, blocking=True
+    )
+    assert handle.params.windup_protection is False
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.simple_pid_controller.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.simple_pid_controller.sensor import PIDTimingSensor
+from custom_components.simple_pid_controller.timing import (
+    TIMING_BUCKETS,
+    ControllerTiming,
+    TimingHistogram,
+)
+
+
+def test_histogram_percentiles():
+    histogram = TimingHistogram()
+    assert histogram.percentile(50) is None
+
+    for _ in range(90):
+        histogram.add(0.0015)
+    for _ in range(10):
+        histogram.add(0.3)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == 0.002
+    assert histogram.percentile(95) == 0.3
+    assert histogram.max == 0.3
+
+    histogram.add(120.0)
+    assert histogram.percentile(100) == 120.0
+    result = histogram.as_dict()
+    assert result["buckets"]["inf"] == 1
+    assert len(result["buckets"]) == len(TIMING_BUCKETS) + 1
+
+
+def test_lateness_and_jitter_from_ticks():
+    """Lateness is measured against the previous tick plus the interval."""
+    timing = ControllerTiming()
+    for now in (0.0, 10.0, 20.5, 30.5):
+        timing.record_tick(now, 10.0)
+
+    assert timing.lateness.count == 3
+    assert timing.lateness.max == pytest.approx(0.5)
+    assert timing.jitter.count == 2
+    assert timing.jitter.last == pytest.approx(0.5)
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_timing_recorded_per_tick(hass, config_entry):
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+
+    # Requested refreshes only record the compute time
+    await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    assert handle.timing.compute.count >= 1
+    assert handle.timing.lateness.count == 0
+
+    interval = coordinator.update_interval.total_seconds()
+    for n in range(1, 4):
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=interval * n))
+        await hass.async_block_till_done(wait_background_tasks=True)
+    assert handle.timing.lateness.count >= 1
+
+    sensor = PIDTimingSensor(
+        hass, config_entry, "compute_time", "Compute Time", coordinator, "compute"
+    )
+    assert sensor.native_value is not None
+    assert sensor.extra_state_attributes["samples"] == handle.timing.compute.count
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert result["data"]["timing"]["compute"]["count"] == handle.timing.compute.count
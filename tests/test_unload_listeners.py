@@ -1,29 +1,31 @@
 import pytest
 
-from custom_components.simple_pid_controller.sensor import async_setup_entry
+import custom_components.simple_pid_controller as pid_init
 
 
-@pytest.mark.usefixtures("setup_integration")
 @pytest.mark.asyncio
 async def test_listeners_removed_after_unload(hass, config_entry, monkeypatch):
-    """Ensure state change listeners are unsubscribed when the entry unloads."""
-    created = []
+    """Ensure the parameter state tracker is unsubscribed when the entry unloads."""
+    tracked = []
     called = []
 
-    def fake_listen(self, event, callback):
+    def fake_track(hass_, entity_ids, action):
+        tracked.append(list(entity_ids))
+
         def unsub():
             called.append(True)
 
-        created.append(unsub)
         return unsub
 
-    monkeypatch.setattr(type(hass.bus), "async_listen", fake_listen)
+    monkeypatch.setattr(pid_init, "async_track_state_change_event", fake_track)
 
-    await async_setup_entry(hass, config_entry, lambda e: None)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
 
-    # Expect listeners created for all parameters
-    assert len(created) > 0
+    # One tracker covering all parameter entities
+    assert len(tracked) == 1
+    assert len(tracked[0]) == sum(len(k) for k in pid_init.PARAMETER_ENTITIES.values())
 
     await hass.config_entries.async_unload(config_entry.entry_id)
 
-    assert len(called) == len(created)
+    assert len(called) == len(tracked)
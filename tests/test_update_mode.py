@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+import pytest
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.simple_pid_controller.const import (
+    CONF_MAX_STALENESS,
+    CONF_MIN_INTERVAL,
+    CONF_UPDATE_MODE,
+    UPDATE_MODE_INPUT_CHANGE,
+)
+
+
+@pytest.fixture
+async def input_change_entry(hass, config_entry):
+    """Set up a controller that steps on input changes."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_UPDATE_MODE: UPDATE_MODE_INPUT_CHANGE,
+            CONF_MIN_INTERVAL: 2.0,
+            CONF_MAX_STALENESS: 30.0,
+        },
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    yield config_entry
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_input_change_steps_controller_rate_limited(hass, input_change_entry):
+    """New input values step the PID, at most once per min_interval."""
+    handle = input_change_entry.runtime_data.handle
+    coordinator = input_change_entry.runtime_data.coordinator
+
+    steps = []
+    update_pid = coordinator.update_method
+
+    async def counting_update():
+        steps.append(handle.get_input_sensor_value())
+        return await update_pid()
+
+    coordinator.update_method = counting_update
+
+    hass.states.async_set("sensor.test_input", "26.0")
+    await hass.async_block_till_done()
+    assert steps == [26.0]
+
+    # Updates within min_interval are coalesced into one trailing step
+    hass.states.async_set("sensor.test_input", "27.0")
+    hass.states.async_set("sensor.test_input", "28.0")
+    await hass.async_block_till_done()
+    assert steps == [26.0]
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=2.5))
+    await hass.async_block_till_done()
+    assert steps == [26.0, 28.0]
+
+    # Unavailable inputs do not trigger a step
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=5))
+    hass.states.async_set("sensor.test_input", "unavailable")
+    await hass.async_block_till_done()
+    assert len(steps) == 2
+
+
+async def test_input_change_has_no_periodic_tick(hass, input_change_entry):
+    """The staleness timer replaces the periodic tick."""
+    handle = input_change_entry.runtime_data.handle
+    coordinator = input_change_entry.runtime_data.coordinator
+
+    assert handle.tick_interval is None
+    assert coordinator.update_interval is None
+    await coordinator.update_method()
+    assert coordinator.update_interval is None
+
+
+async def test_staleness_step_only_after_a_quiet_period(
+    hass, freezer, input_change_entry
+):
+    """Input faster than max_staleness gets no extra steps; silence gets one."""
+    handle = input_change_entry.runtime_data.handle
+    coordinator = input_change_entry.runtime_data.coordinator
+
+    steps = []
+    update_pid = coordinator.update_method
+
+    async def counting_update():
+        steps.append(handle.get_input_sensor_value())
+        return await update_pid()
+
+    coordinator.update_method = counting_update
+
+    # A new value every 10 s for two minutes, max_staleness is 30 s
+    for n in range(12):
+        freezer.tick(timedelta(seconds=10))
+        async_fire_time_changed(hass)
+        hass.states.async_set("sensor.test_input", str(30.0 + n))
+        await hass.async_block_till_done()
+    assert steps == [30.0 + n for n in range(12)]
+
+    # Silent sensor: no step before max_staleness, one right after it
+    freezer.tick(timedelta(seconds=29))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(steps) == 12
+    freezer.tick(timedelta(seconds=1.5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(steps) == 13
+
+    # And again max_staleness after that step
+    freezer.tick(timedelta(seconds=30.5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(steps) == 14
+
+
+async def test_staleness_step_respects_min_interval(hass, freezer, config_entry):
+    """A staleness step right after an input step waits for min_interval."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_UPDATE_MODE: UPDATE_MODE_INPUT_CHANGE,
+            CONF_MIN_INTERVAL: 10.0,
+            CONF_MAX_STALENESS: 3.0,
+        },
+    )
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data.coordinator
+    steps = []
+    update_pid = coordinator.update_method
+
+    async def counting_update():
+        steps.append(None)
+        return await update_pid()
+
+    coordinator.update_method = counting_update
+
+    hass.states.async_set("sensor.test_input", "26.0")
+    await hass.async_block_till_done()
+    assert len(steps) == 1
+
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    # The staleness step is held back by the cooldown
+    assert len(steps) == 1
+
+    freezer.tick(timedelta(seconds=6))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(steps) == 2
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
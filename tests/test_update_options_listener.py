@@ -1,7 +1,18 @@
 import pytest
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.simple_pid_controller.const import DOMAIN
+from custom_components.simple_pid_controller.const import (
+    CONF_INPUT_RANGE_MAX,
+    CONF_MAX_STALENESS,
+    CONF_OUTPUT_RANGE_MAX,
+    CONF_PID_ENGINE,
+    CONF_SENSOR_ENTITY_ID,
+    CONF_UPDATE_MODE,
+    DOMAIN,
+    PID_ENGINE_KERNEL,
+    UPDATE_MODE_INPUT_CHANGE,
+)
 from custom_components.simple_pid_controller import _async_update_options_listener
 
 
@@ -19,3 +30,89 @@ async def test_async_update_options_listener_reload_called_once(hass, monkeypatc
     await _async_update_options_listener(hass, entry)
 
     assert calls == [entry.entry_id]
+
+
+@pytest.fixture
+def no_reload(hass, monkeypatch):
+    """Fail when the config entry would be reloaded."""
+
+    async def fail_reload(entry_id):
+        raise AssertionError("entry was reloaded")
+
+    monkeypatch.setattr(hass.config_entries, "async_reload", fail_reload)
+
+
+def _number_entity_id(hass, key):
+    return er.async_get(hass).async_get_entity_id("number", DOMAIN, f"PID2_{key}")
+
+
+@pytest.mark.usefixtures("setup_integration", "no_reload")
+async def test_options_applied_in_place(hass, config_entry):
+    """Changing ranges and the input sensor keeps the controller running."""
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    pid = handle.pid
+    steps = len(handle.history)
+    hass.states.async_set("sensor.other_input", "30.0")
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_SENSOR_ENTITY_ID: "sensor.other_input",
+            CONF_INPUT_RANGE_MAX: 200.0,
+            CONF_OUTPUT_RANGE_MAX: 50.0,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data.handle is handle
+    assert config_entry.runtime_data.coordinator is coordinator
+    assert handle.pid is pid
+    # The refresh after applying the options continues the same history
+    assert len(handle.history) == steps + 1
+    assert handle.sensor_entity_id == "sensor.other_input"
+    assert handle.telemetry.input == 30.0
+
+    setpoint = hass.states.get(_number_entity_id(hass, "setpoint"))
+    assert setpoint.attributes["max"] == 200.0
+
+    # Values outside a narrowed range are clamped and pushed to the PID
+    output_max = hass.states.get(_number_entity_id(hass, "output_max"))
+    assert output_max.attributes["max"] == 50.0
+    assert float(output_max.state) == 50.0
+    assert handle.params.output_max == 50.0
+    assert pid.output_limits[1] == 50.0
+
+
+@pytest.mark.usefixtures("setup_integration", "no_reload")
+async def test_options_switch_to_input_change_in_place(hass, config_entry):
+    """Switching the update mode subscribes to the input sensor."""
+    handle = config_entry.runtime_data.handle
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_UPDATE_MODE: UPDATE_MODE_INPUT_CHANGE, CONF_MAX_STALENESS: 30.0},
+    )
+    await hass.async_block_till_done()
+    # The staleness timer replaces the periodic tick
+    assert config_entry.runtime_data.coordinator.update_interval is None
+
+    hass.states.async_set("sensor.test_input", "27.5")
+    await hass.async_block_till_done()
+    assert handle.telemetry.input == 27.5
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_engine_change_reloads(hass, config_entry, monkeypatch):
+    """A different PID engine cannot be swapped in place."""
+    calls = []
+
+    async def fake_reload(entry_id):
+        calls.append(entry_id)
+
+    monkeypatch.setattr(hass.config_entries, "async_reload", fake_reload)
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_PID_ENGINE: PID_ENGINE_KERNEL}
+    )
+    await hass.async_block_till_done()
+    assert calls == [config_entry.entry_id]